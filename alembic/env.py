@@ -37,6 +37,8 @@ from app.model.medical_record import MedicalRecord  # noqa: F401
 from app.model.treatment import Treatment  # noqa: F401
 from app.model.inventory_transaction import InventoryTransaction  # noqa: F401
 from app.model.inventory_transaction_item import InventoryTransactionItem  # noqa: F401
+from app.model.statistics_snapshot import StatisticsSnapshot  # noqa: F401
+from app.model.stored_object import StoredObject  # noqa: F401
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -57,11 +59,23 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
+def include_name(name, type_, parent_names) -> bool:
+    """Keep autogenerate from dropping migration-managed indexes.
+
+    The *_trgm search indexes need the pg_trgm extension, so they are
+    created by migration only and not declared on the models.
+    """
+    if type_ == "index" and name and name.endswith("_trgm"):
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -71,7 +85,7 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(connection=connection, target_metadata=target_metadata, include_name=include_name)
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,77 @@
+"""add partial indexes for soft-delete-filtered lookups
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-04-01 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f6a7b8c9d0'
+down_revision: Union[str, None] = 'd4e5f6a7b8c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, columns) queried as "<columns> = ... AND is_deleted = false". The
+# appointment lists filter by patient or doctor and order by date, so those
+# lead with the filter column and carry the date too.
+# inventory.item_id is left out: its unique constraint already indexes it.
+PARTIAL_INDEXES = [
+    ('appointments', ['patient_id', 'appointment_date']),
+    ('appointments', ['doctor_id', 'appointment_date']),
+    ('appointments', ['appointment_date']),
+    ('inventory_transaction_items', ['transaction_id']),
+    ('inventory_transaction_items', ['item_id']),
+    ('inventory_transactions', ['transaction_date']),
+    ('vital_signs', ['appointment_id']),
+    ('medical_records', ['appointment_id']),
+    ('patient_documents', ['patient_id']),
+]
+
+
+def _name(table: str, columns: list) -> str:
+    return f'ix_{table}_{"_".join(columns)}_not_deleted'
+
+
+def _drop_if_invalid(name: str, table: str) -> None:
+    """Drop index name if an interrupted concurrent build left it INVALID.
+
+    IF NOT EXISTS would otherwise keep the unusable index. Needs a live
+    connection, so offline (--sql) runs skip the check.
+    """
+    if op.get_context().as_sql:
+        return
+    invalid = op.get_bind().execute(
+        sa.text('SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)'), {'name': name},
+    ).scalar()
+    if invalid:
+        op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY so writes to these busy tables are not blocked while the
+    # indexes build; it cannot run inside a transaction, so each index commits
+    # on its own. A rerun skips the ones already built and rebuilds any that
+    # a failed build left INVALID.
+    with op.get_context().autocommit_block():
+        for table, columns in PARTIAL_INDEXES:
+            _drop_if_invalid(_name(table, columns), table)
+            op.create_index(
+                _name(table, columns),
+                table,
+                columns,
+                unique=False,
+                postgresql_where=sa.text('is_deleted = false'),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, columns in reversed(PARTIAL_INDEXES):
+            op.drop_index(_name(table, columns), table_name=table, postgresql_concurrently=True, if_exists=True)
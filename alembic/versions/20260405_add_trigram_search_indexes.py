@@ -0,0 +1,80 @@
+"""add pg_trgm GIN indexes for search columns
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-04-05 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a7b8c9d0e1'
+down_revision: Union[str, None] = 'e5f6a7b8c9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns matched with ILIKE '%term%' by the list endpoints' search parameter.
+# A trigram GIN index lets Postgres answer those without a sequential scan.
+TRIGRAM_INDEXES = [
+    ('third_parties', 'name'),
+    ('third_parties', 'code'),
+    ('third_parties', 'email'),
+    ('third_parties', 'phone'),
+    ('medicines', 'name'),
+    ('medicines', 'code'),
+    ('medicines', 'description'),
+    ('equipment', 'name'),
+    ('equipment', 'code'),
+    ('equipment', 'description'),
+    ('medical_devices', 'name'),
+    ('medical_devices', 'code'),
+    ('medical_devices', 'description'),
+]
+
+
+def _drop_if_invalid(name: str, table: str) -> None:
+    """Drop index name if an interrupted concurrent build left it INVALID.
+
+    IF NOT EXISTS would otherwise keep the unusable index. Needs a live
+    connection, so offline (--sql) runs skip the check.
+    """
+    if op.get_context().as_sql:
+        return
+    invalid = op.get_bind().execute(
+        sa.text('SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)'), {'name': name},
+    ).scalar()
+    if invalid:
+        op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # CONCURRENTLY so the GIN builds do not block writes to these tables; it
+    # cannot run inside a transaction, so each index commits on its own. A
+    # rerun skips the ones already built and rebuilds any that a failed build
+    # left INVALID.
+    with op.get_context().autocommit_block():
+        for table, column in TRIGRAM_INDEXES:
+            _drop_if_invalid(f'ix_{table}_{column}_trgm', table)
+            op.create_index(
+                f'ix_{table}_{column}_trgm',
+                table,
+                [column],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, column in reversed(TRIGRAM_INDEXES):
+            op.drop_index(
+                f'ix_{table}_{column}_trgm', table_name=table, postgresql_concurrently=True, if_exists=True,
+            )
+    # The pg_trgm extension is left installed; other objects may depend on it.
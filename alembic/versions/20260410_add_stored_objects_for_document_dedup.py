@@ -0,0 +1,37 @@
+"""add stored_objects and patient_documents.content_sha256 for deduplication
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-04-10 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7b8c9d0e1f2'
+down_revision: Union[str, None] = 'f6a7b8c9d0e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'stored_objects',
+        sa.Column('content_sha256', sa.String(length=64), nullable=False),
+        sa.Column('file_path', sa.String(), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), server_default='1', nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('content_sha256'),
+        sa.UniqueConstraint('file_path'),
+    )
+    # Existing documents predate hashing and keep their own objects.
+    op.add_column('patient_documents', sa.Column('content_sha256', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('patient_documents', 'content_sha256')
+    op.drop_table('stored_objects')
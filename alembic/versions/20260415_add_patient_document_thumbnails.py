@@ -0,0 +1,25 @@
+"""add patient_documents.thumbnail_path
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-04-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8c9d0e1f2a3'
+down_revision: Union[str, None] = 'a7b8c9d0e1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('patient_documents', sa.Column('thumbnail_path', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('patient_documents', 'thumbnail_path')
@@ -0,0 +1,61 @@
+"""add pg_trgm GIN index on appointments.code
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-04-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9d0e1f2a3b4'
+down_revision: Union[str, None] = 'b8c9d0e1f2a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = 'ix_appointments_code_trgm'
+
+
+def _drop_if_invalid(name: str, table: str) -> None:
+    """Drop index name if an interrupted concurrent build left it INVALID.
+
+    IF NOT EXISTS would otherwise keep the unusable index. Needs a live
+    connection, so offline (--sql) runs skip the check.
+    """
+    if op.get_context().as_sql:
+        return
+    invalid = op.get_bind().execute(
+        sa.text('SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)'), {'name': name},
+    ).scalar()
+    if invalid:
+        op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def upgrade() -> None:
+    # /search and the appointment list match codes with ILIKE '%term%'; the
+    # unique btree on code cannot serve a leading wildcard.
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # CONCURRENTLY so appointment writes are not blocked during the build; a
+    # rerun skips a built index and rebuilds one a failed build left INVALID.
+    with op.get_context().autocommit_block():
+        _drop_if_invalid(INDEX_NAME, 'appointments')
+        op.create_index(
+            INDEX_NAME,
+            'appointments',
+            ['code'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'code': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            INDEX_NAME, table_name='appointments', postgresql_concurrently=True, if_exists=True,
+        )
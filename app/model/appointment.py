@@ -1,6 +1,6 @@
 import secrets
 
-from sqlalchemy import Column, String, Integer, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import Column, String, Integer, DateTime, Text, Boolean, ForeignKey, Index, text
 
 from app.model.base import BaseModel
 
@@ -17,6 +17,17 @@ class Appointment(BaseModel):
     """Model for appointment records."""
 
     __tablename__ = "appointments"
+    __table_args__ = (
+        Index(
+            "ix_appointments_patient_id_appointment_date_not_deleted", "patient_id", "appointment_date",
+            postgresql_where=text("is_deleted = false"),
+        ),
+        Index(
+            "ix_appointments_doctor_id_appointment_date_not_deleted", "doctor_id", "appointment_date",
+            postgresql_where=text("is_deleted = false"),
+        ),
+        Index("ix_appointments_appointment_date_not_deleted", "appointment_date", postgresql_where=text("is_deleted = false")),
+    )
 
     code = Column(String, unique=True, nullable=False, default=generate_code)
     patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Date, Text, ForeignKey
+from sqlalchemy import Column, String, Integer, Date, Text, ForeignKey, Index, text
 
 from app.model.base import BaseModel
 
@@ -7,6 +7,9 @@ class InventoryTransaction(BaseModel):
     """Model for inventory transactions (purchase, donation, prescription, loss, etc.)."""
 
     __tablename__ = "inventory_transactions"
+    __table_args__ = (
+        Index("ix_inventory_transactions_transaction_date_not_deleted", "transaction_date", postgresql_where=text("is_deleted = false")),
+    )
 
     transaction_type = Column(String, nullable=False)
     third_party_id = Column(Integer, ForeignKey("third_parties.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index, text
 
 from app.model.base import BaseModel
 
@@ -7,6 +7,10 @@ class InventoryTransactionItem(BaseModel):
     """Model for inventory transaction line items."""
 
     __tablename__ = "inventory_transaction_items"
+    __table_args__ = (
+        Index("ix_inventory_transaction_items_transaction_id_not_deleted", "transaction_id", postgresql_where=text("is_deleted = false")),
+        Index("ix_inventory_transaction_items_item_id_not_deleted", "item_id", postgresql_where=text("is_deleted = false")),
+    )
 
     transaction_id = Column(Integer, ForeignKey("inventory_transactions.id"), nullable=False)
     item_id = Column(Integer, ForeignKey("items.id"), nullable=False)
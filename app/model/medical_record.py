@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Date, Text, ForeignKey
+from sqlalchemy import Column, Integer, Date, Text, ForeignKey, Index, text
 
 from app.model.base import BaseModel
 
@@ -7,6 +7,9 @@ class MedicalRecord(BaseModel):
     """Model for medical records."""
 
     __tablename__ = "medical_records"
+    __table_args__ = (
+        Index("ix_medical_records_appointment_id_not_deleted", "appointment_id", postgresql_where=text("is_deleted = false")),
+    )
 
     appointment_id = Column(Integer, ForeignKey("appointments.id"), nullable=False)
     chief_complaint = Column(Text, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index, text
 from sqlalchemy.sql import func
 
 from app.model.base import BaseModel
@@ -8,9 +8,14 @@ class PatientDocument(BaseModel):
     """Model for patient document records."""
 
     __tablename__ = "patient_documents"
+    __table_args__ = (
+        Index("ix_patient_documents_patient_id_not_deleted", "patient_id", postgresql_where=text("is_deleted = false")),
+    )
 
     patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
     document_name = Column(String, nullable=False)
     document_type = Column(String, nullable=True)
     file_path = Column(String, nullable=False)
+    content_sha256 = Column(String(64), nullable=True)
+    thumbnail_path = Column(String, nullable=True)
     upload_date = Column(DateTime, server_default=func.now(), nullable=False)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.utility.database import Base
+
+
+class StatisticsSnapshot(Base):
+    """Precomputed dashboard statistics, one row per statistics group.
+
+    Written only by the background refresher, which recomputes a group after
+    a service-layer write to it commits and before the snapshot expires.
+    """
+
+    __tablename__ = "statistics_snapshots"
+
+    key = Column(String, primary_key=True)
+    payload = Column(JSONB, nullable=True)
+    refreshed_at = Column(DateTime, nullable=False)
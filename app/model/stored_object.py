@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime
+from sqlalchemy.sql import func
+
+from app.utility.database import Base
+
+
+class StoredObject(Base):
+    """A stored file shared by every patient document with the same content.
+
+    ``ref_count`` is the number of live documents pointing at ``file_path``;
+    the object is removed from storage when it drops to zero.
+    """
+
+    __tablename__ = "stored_objects"
+
+    content_sha256 = Column(String(64), primary_key=True)
+    file_path = Column(String, unique=True, nullable=False)
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, default=1, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
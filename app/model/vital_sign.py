@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Numeric, Text, ForeignKey
+from sqlalchemy import Column, Integer, Numeric, Text, ForeignKey, Index, text
 
 from app.model.base import BaseModel
 
@@ -7,6 +7,9 @@ class VitalSign(BaseModel):
     """Model for vital signs records."""
 
     __tablename__ = "vital_signs"
+    __table_args__ = (
+        Index("ix_vital_signs_appointment_id_not_deleted", "appointment_id", postgresql_where=text("is_deleted = false")),
+    )
 
     appointment_id = Column(Integer, ForeignKey("appointments.id"), nullable=False)
     blood_pressure_systolic = Column(Integer, nullable=True)
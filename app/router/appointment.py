@@ -1,9 +1,10 @@
 import logging
+from datetime import date
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.utility.database import get_db
+from app.utility.database import get_db, get_read_db, release_read_session
 from app.utility.auth import get_current_user
 from app.service.appointment import AppointmentService
 from app.service.patient import PatientService
@@ -19,7 +20,7 @@ from app.schema.appointment import (
     AppointmentType,
     AppointmentLocation,
 )
-from app.schema.base import PaginatedResponse, MessageResponse
+from app.schema.base import CountMode, PaginatedResponse, MessageResponse
 from app.model.user import User
 
 logger = logging.getLogger("medbase.router.appointment")
@@ -37,33 +38,36 @@ async def get_appointments(
     status_filter: Optional[AppointmentStatus] = Query(None, alias="status", description="Filter by status"),
     type_filter: Optional[AppointmentType] = Query(None, alias="type", description="Filter by type"),
     location: Optional[AppointmentLocation] = Query(None, description="Filter by location"),
-    appointment_date: Optional[str] = Query(None, description="Filter by date (YYYY-MM-DD)"),
+    appointment_date: Optional[date] = Query(None, description="Filter by date (YYYY-MM-DD)"),
     search: Optional[str] = Query(None, description="Search in patient/doctor/partner names"),
     sort: str = Query("id", description="Sort field"),
     order: str = Query("asc", description="Sort order (asc/desc)"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (replaces page)"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count: exact, estimated, cached or none"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get all appointments with pagination, filtering, and sorting."""
     logger.info("Listing appointments page=%d size=%d by user_id=%d", page, size, current_user.id)
 
     service = AppointmentService(db)
-    appointments, total = await service.get_all(
+    appointments, page_info = await service.get_all(
         page=page, size=size, patient_id=patient_id,
         doctor_id=doctor_id, partner_id=partner_id,
         status=status_filter, type=type_filter,
         location=location, appointment_date=appointment_date,
-        search=search, sort=sort, order=order,
+        search=search, sort=sort, order=order, cursor=cursor, count=count,
     )
 
-    logger.info("Returning %d appointments (total=%d)", len(appointments), total)
-    return PaginatedResponse(items=appointments, total=total, page=page, size=size)
+    logger.info("Returning %d appointments (total=%s)", len(appointments), page_info.total)
+    await release_read_session(db)
+    return PaginatedResponse.from_page(appointments, page_info, page=page, size=size)
 
 
 @router.get("/{appointment_id}", response_model=AppointmentDetailResponse)
 async def get_appointment(
     appointment_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get appointment by ID (includes vitals, record)."""
@@ -75,6 +79,7 @@ async def get_appointment(
         logger.warning("Appointment not found appointment_id=%d", appointment_id)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Appointment not found")
 
+    await release_read_session(db)
     return result
 
 
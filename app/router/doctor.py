@@ -3,7 +3,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.utility.database import get_db
+from app.utility.database import get_db, get_read_db, release_read_session
 from app.utility.auth import get_current_user
 from app.service.doctor import DoctorService
 from app.service.partner import PartnerService
@@ -15,7 +15,7 @@ from app.schema.doctor import (
     DoctorDetailResponse,
     DoctorType,
 )
-from app.schema.base import PaginatedResponse, MessageResponse
+from app.schema.base import CountMode, PaginatedResponse, MessageResponse
 from app.model.user import User
 
 logger = logging.getLogger("medbase.router.doctor")
@@ -31,16 +31,18 @@ async def get_doctors(
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     partner_id: Optional[int] = Query(None, description="Filter by partner ID"),
     search: Optional[str] = Query(None, description="Search in name, specialization, email, phone"),
-    sort: str = Query("id", description="Sort field"),
+    sort: str = Query("id", description="Sort field, or relevance (best search matches first)"),
     order: str = Query("asc", description="Sort order (asc/desc)"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (replaces page)"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count: exact, estimated, cached or none"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get all doctors with pagination, filtering, and sorting."""
     logger.info("Listing doctors page=%d size=%d by user_id=%d", page, size, current_user.id)
 
     service = DoctorService(db)
-    doctors, total = await service.get_all(
+    doctors, page_info = await service.get_all(
         page=page,
         size=size,
         type=type,
@@ -49,19 +51,20 @@ async def get_doctors(
         search=search,
         sort=sort,
         order=order,
+        cursor=cursor,
+        count=count,
     )
 
-    logger.info("Returning %d doctors (total=%d)", len(doctors), total)
+    logger.info("Returning %d doctors (total=%s)", len(doctors), page_info.total)
 
-    return PaginatedResponse(
-        items=doctors, total=total, page=page, size=size,
-    )
+    await release_read_session(db)
+    return PaginatedResponse.from_page(doctors, page_info, page=page, size=size)
 
 
 @router.get("/{doctor_id}", response_model=DoctorDetailResponse)
 async def get_doctor(
     doctor_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get doctor by ID (includes partner name if applicable)."""
@@ -77,6 +80,7 @@ async def get_doctor(
             detail="Doctor not found",
         )
 
+    await release_read_session(db)
     return detail
 
 
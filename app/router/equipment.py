@@ -3,7 +3,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.utility.database import get_db
+from app.utility.database import get_db, get_read_db, release_read_session
 from app.utility.auth import get_current_user
 from app.service.equipment import EquipmentService
 from app.service.equipment_category import EquipmentCategoryService
@@ -14,7 +14,7 @@ from app.schema.equipment import (
     EquipmentDetailResponse,
 )
 from app.schema.equipment import EquipmentCondition
-from app.schema.base import PaginatedResponse, MessageResponse
+from app.schema.base import CountMode, PaginatedResponse, MessageResponse
 from app.model.user import User
 
 logger = logging.getLogger("medbase.router.equipment")
@@ -30,16 +30,18 @@ async def get_equipment_list(
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     condition: Optional[EquipmentCondition] = Query(None, description="Filter by condition (new/good/fair/poor)"),
     search: Optional[str] = Query(None, description="Search in name and description"),
-    sort: str = Query("id", description="Sort field"),
+    sort: str = Query("id", description="Sort field, or relevance (best search matches first)"),
     order: str = Query("asc", description="Sort order (asc/desc)"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (replaces page)"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count: exact, estimated, cached or none"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get all equipment with pagination, filtering, and sorting."""
     logger.info("Listing equipment page=%d size=%d by user_id=%d", page, size, current_user.id)
 
     service = EquipmentService(db)
-    items, total = await service.get_all(
+    items, page_info = await service.get_all(
         page=page,
         size=size,
         category_id=category_id,
@@ -48,19 +50,20 @@ async def get_equipment_list(
         search=search,
         sort=sort,
         order=order,
+        cursor=cursor,
+        count=count,
     )
 
-    logger.info("Returning %d equipment items (total=%d)", len(items), total)
+    logger.info("Returning %d equipment items (total=%s)", len(items), page_info.total)
 
-    return PaginatedResponse(
-        items=items, total=total, page=page, size=size,
-    )
+    await release_read_session(db)
+    return PaginatedResponse.from_page(items, page_info, page=page, size=size)
 
 
 @router.get("/{equipment_id}", response_model=EquipmentDetailResponse)
 async def get_equipment(
     equipment_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get equipment by ID (includes inventory quantity and category name)."""
@@ -76,6 +79,7 @@ async def get_equipment(
             detail="Equipment not found",
         )
 
+    await release_read_session(db)
     return detail
 
 
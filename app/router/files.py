@@ -0,0 +1,74 @@
+import logging
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Request, Response, status, Query
+from fastapi.responses import FileResponse
+
+from app.utility import storage
+
+logger = logging.getLogger("medbase.router.files")
+
+router = APIRouter(prefix="/files", tags=["Files"])
+
+
+@router.get("/{key:path}", response_class=FileResponse, include_in_schema=False)
+async def download_file(
+    key: str,
+    expires: int = Query(..., description="Expiry as a Unix timestamp"),
+    signature: str = Query(..., description="HMAC signature issued with the URL"),
+    filename: Optional[str] = Query(None, description="Download filename"),
+):
+    """Serve a file from the local storage backend via a presigned URL.
+
+    The signature stands in for authentication, as with S3 presigned URLs.
+    """
+    backend = storage.get_backend()
+    if not isinstance(backend, storage.LocalBackend):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+    try:
+        path = backend.verify(key, expires, signature, filename or "")
+    except ValueError as e:
+        logger.warning("Rejected file download key='%s': %s", key, str(e))
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+
+    if not path.is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    return FileResponse(path, filename=filename)
+
+
+@router.put("/{key:path}", status_code=status.HTTP_200_OK, include_in_schema=False)
+async def upload_file(
+    key: str,
+    request: Request,
+    expires: int = Query(..., description="Expiry as a Unix timestamp"),
+    size: int = Query(..., description="Declared size in bytes"),
+    sha256: str = Query(..., description="Declared SHA-256 (hex)"),
+    signature: str = Query(..., description="HMAC signature issued with the URL"),
+):
+    """Accept a direct upload to the local storage backend via a presigned URL.
+
+    The body is streamed to disk and kept only if it matches the size and
+    checksum the URL was issued for.
+    """
+    backend = storage.get_backend()
+    if not isinstance(backend, storage.LocalBackend):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+    try:
+        backend.verify_upload(key, expires, size, sha256, signature)
+    except ValueError as e:
+        logger.warning("Rejected file upload key='%s': %s", key, str(e))
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+
+    content_type = request.headers.get("content-type", "application/octet-stream")
+    try:
+        stored = await backend.upload_stream(key, storage.stream_reader(request.stream(), limit=size), content_type)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if stored.size != size or stored.sha256 != sha256:
+        await backend.delete(key)
+        logger.warning("Discarded upload key='%s': size=%d sha256=%s does not match", key, stored.size, stored.sha256)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Content does not match the declared size and checksum")
+
+    return Response(status_code=status.HTTP_200_OK)
@@ -4,12 +4,12 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.utility.database import get_db
+from app.utility.database import get_read_db, release_read_session
 from app.utility.auth import get_current_user
 from app.service.inventory import InventoryService
 from app.schema.inventory import InventoryResponse
 from app.schema.item import ItemType
-from app.schema.base import PaginatedResponse
+from app.schema.base import CountMode, PaginatedResponse
 from app.model.user import User
 
 logger = logging.getLogger("medbase.router.inventory")
@@ -24,28 +24,29 @@ async def get_inventory_list(
     item_type: Optional[ItemType] = Query(None, description="Filter by item type (medicine/equipment/medical_device)"),
     sort: str = Query("id", description="Sort field"),
     order: str = Query("asc", description="Sort order (asc/desc)"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (replaces page)"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count: exact, estimated, cached or none"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get all inventory records with pagination and filtering."""
     logger.info("Listing inventory page=%d size=%d by user_id=%d", page, size, current_user.id)
 
     service = InventoryService(db)
-    records, total = await service.get_all(
-        page=page, size=size, item_type=item_type, sort=sort, order=order
+    records, page_info = await service.get_all(
+        page=page, size=size, item_type=item_type, sort=sort, order=order, cursor=cursor, count=count
     )
 
-    logger.info("Returning %d inventory records (total=%d)", len(records), total)
+    logger.info("Returning %d inventory records (total=%s)", len(records), page_info.total)
 
-    return PaginatedResponse(
-        items=records, total=total, page=page, size=size,
-    )
+    await release_read_session(db)
+    return PaginatedResponse.from_page(records, page_info, page=page, size=size)
 
 
 @router.get("/{inventory_id}", response_model=InventoryResponse)
 async def get_inventory(
     inventory_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get inventory record by ID."""
@@ -61,13 +62,14 @@ async def get_inventory(
             detail="Inventory record not found",
         )
 
+    await release_read_session(db)
     return inventory
 
 
 @router.get("/item/{item_id}", response_model=InventoryResponse)
 async def get_inventory_by_item(
     item_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get inventory record by item ID."""
@@ -86,4 +88,5 @@ async def get_inventory_by_item(
             detail="Inventory record not found",
         )
 
+    await release_read_session(db)
     return inventory
@@ -5,7 +5,7 @@ from datetime import date
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.utility.database import get_db
+from app.utility.database import get_db, get_read_db, release_read_session
 from app.utility.auth import get_current_user
 from app.service.inventory_transaction import InventoryTransactionService
 from app.schema.inventory_transaction import (
@@ -16,7 +16,7 @@ from app.schema.inventory_transaction import (
     TransactionByItemResponse,
     TransactionType,
 )
-from app.schema.base import PaginatedResponse, MessageResponse
+from app.schema.base import CountMode, PaginatedResponse, MessageResponse
 from app.model.user import User
 
 logger = logging.getLogger("medbase.router.inventory_transaction")
@@ -37,22 +37,25 @@ async def get_transactions(
     transaction_date: Optional[date] = Query(None, description="Filter by date"),
     sort: str = Query("id", description="Sort field"),
     order: str = Query("asc", description="Sort order (asc/desc)"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (replaces page)"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count: exact, estimated, cached or none"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """List all inventory transactions."""
     logger.info("Listing inventory transactions page=%d size=%d by user_id=%d", page, size, current_user.id)
 
     service = InventoryTransactionService(db)
-    transactions, total = await service.get_all(
+    transactions, page_info = await service.get_all(
         page=page, size=size, transaction_type=transaction_type,
         third_party_id=third_party_id, appointment_id=appointment_id,
         transaction_date=str(transaction_date) if transaction_date else None,
-        sort=sort, order=order,
+        sort=sort, order=order, cursor=cursor, count=count,
     )
 
-    logger.info("Returning %d inventory transactions (total=%d)", len(transactions), total)
-    return PaginatedResponse(items=transactions, total=total, page=page, size=size)
+    logger.info("Returning %d inventory transactions (total=%s)", len(transactions), page_info.total)
+    await release_read_session(db)
+    return PaginatedResponse.from_page(transactions, page_info, page=page, size=size)
 
 
 @router.get("/by-item/{item_id}", response_model=PaginatedResponse[TransactionByItemResponse])
@@ -63,26 +66,29 @@ async def get_transactions_by_item(
     transaction_type: Optional[TransactionType] = Query(None, description="Filter by transaction type"),
     sort: str = Query("id", description="Sort field"),
     order: str = Query("asc", description="Sort order (asc/desc)"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (replaces page)"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count: exact, estimated, cached or none"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get inventory transactions that include a specific item, with the transaction item details."""
     logger.info("Listing transactions for item_id=%d page=%d size=%d by user_id=%d", item_id, page, size, current_user.id)
 
     service = InventoryTransactionService(db)
-    transactions, total = await service.get_transactions_by_item(
+    transactions, page_info = await service.get_transactions_by_item(
         item_id=item_id, page=page, size=size,
-        transaction_type=transaction_type, sort=sort, order=order,
+        transaction_type=transaction_type, sort=sort, order=order, cursor=cursor, count=count,
     )
 
-    logger.info("Returning %d transactions for item_id=%d (total=%d)", len(transactions), item_id, total)
-    return PaginatedResponse(items=transactions, total=total, page=page, size=size)
+    logger.info("Returning %d transactions for item_id=%d (total=%s)", len(transactions), item_id, page_info.total)
+    await release_read_session(db)
+    return PaginatedResponse.from_page(transactions, page_info, page=page, size=size)
 
 
 @router.get("/{transaction_id}", response_model=InventoryTransactionResponse)
 async def get_transaction(
     transaction_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get inventory transaction by ID (includes items)."""
@@ -94,6 +100,7 @@ async def get_transaction(
         logger.warning("Inventory transaction not found transaction_id=%d", transaction_id)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Inventory transaction not found")
 
+    await release_read_session(db)
     return result
 
 
@@ -139,19 +146,17 @@ async def create_transaction(
     else:
         third_party_id = current_user.third_party_id
 
-    # Validate items if provided
+    # Validate items if provided (inventory must exist; equipment cannot be prescribed)
     if data.items:
-        for item in data.items:
-            try:
-                await service.validate_inventory_item(item.item_id)
-            except ValueError as e:
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-            # Equipment cannot be prescribed
-            if data.transaction_type == "prescription":
-                try:
-                    await service.validate_prescription_item(item.item_id)
-                except ValueError as e:
-                    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        errors = await service.validate_items(
+            [item.item_id for item in data.items], data.transaction_type,
+        )
+        if errors:
+            logger.warning("Invalid transaction items: %s", errors)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"message": "Invalid transaction items", "errors": errors},
+            )
 
     try:
         transaction = await service.create(data, third_party_id, created_by=current_user.username)
@@ -4,7 +4,7 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.utility.database import get_db
+from app.utility.database import get_db, get_read_db, release_read_session
 from app.utility.auth import get_current_user
 from app.service.inventory_transaction import InventoryTransactionService
 from app.schema.inventory_transaction import (
@@ -26,7 +26,7 @@ router = APIRouter(tags=["Inventory Transaction Items"])
 )
 async def get_transaction_items(
     transaction_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """List items for a transaction."""
@@ -38,6 +38,7 @@ async def get_transaction_items(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Inventory transaction not found")
 
     items = await service.get_items_for_transaction(transaction_id)
+    await release_read_session(db)
     return items
 
 
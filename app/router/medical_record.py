@@ -3,7 +3,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.utility.database import get_db
+from app.utility.database import get_db, get_read_db, release_read_session
 from app.utility.auth import get_current_user
 from app.service.medical_record import MedicalRecordService
 from app.service.appointment import AppointmentService
@@ -12,7 +12,7 @@ from app.schema.medical_record import (
     MedicalRecordUpdate,
     MedicalRecordResponse,
 )
-from app.schema.base import PaginatedResponse, MessageResponse
+from app.schema.base import CountMode, PaginatedResponse, MessageResponse
 from app.model.user import User
 
 logger = logging.getLogger("medbase.router.medical_record")
@@ -28,26 +28,29 @@ async def get_medical_records(
     appointment_id: Optional[int] = Query(None, description="Filter by appointment"),
     sort: str = Query("id", description="Sort field"),
     order: str = Query("asc", description="Sort order (asc/desc)"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (replaces page)"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count: exact, estimated, cached or none"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """List all medical records."""
     logger.info("Listing medical records page=%d size=%d by user_id=%d", page, size, current_user.id)
 
     service = MedicalRecordService(db)
-    records, total = await service.get_all(
+    records, page_info = await service.get_all(
         page=page, size=size, patient_id=patient_id,
-        appointment_id=appointment_id, sort=sort, order=order,
+        appointment_id=appointment_id, sort=sort, order=order, cursor=cursor, count=count,
     )
 
-    logger.info("Returning %d medical records (total=%d)", len(records), total)
-    return PaginatedResponse(items=records, total=total, page=page, size=size)
+    logger.info("Returning %d medical records (total=%s)", len(records), page_info.total)
+    await release_read_session(db)
+    return PaginatedResponse.from_page(records, page_info, page=page, size=size)
 
 
 @router.get("/medical-records/{record_id}", response_model=MedicalRecordResponse)
 async def get_medical_record(
     record_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get medical record by ID."""
@@ -59,13 +62,14 @@ async def get_medical_record(
         logger.warning("Medical record not found record_id=%d", record_id)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Medical record not found")
 
+    await release_read_session(db)
     return result
 
 
 @router.get("/appointments/{appointment_id}/medical-record", response_model=MedicalRecordResponse)
 async def get_medical_record_for_appointment(
     appointment_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get medical record for an appointment."""
@@ -84,6 +88,7 @@ async def get_medical_record_for_appointment(
         logger.warning("Medical record not found for appointment_id=%d", appointment_id)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Medical record not found for this appointment")
 
+    await release_read_session(db)
     return record
 
 
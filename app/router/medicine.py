@@ -3,7 +3,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.utility.database import get_db
+from app.utility.database import get_db, get_read_db, release_read_session
 from app.utility.auth import get_current_user
 from app.service.medicine import MedicineService
 from app.service.medicine_category import MedicineCategoryService
@@ -13,7 +13,7 @@ from app.schema.medicine import (
     MedicineResponse,
     MedicineDetailResponse,
 )
-from app.schema.base import PaginatedResponse, MessageResponse
+from app.schema.base import CountMode, PaginatedResponse, MessageResponse
 from app.model.user import User
 
 logger = logging.getLogger("medbase.router.medicine")
@@ -28,16 +28,18 @@ async def get_medicines(
     category_id: Optional[int] = Query(None, description="Filter by category ID"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     search: Optional[str] = Query(None, description="Search in name and description"),
-    sort: str = Query("id", description="Sort field"),
+    sort: str = Query("id", description="Sort field, or relevance (best search matches first)"),
     order: str = Query("asc", description="Sort order (asc/desc)"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (replaces page)"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count: exact, estimated, cached or none"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get all medicines with pagination, filtering, and sorting."""
     logger.info("Listing medicines page=%d size=%d by user_id=%d", page, size, current_user.id)
 
     service = MedicineService(db)
-    medicines, total = await service.get_all(
+    medicines, page_info = await service.get_all(
         page=page,
         size=size,
         category_id=category_id,
@@ -45,19 +47,20 @@ async def get_medicines(
         search=search,
         sort=sort,
         order=order,
+        cursor=cursor,
+        count=count,
     )
 
-    logger.info("Returning %d medicines (total=%d)", len(medicines), total)
+    logger.info("Returning %d medicines (total=%s)", len(medicines), page_info.total)
 
-    return PaginatedResponse(
-        items=medicines, total=total, page=page, size=size,
-    )
+    await release_read_session(db)
+    return PaginatedResponse.from_page(medicines, page_info, page=page, size=size)
 
 
 @router.get("/{medicine_id}", response_model=MedicineDetailResponse)
 async def get_medicine(
     medicine_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get medicine by ID (includes inventory quantity and category name)."""
@@ -73,6 +76,7 @@ async def get_medicine(
             detail="Medicine not found",
         )
 
+    await release_read_session(db)
     return detail
 
 
@@ -3,7 +3,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.utility.database import get_db
+from app.utility.database import get_db, get_read_db, release_read_session
 from app.utility.auth import get_current_user
 from app.service.medicine_category import MedicineCategoryService
 from app.schema.medicine_category import (
@@ -11,7 +11,7 @@ from app.schema.medicine_category import (
     MedicineCategoryUpdate,
     MedicineCategoryResponse,
 )
-from app.schema.base import PaginatedResponse, MessageResponse
+from app.schema.base import CountMode, PaginatedResponse, MessageResponse
 from app.model.user import User
 
 logger = logging.getLogger("medbase.router.medicine_category")
@@ -26,28 +26,29 @@ async def get_medicine_categories(
     search: Optional[str] = Query(None, description="Search in name and description"),
     sort: str = Query("id", description="Sort field"),
     order: str = Query("asc", description="Sort order (asc/desc)"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (replaces page)"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count: exact, estimated, cached or none"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get all medicine categories with pagination and sorting."""
     logger.info("Listing medicine categories page=%d size=%d by user_id=%d", page, size, current_user.id)
 
     service = MedicineCategoryService(db)
-    categories, total = await service.get_all(
-        page=page, size=size, search=search, sort=sort, order=order
+    categories, page_info = await service.get_all(
+        page=page, size=size, search=search, sort=sort, order=order, cursor=cursor, count=count
     )
 
-    logger.info("Returning %d medicine categories (total=%d)", len(categories), total)
+    logger.info("Returning %d medicine categories (total=%s)", len(categories), page_info.total)
 
-    return PaginatedResponse(
-        items=categories, total=total, page=page, size=size,
-    )
+    await release_read_session(db)
+    return PaginatedResponse.from_page(categories, page_info, page=page, size=size)
 
 
 @router.get("/{category_id}", response_model=MedicineCategoryResponse)
 async def get_medicine_category(
     category_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get medicine category by ID."""
@@ -63,6 +64,7 @@ async def get_medicine_category(
             detail="Medicine category not found",
         )
 
+    await release_read_session(db)
     return category
 
 
@@ -3,7 +3,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.utility.database import get_db
+from app.utility.database import get_db, get_read_db, release_read_session
 from app.utility.auth import get_current_user
 from app.service.partner import PartnerService
 from app.service.third_party import ThirdPartyService
@@ -14,7 +14,7 @@ from app.schema.partner import (
     PartnerType,
     OrganizationType,
 )
-from app.schema.base import PaginatedResponse, MessageResponse
+from app.schema.base import CountMode, PaginatedResponse, MessageResponse
 from app.model.user import User
 
 logger = logging.getLogger("medbase.router.partner")
@@ -30,29 +30,32 @@ async def get_partners(
     organization_type: Optional[OrganizationType] = Query(None, description="Filter by organization type"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     search: Optional[str] = Query(None, description="Search in name, contact_person, email, phone"),
-    sort: str = Query("id", description="Sort field"),
+    sort: str = Query("id", description="Sort field, or relevance (best search matches first)"),
     order: str = Query("asc", description="Sort order (asc/desc)"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (replaces page)"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count: exact, estimated, cached or none"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get all partners with pagination, filtering, and sorting."""
     logger.info("Listing partners page=%d size=%d by user_id=%d", page, size, current_user.id)
 
     service = PartnerService(db)
-    partners, total = await service.get_all(
+    partners, page_info = await service.get_all(
         page=page, size=size, partner_type=partner_type,
         organization_type=organization_type, is_active=is_active,
-        search=search, sort=sort, order=order,
+        search=search, sort=sort, order=order, cursor=cursor, count=count,
     )
 
-    logger.info("Returning %d partners (total=%d)", len(partners), total)
-    return PaginatedResponse(items=partners, total=total, page=page, size=size)
+    logger.info("Returning %d partners (total=%s)", len(partners), page_info.total)
+    await release_read_session(db)
+    return PaginatedResponse.from_page(partners, page_info, page=page, size=size)
 
 
 @router.get("/{partner_id}", response_model=PartnerResponse)
 async def get_partner(
     partner_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get partner by ID."""
@@ -65,6 +68,7 @@ async def get_partner(
         logger.warning("Partner not found partner_id=%d", partner_id)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Partner not found")
 
+    await release_read_session(db)
     return partner
 
 
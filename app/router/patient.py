@@ -3,7 +3,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.utility.database import get_db
+from app.utility.database import get_db, get_read_db, release_read_session
 from app.utility.auth import get_current_user
 from app.service.patient import PatientService
 from app.service.third_party import ThirdPartyService
@@ -13,7 +13,7 @@ from app.schema.patient import (
     PatientResponse,
     Gender,
 )
-from app.schema.base import PaginatedResponse, MessageResponse
+from app.schema.base import CountMode, PaginatedResponse, MessageResponse
 from app.model.user import User
 
 logger = logging.getLogger("medbase.router.patient")
@@ -28,29 +28,32 @@ async def get_patients(
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     gender: Optional[Gender] = Query(None, description="Filter by gender"),
     search: Optional[str] = Query(None, description="Search in name, phone, email"),
-    sort: str = Query("id", description="Sort field"),
+    sort: str = Query("id", description="Sort field, or relevance (best search matches first)"),
     order: str = Query("asc", description="Sort order (asc/desc)"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (replaces page)"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count: exact, estimated, cached or none"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get all patients with pagination, filtering, and sorting."""
     logger.info("Listing patients page=%d size=%d by user_id=%d", page, size, current_user.id)
 
     service = PatientService(db)
-    patients, total = await service.get_all(
+    patients, page_info = await service.get_all(
         page=page, size=size, is_active=is_active,
-        gender=gender, search=search, sort=sort, order=order,
+        gender=gender, search=search, sort=sort, order=order, cursor=cursor, count=count,
     )
 
-    logger.info("Returning %d patients (total=%d)", len(patients), total)
-    return PaginatedResponse(items=patients, total=total, page=page, size=size)
+    logger.info("Returning %d patients (total=%s)", len(patients), page_info.total)
+    await release_read_session(db)
+    return PaginatedResponse.from_page(patients, page_info, page=page, size=size)
 
 
 @router.get("/{patient_id}", response_model=PatientResponse)
 async def get_patient(
     patient_id: int,
     with_documents: bool = Query(False, description="Include patient documents in response"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get patient by ID."""
@@ -66,6 +69,7 @@ async def get_patient(
         patient, documents = result
         data = PatientResponse.model_validate(patient).model_dump()
         data["documents"] = documents
+        await release_read_session(db)
         return data
 
     patient = await service.get_by_id(patient_id)
@@ -73,6 +77,7 @@ async def get_patient(
         logger.warning("Patient not found patient_id=%d", patient_id)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found")
 
+    await release_read_session(db)
     return patient
 
 
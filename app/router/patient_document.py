@@ -1,21 +1,43 @@
 import logging
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, UploadFile, File, Form
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.utility.database import get_db
+from app.utility.database import get_db, get_read_db, get_session_factory, release_read_session
 from app.utility.auth import get_current_user
 from app.service.patient import PatientService
-from app.service.patient_document import PatientDocumentService, document_to_response
-from app.schema.patient_document import PatientDocumentResponse, PatientDocumentType
-from app.schema.base import PaginatedResponse, MessageResponse
+from app.service.patient_document import (
+    PatientDocumentService,
+    document_to_response,
+    documents_to_responses,
+    generate_thumbnail,
+)
+from app.schema.patient_document import (
+    PatientDocumentResponse,
+    PatientDocumentType,
+    PatientDocumentUploadRequest,
+    PatientDocumentUploadTicket,
+    PatientDocumentUploadComplete,
+)
+from app.schema.base import CountMode, PaginatedResponse, MessageResponse
 from app.model.user import User
+from app.model.patient_document import PatientDocument
+from app.utility import thumbnail
+from app.utility.config import settings
 
 logger = logging.getLogger("medbase.router.patient_document")
 
 router = APIRouter(tags=["Patient Documents"])
 
 
+def _schedule_thumbnail(
+    background_tasks: BackgroundTasks, session_factory: async_sessionmaker, doc: PatientDocument,
+) -> None:
+    """Queue preview rendering to run after the response is sent."""
+    if settings.THUMBNAIL_WORKERS > 0 and not doc.thumbnail_path and thumbnail.can_render(doc.file_path):
+        background_tasks.add_task(generate_thumbnail, session_factory, doc.file_path)
+
+
 @router.get("/patient-document-types", response_model=list[dict])
 async def get_patient_document_types(
     current_user: User = Depends(get_current_user),
@@ -36,7 +58,9 @@ async def get_patient_documents(
     document_type: Optional[str] = Query(None, description="Filter by document type"),
     sort: str = Query("id", description="Sort field"),
     order: str = Query("asc", description="Sort order (asc/desc)"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (replaces page)"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count: exact, estimated, cached or none"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """List documents for a patient."""
@@ -49,21 +73,22 @@ async def get_patient_documents(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found")
 
     service = PatientDocumentService(db)
-    documents, total = await service.get_all_for_patient(
+    documents, page_info = await service.get_all_for_patient(
         patient_id=patient_id, page=page, size=size,
-        document_type=document_type, sort=sort, order=order,
+        document_type=document_type, sort=sort, order=order, cursor=cursor, count=count,
     )
 
-    items = [await document_to_response(doc) for doc in documents]
+    await release_read_session(db)
+    items = await documents_to_responses(documents)
 
-    logger.info("Returning %d documents (total=%d) for patient_id=%d", len(documents), total, patient_id)
-    return PaginatedResponse(items=items, total=total, page=page, size=size)
+    logger.info("Returning %d documents (total=%s) for patient_id=%d", len(documents), page_info.total, patient_id)
+    return PaginatedResponse.from_page(items, page_info, page=page, size=size)
 
 
 @router.get("/patient-documents/{document_id}", response_model=PatientDocumentResponse)
 async def get_patient_document(
     document_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get document by ID."""
@@ -76,6 +101,7 @@ async def get_patient_document(
         logger.warning("Document not found document_id=%d", document_id)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
 
+    await release_read_session(db)
     return await document_to_response(doc)
 
 
@@ -86,10 +112,12 @@ async def get_patient_document(
 )
 async def upload_patient_document(
     patient_id: int,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     document_name: Optional[str] = Form(None, description="Custom display name for the document"),
     document_type: Optional[str] = Form(None),
     db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
     current_user: User = Depends(get_current_user),
 ):
     """Upload a document for a patient. Accepts multipart/form-data."""
@@ -114,6 +142,71 @@ async def upload_patient_document(
     )
 
     logger.info("Document uploaded document_id=%d patient_id=%d", doc.id, patient_id)
+    _schedule_thumbnail(background_tasks, session_factory, doc)
+    return await document_to_response(doc)
+
+
+@router.post(
+    "/patients/{patient_id}/documents/uploads",
+    response_model=PatientDocumentUploadTicket,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_patient_document_upload(
+    patient_id: int,
+    data: PatientDocumentUploadRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Start a direct upload: returns a presigned URL to PUT the file to storage.
+
+    Once the PUT succeeds, call the complete endpoint with the upload_token.
+    """
+    logger.info(
+        "Starting direct upload for patient_id=%d filename='%s' size=%d by user_id=%d",
+        patient_id, data.filename, data.size, current_user.id,
+    )
+
+    patient_service = PatientService(db)
+    patient = await patient_service.get_by_id(patient_id)
+    if not patient:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found")
+
+    service = PatientDocumentService(db)
+    try:
+        return await service.create_upload(patient_id, data)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post(
+    "/patients/{patient_id}/documents/uploads/complete",
+    response_model=PatientDocumentResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def complete_patient_document_upload(
+    patient_id: int,
+    data: PatientDocumentUploadComplete,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+    current_user: User = Depends(get_current_user),
+):
+    """Finish a direct upload: verifies the stored file and records the document."""
+    logger.info("Completing direct upload for patient_id=%d by user_id=%d", patient_id, current_user.id)
+
+    patient_service = PatientService(db)
+    patient = await patient_service.get_by_id(patient_id)
+    if not patient:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found")
+
+    service = PatientDocumentService(db)
+    try:
+        doc = await service.complete_upload(patient_id, data, created_by=current_user.username)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    logger.info("Document uploaded document_id=%d patient_id=%d", doc.id, patient_id)
+    _schedule_thumbnail(background_tasks, session_factory, doc)
     return await document_to_response(doc)
 
 
@@ -0,0 +1,33 @@
+import logging
+from typing import Optional, List
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utility.database import get_read_db, release_read_session
+from app.utility.auth import get_current_user
+from app.service.search import SearchService
+from app.schema.search import SearchEntity, SearchResponse
+from app.model.user import User
+
+logger = logging.getLogger("medbase.router.search")
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get("", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=100, description="Search text"),
+    types: Optional[List[SearchEntity]] = Query(None, description="Restrict to these entity types (repeatable)"),
+    limit: int = Query(20, ge=1, le=50, description="Maximum number of hits"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Search patients, doctors, partners, medicines, equipment, medical devices and appointment codes at once."""
+    logger.info("Searching q='%s' types=%s by user_id=%d", q, types, current_user.id)
+
+    service = SearchService(db)
+    items = await service.search(q, types=types, limit=limit)
+
+    logger.info("Returning %d search hits", len(items))
+    await release_read_session(db)
+    return SearchResponse(query=q, items=items)
@@ -1,8 +1,8 @@
 import logging
 from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.utility.database import get_db
+from app.utility.database import get_read_db, get_read_session_factory, release_read_session
 from app.utility.auth import get_current_user
 from app.service.statistics import StatisticsService
 from app.schema.statistics import (
@@ -20,43 +20,55 @@ router = APIRouter(prefix="/statistics", tags=["Statistics"])
 
 @router.get("/summary", response_model=SummaryStats)
 async def get_summary(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
+    read_session_factory: async_sessionmaker = Depends(get_read_session_factory),
     current_user: User = Depends(get_current_user),
 ):
     """Get summary statistics for the dashboard."""
     logger.info("Fetching dashboard summary by user_id=%d", current_user.id)
-    service = StatisticsService(db)
-    return await service.get_summary()
+    service = StatisticsService(db, read_session_factory)
+    stats = await service.get_summary()
+    await release_read_session(db)
+    return stats
 
 
 @router.get("/inventory", response_model=InventoryStats)
 async def get_inventory_stats(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
+    read_session_factory: async_sessionmaker = Depends(get_read_session_factory),
     current_user: User = Depends(get_current_user),
 ):
     """Get inventory statistics (low stock alerts, items by type)."""
     logger.info("Fetching inventory stats by user_id=%d", current_user.id)
-    service = StatisticsService(db)
-    return await service.get_inventory_stats()
+    service = StatisticsService(db, read_session_factory)
+    stats = await service.get_inventory_stats()
+    await release_read_session(db)
+    return stats
 
 
 @router.get("/appointments", response_model=AppointmentStats)
 async def get_appointment_stats(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
+    read_session_factory: async_sessionmaker = Depends(get_read_session_factory),
     current_user: User = Depends(get_current_user),
 ):
     """Get appointment statistics (today, upcoming, by status, by month)."""
     logger.info("Fetching appointment stats by user_id=%d", current_user.id)
-    service = StatisticsService(db)
-    return await service.get_appointment_stats()
+    service = StatisticsService(db, read_session_factory)
+    stats = await service.get_appointment_stats()
+    await release_read_session(db)
+    return stats
 
 
 @router.get("/transactions", response_model=TransactionStats)
 async def get_transaction_stats(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
+    read_session_factory: async_sessionmaker = Depends(get_read_session_factory),
     current_user: User = Depends(get_current_user),
 ):
     """Get transaction statistics (by type, recent transactions)."""
     logger.info("Fetching transaction stats by user_id=%d", current_user.id)
-    service = StatisticsService(db)
-    return await service.get_transaction_stats()
+    service = StatisticsService(db, read_session_factory)
+    stats = await service.get_transaction_stats()
+    await release_read_session(db)
+    return stats
@@ -3,11 +3,11 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.utility.database import get_db
+from app.utility.database import get_db, get_read_db, release_read_session
 from app.utility.auth import get_current_user
 from app.service.third_party import ThirdPartyService
 from app.schema.third_party import ThirdPartyResponse, ThirdPartyUpdate
-from app.schema.base import PaginatedResponse
+from app.schema.base import CountMode, PaginatedResponse
 from app.model.user import User
 
 logger = logging.getLogger("medbase.router.third_party")
@@ -21,34 +21,37 @@ async def get_third_parties(
     size: int = Query(10, ge=1, le=100, description="Page size"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     search: Optional[str] = Query(None, description="Search in name, email, phone"),
-    sort: str = Query("id", description="Sort field"),
+    sort: str = Query("id", description="Sort field, or relevance (best search matches first)"),
     order: str = Query("asc", description="Sort order (asc/desc)"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (replaces page)"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count: exact, estimated, cached or none"),
     exclude_patients: bool = Query(False, description="Exclude third parties linked to patients"),
     exclude_doctors: bool = Query(False, description="Exclude third parties linked to doctors"),
     exclude_partners: bool = Query(False, description="Exclude third parties linked to partners"),
     exclude_users: bool = Query(False, description="Exclude third parties linked to users"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get all third parties with pagination and filtering."""
     logger.info("Listing third parties page=%d size=%d by user_id=%d", page, size, current_user.id)
 
     service = ThirdPartyService(db)
-    records, total = await service.get_all(
+    records, page_info = await service.get_all(
         page=page, size=size, is_active=is_active,
-        search=search, sort=sort, order=order,
+        search=search, sort=sort, order=order, cursor=cursor, count=count,
         exclude_patients=exclude_patients, exclude_doctors=exclude_doctors,
         exclude_partners=exclude_partners, exclude_users=exclude_users,
     )
 
-    logger.info("Returning %d third parties (total=%d)", len(records), total)
-    return PaginatedResponse(items=records, total=total, page=page, size=size)
+    logger.info("Returning %d third parties (total=%s)", len(records), page_info.total)
+    await release_read_session(db)
+    return PaginatedResponse.from_page(records, page_info, page=page, size=size)
 
 
 @router.get("/{third_party_id}", response_model=ThirdPartyResponse)
 async def get_third_party(
     third_party_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get third party by ID."""
@@ -64,6 +67,7 @@ async def get_third_party(
             detail="Third party not found",
         )
 
+    await release_read_session(db)
     return record
 
 
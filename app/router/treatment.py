@@ -3,7 +3,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.utility.database import get_db
+from app.utility.database import get_db, get_read_db, release_read_session
 from app.utility.auth import get_current_user
 from app.service.treatment import TreatmentService
 from app.service.patient import PatientService
@@ -16,7 +16,7 @@ from app.schema.treatment import (
     TreatmentResponse,
     TreatmentStatus,
 )
-from app.schema.base import PaginatedResponse, MessageResponse
+from app.schema.base import CountMode, PaginatedResponse, MessageResponse
 from app.model.user import User
 
 logger = logging.getLogger("medbase.router.treatment")
@@ -34,27 +34,30 @@ async def get_treatments(
     status_filter: Optional[TreatmentStatus] = Query(None, alias="status", description="Filter by status"),
     sort: str = Query("id", description="Sort field"),
     order: str = Query("asc", description="Sort order (asc/desc)"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (replaces page)"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count: exact, estimated, cached or none"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """List all treatments."""
     logger.info("Listing treatments page=%d size=%d by user_id=%d", page, size, current_user.id)
 
     service = TreatmentService(db)
-    treatments, total = await service.get_all(
+    treatments, page_info = await service.get_all(
         page=page, size=size, patient_id=patient_id,
         partner_id=partner_id, appointment_id=appointment_id,
-        status=status_filter, sort=sort, order=order,
+        status=status_filter, sort=sort, order=order, cursor=cursor, count=count,
     )
 
-    logger.info("Returning %d treatments (total=%d)", len(treatments), total)
-    return PaginatedResponse(items=treatments, total=total, page=page, size=size)
+    logger.info("Returning %d treatments (total=%s)", len(treatments), page_info.total)
+    await release_read_session(db)
+    return PaginatedResponse.from_page(treatments, page_info, page=page, size=size)
 
 
 @router.get("/{treatment_id}", response_model=TreatmentResponse)
 async def get_treatment(
     treatment_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get treatment by ID."""
@@ -66,6 +69,7 @@ async def get_treatment(
         logger.warning("Treatment not found treatment_id=%d", treatment_id)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Treatment not found")
 
+    await release_read_session(db)
     return result
 
 
@@ -3,13 +3,13 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.utility.database import get_db
+from app.utility.database import get_db, get_read_db, release_read_session
 from app.utility.auth import get_current_admin_user
 from app.service.user import UserService
 from app.service.third_party import ThirdPartyService
 from app.schema.user import UserCreate, UserUpdate, UserResponse
 from app.schema.user import UserRole
-from app.schema.base import PaginatedResponse, MessageResponse
+from app.schema.base import CountMode, PaginatedResponse, MessageResponse
 from app.model.user import User
 
 logger = logging.getLogger("medbase.router.user")
@@ -26,7 +26,9 @@ async def get_users(
     search: Optional[str] = Query(None, description="Search in username and email"),
     sort: str = Query("id", description="Sort field"),
     order: str = Query("asc", description="Sort order (asc/desc)"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (replaces page)"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count: exact, estimated, cached or none"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """
@@ -45,30 +47,28 @@ async def get_users(
     logger.info("Listing users page=%d size=%d by user_id=%d", page, size, current_user.id)
 
     user_service = UserService(db)
-    users, total = await user_service.get_all(
+    users, page_info = await user_service.get_all(
         page=page,
         size=size,
         role=role,
         is_active=is_active,
         search=search,
         sort=sort,
-        order=order
+        order=order,
+        cursor=cursor,
+        count=count,
     )
 
-    logger.info("Returning %d users (total=%d)", len(users), total)
+    logger.info("Returning %d users (total=%s)", len(users), page_info.total)
 
-    return PaginatedResponse(
-        items=users,
-        total=total,
-        page=page,
-        size=size,
-    )
+    await release_read_session(db)
+    return PaginatedResponse.from_page(users, page_info, page=page, size=size)
 
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """
@@ -88,6 +88,7 @@ async def get_user(
             detail="User not found"
         )
 
+    await release_read_session(db)
     return user
 
 
@@ -2,7 +2,7 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.utility.database import get_db
+from app.utility.database import get_db, get_read_db, release_read_session
 from app.utility.auth import get_current_user
 from app.service.vital_sign import VitalSignService
 from app.service.appointment import AppointmentService
@@ -22,7 +22,7 @@ router = APIRouter(tags=["Vital Signs"])
 @router.get("/appointments/{appointment_id}/vitals", response_model=VitalSignResponse)
 async def get_vitals_for_appointment(
     appointment_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get vital signs for an appointment."""
@@ -41,6 +41,7 @@ async def get_vitals_for_appointment(
         logger.warning("Vital signs not found for appointment_id=%d", appointment_id)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vital signs not found for this appointment")
 
+    await release_read_session(db)
     return vital_signs
 
 
@@ -1,10 +1,18 @@
 from datetime import datetime
+from enum import StrEnum
 from typing import Optional, Generic, TypeVar, List
 from pydantic import BaseModel, ConfigDict
 
 T = TypeVar('T')
 
 
+class CountMode(StrEnum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+    NONE = "none"
+
+
 class BaseSchema(BaseModel):
     """Base schema with common configuration."""
     
@@ -24,9 +32,23 @@ class PaginatedResponse(BaseModel, Generic[T]):
     """Generic paginated response."""
     
     items: List[T]
-    total: int
+    total: Optional[int] = None  # None when the count was skipped (count=none)
     page: int
     size: int
+    next_cursor: Optional[str] = None  # pass as ?cursor= to fetch the following page
+    count_strategy: Optional[CountMode] = None  # how total was obtained
+
+    @classmethod
+    def from_page(cls, items: list, page_info, page: int, size: int) -> "PaginatedResponse":
+        """Build from a service's (items, PageInfo) result."""
+        return cls(
+            items=items,
+            total=page_info.total,
+            page=page,
+            size=size,
+            next_cursor=page_info.next_cursor,
+            count_strategy=page_info.count_strategy,
+        )
 
 
 class MessageResponse(BaseModel):
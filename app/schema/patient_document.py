@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import StrEnum
-from typing import Optional
+from typing import Dict, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -28,6 +28,8 @@ class PatientDocumentResponse(BaseModel):
     document_type: Optional[str] = None
     file_path: str
     file_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    content_sha256: Optional[str] = None
     upload_date: datetime
     is_deleted: bool
     created_by: Optional[str] = None
@@ -36,8 +38,8 @@ class PatientDocumentResponse(BaseModel):
     updated_at: datetime
 
     @classmethod
-    def from_model(cls, doc, file_url: str) -> "PatientDocumentResponse":
-        """Build from a PatientDocument model with resolved file_url."""
+    def from_model(cls, doc, file_url: str, thumbnail_url: Optional[str] = None) -> "PatientDocumentResponse":
+        """Build from a PatientDocument model with resolved file_url and thumbnail_url."""
         return cls.model_validate(
             {
                 "id": doc.id,
@@ -46,6 +48,8 @@ class PatientDocumentResponse(BaseModel):
                 "document_type": doc.document_type,
                 "file_path": doc.file_path,
                 "file_url": file_url,
+                "thumbnail_url": thumbnail_url,
+                "content_sha256": doc.content_sha256,
                 "upload_date": doc.upload_date,
                 "is_deleted": doc.is_deleted,
                 "created_by": doc.created_by,
@@ -54,3 +58,31 @@ class PatientDocumentResponse(BaseModel):
                 "updated_at": doc.updated_at,
             }
         )
+
+
+class PatientDocumentUploadRequest(BaseModel):
+    """Schema for requesting a direct-to-storage upload URL."""
+
+    filename: str = Field(..., min_length=1, max_length=255)
+    content_type: str = Field("application/octet-stream", max_length=255)
+    size: int = Field(..., gt=0, description="File size in bytes")
+    sha256: str = Field(..., pattern="^[0-9a-f]{64}$", description="Hex SHA-256 of the file")
+
+
+class PatientDocumentUploadTicket(BaseModel):
+    """Schema for a presigned direct upload: PUT the file to upload_url with headers."""
+
+    upload_url: str
+    method: str = "PUT"
+    headers: Dict[str, str] = {}
+    file_path: str
+    upload_token: str
+    expires_in: int
+
+
+class PatientDocumentUploadComplete(BaseModel):
+    """Schema for registering a document after its direct upload finished."""
+
+    upload_token: str
+    document_name: Optional[str] = Field(None, max_length=255)
+    document_type: Optional[str] = None
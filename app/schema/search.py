@@ -0,0 +1,30 @@
+from enum import StrEnum
+from typing import Optional, List
+from pydantic import BaseModel
+
+
+class SearchEntity(StrEnum):
+    PATIENT = "patient"
+    DOCTOR = "doctor"
+    PARTNER = "partner"
+    MEDICINE = "medicine"
+    EQUIPMENT = "equipment"
+    MEDICAL_DEVICE = "medical_device"
+    APPOINTMENT = "appointment"
+
+
+class SearchHit(BaseModel):
+    """A single ranked match from the unified search."""
+
+    type: SearchEntity
+    id: int
+    name: Optional[str] = None  # for appointments, the patient's name
+    code: Optional[str] = None
+    rank: int  # 4 exact, 3 prefix, 2 word prefix, 1 substring
+
+
+class SearchResponse(BaseModel):
+    """Unified search results, best matches first."""
+
+    query: str
+    items: List[SearchHit]
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel
 
@@ -16,6 +17,7 @@ class SummaryStats(BaseModel):
     active_patients: int
     active_partners: int
     active_doctors: int
+    refreshed_at: Optional[datetime] = None  # when these figures were computed
 
 
 # --- Inventory Stats ---
@@ -44,6 +46,7 @@ class InventoryStats(BaseModel):
     total_quantity: int
     low_stock_items: List[LowStockItem]
     items_by_type: List[InventoryByType]
+    refreshed_at: Optional[datetime] = None  # when these figures were computed
 
 
 # --- Appointment Stats ---
@@ -71,6 +74,7 @@ class AppointmentStats(BaseModel):
     by_month: List[AppointmentsByMonth]
     total_completed: int
     total_cancelled: int
+    refreshed_at: Optional[datetime] = None  # when these figures were computed
 
 
 # --- Transaction Stats ---
@@ -99,3 +103,4 @@ class TransactionStats(BaseModel):
     total_transactions: int
     by_type: List[TransactionsByType]
     recent_transactions: List[RecentTransaction]
+    refreshed_at: Optional[datetime] = None  # when these figures were computed
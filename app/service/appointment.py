@@ -1,7 +1,8 @@
 import logging
+from datetime import date, datetime, time, timedelta
 from typing import Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, or_
 from sqlalchemy.orm import aliased
 
 from app.model.appointment import Appointment, generate_code
@@ -12,6 +13,9 @@ from app.model.doctor import Doctor
 from app.model.partner import Partner
 from app.model.third_party import ThirdParty
 from app.schema.appointment import AppointmentCreate, AppointmentUpdate, AppointmentDetailResponse, AppointmentResponse
+from app.service.statistics import mark_statistics_stale, APPOINTMENTS, SUMMARY
+from app.schema.base import CountMode
+from app.utility.pagination import paginate, PageInfo
 
 logger = logging.getLogger("medbase.service.appointment")
 
@@ -75,11 +79,13 @@ class AppointmentService:
         status: Optional[str] = None,
         type: Optional[str] = None,
         location: Optional[str] = None,
-        appointment_date: Optional[str] = None,
+        appointment_date: Optional[date] = None,
         search: Optional[str] = None,
         sort: str = "id",
         order: str = "asc",
-    ) -> Tuple[List[dict], int]:
+        cursor: Optional[str] = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[dict], PageInfo]:
         """Get all appointments with pagination, filtering, and sorting."""
         PatientTP = aliased(ThirdParty)
         DoctorTP = aliased(ThirdParty)
@@ -117,7 +123,12 @@ class AppointmentService:
         if location is not None:
             query = query.where(Appointment.location == location)
         if appointment_date is not None:
-            query = query.where(func.date(Appointment.appointment_date) == appointment_date)
+            # Half-open range rather than date(appointment_date) so the index applies
+            day_start = datetime.combine(appointment_date, time.min)
+            query = query.where(
+                Appointment.appointment_date >= day_start,
+                Appointment.appointment_date < day_start + timedelta(days=1),
+            )
         if search:
             search_term = f"%{search}%"
             query = query.where(
@@ -129,29 +140,19 @@ class AppointmentService:
                 )
             )
 
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
-
         sort_column = getattr(Appointment, sort, Appointment.id)
-        if order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        offset = (page - 1) * size
-        query = query.offset(offset).limit(size)
-
-        result = await self.db.execute(query)
-        rows = result.all()
+        rows, page_info = await paginate(
+            self.db, query, sort_column, Appointment.id,
+            page=page, size=size, order=order, cursor=cursor, count=count,
+        )
 
         appointments = [
             AppointmentResponse.from_row(row).model_dump()
             for row in rows
         ]
 
-        logger.debug("Queried appointments: total=%d returned=%d", total, len(appointments))
-        return appointments, total
+        logger.debug("Queried appointments: total=%s returned=%d", page_info.total, len(appointments))
+        return appointments, page_info
 
     async def create(self, data: AppointmentCreate, created_by: Optional[str] = None) -> Appointment:
         """Create a new appointment."""
@@ -172,6 +173,7 @@ class AppointmentService:
         await self.db.flush()
         await self.db.refresh(appointment)
 
+        mark_statistics_stale(self.db, SUMMARY, APPOINTMENTS)
         logger.info("Created appointment id=%d patient_id=%d", appointment.id, data.patient_id)
         return appointment
 
@@ -189,6 +191,7 @@ class AppointmentService:
         await self.db.flush()
         await self.db.refresh(appointment)
 
+        mark_statistics_stale(self.db, SUMMARY, APPOINTMENTS)
         logger.info("Updated appointment id=%d fields=%s", appointment_id, list(update_data.keys()))
         return appointment
 
@@ -203,6 +206,7 @@ class AppointmentService:
         await self.db.flush()
         await self.db.refresh(appointment)
 
+        mark_statistics_stale(self.db, SUMMARY, APPOINTMENTS)
         logger.info("Updated appointment id=%d status=%s", appointment_id, status)
         return appointment
 
@@ -214,5 +218,6 @@ class AppointmentService:
         appointment.is_deleted = True
         appointment.updated_by = deleted_by
         await self.db.flush()
+        mark_statistics_stale(self.db, SUMMARY, APPOINTMENTS)
         logger.info("Soft-deleted appointment id=%d", appointment_id)
         return True
@@ -1,7 +1,7 @@
 import logging
 from typing import Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from sqlalchemy import select
 from sqlalchemy.orm import contains_eager, aliased
 
 from app.model.doctor import Doctor
@@ -9,6 +9,10 @@ from app.model.partner import Partner
 from app.model.third_party import ThirdParty
 from app.schema.doctor import DoctorCreate, DoctorUpdate, DoctorDetailResponse
 from app.service.third_party import ThirdPartyService
+from app.service.statistics import mark_statistics_stale, SUMMARY
+from app.schema.base import CountMode
+from app.utility.pagination import paginate, PageInfo
+from app.utility.search import search_filter, search_rank, RELEVANCE
 
 logger = logging.getLogger("medbase.service.doctor")
 
@@ -64,7 +68,9 @@ class DoctorService:
         search: Optional[str] = None,
         sort: str = "id",
         order: str = "asc",
-    ) -> Tuple[List[Doctor], int]:
+        cursor: Optional[str] = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[Doctor], PageInfo]:
         """Get all doctors with pagination, filtering, and sorting."""
         query = (
             select(Doctor)
@@ -79,36 +85,23 @@ class DoctorService:
             query = query.where(Doctor.is_active == is_active)
         if partner_id is not None:
             query = query.where(Doctor.partner_id == partner_id)
+        search_columns = (ThirdParty.name, Doctor.specialization, ThirdParty.email, ThirdParty.phone)
         if search:
-            search_term = f"%{search}%"
-            query = query.where(
-                or_(
-                    ThirdParty.name.ilike(search_term),
-                    Doctor.specialization.ilike(search_term),
-                    ThirdParty.email.ilike(search_term),
-                    ThirdParty.phone.ilike(search_term),
-                )
-            )
-
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
+            query = query.where(search_filter(search, *search_columns))
 
         tp_sort_map = {"name": ThirdParty.name, "phone": ThirdParty.phone, "email": ThirdParty.email}
         sort_column = tp_sort_map.get(sort, getattr(Doctor, sort, Doctor.id))
-        if order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        offset = (page - 1) * size
-        query = query.offset(offset).limit(size)
-
-        result = await self.db.execute(query)
-        doctors = result.unique().scalars().all()
+        if sort == RELEVANCE and search:
+            # Best matches first, regardless of the requested order
+            sort_column, order = search_rank(search, *search_columns), "desc"
+        rows, page_info = await paginate(
+            self.db, query, sort_column, Doctor.id,
+            page=page, size=size, order=order, cursor=cursor, count=count,
+        )
+        doctors = [row[0] for row in rows]
 
-        logger.debug("Queried doctors: total=%d returned=%d", total, len(doctors))
-        return list(doctors), total
+        logger.debug("Queried doctors: total=%s returned=%d", page_info.total, len(doctors))
+        return doctors, page_info
 
     async def create(self, data: DoctorCreate, created_by: Optional[str] = None) -> Doctor:
         """Create a new doctor. Auto-creates a third_party record if third_party_id not provided."""
@@ -143,6 +136,7 @@ class DoctorService:
         await self.db.refresh(doctor)
         doctor.third_party = tp
 
+        mark_statistics_stale(self.db, SUMMARY)
         logger.info("Created doctor id=%d name='%s' third_party_id=%d", doctor.id, tp.name, third_party_id)
         return doctor
 
@@ -159,6 +153,7 @@ class DoctorService:
         doctor.updated_by = updated_by
 
         await self.db.flush()
+        mark_statistics_stale(self.db, SUMMARY)
         logger.info("Updated doctor id=%d fields=%s", doctor_id, list(update_data.keys()))
         return await self.get_by_id(doctor_id)
 
@@ -170,5 +165,6 @@ class DoctorService:
         doctor.is_deleted = True
         doctor.updated_by = deleted_by
         await self.db.flush()
+        mark_statistics_stale(self.db, SUMMARY)
         logger.info("Soft-deleted doctor id=%d", doctor_id)
         return True
@@ -2,7 +2,7 @@ import logging
 from typing import Optional, List, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from sqlalchemy import select
 
 from app.model.equipment import Equipment
 from app.model.equipment_category import EquipmentCategory
@@ -10,6 +10,9 @@ from app.model.inventory import Inventory
 from app.model.item import Item, ItemType
 from app.schema.equipment import EquipmentCreate, EquipmentUpdate, EquipmentDetailResponse
 from app.service.inventory import InventoryService
+from app.schema.base import CountMode
+from app.utility.pagination import paginate, PageInfo
+from app.utility.search import search_filter, search_rank, RELEVANCE
 
 logger = logging.getLogger("medbase.service.equipment")
 
@@ -79,7 +82,9 @@ class EquipmentService:
         search: Optional[str] = None,
         sort: str = "id",
         order: str = "asc",
-    ) -> Tuple[List[EquipmentDetailResponse], int]:
+        cursor: Optional[str] = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[EquipmentDetailResponse], PageInfo]:
         """Get all equipment with pagination, filtering, sorting, and details."""
         base_query = select(Equipment).where(Equipment.is_deleted == False)
 
@@ -89,19 +94,9 @@ class EquipmentService:
             base_query = base_query.where(Equipment.is_active == is_active)
         if condition:
             base_query = base_query.where(Equipment.condition == condition)
+        search_columns = (Equipment.code, Equipment.name, Equipment.description)
         if search:
-            search_term = f"%{search}%"
-            base_query = base_query.where(
-                or_(
-                    Equipment.code.ilike(search_term),
-                    Equipment.name.ilike(search_term),
-                    Equipment.description.ilike(search_term),
-                )
-            )
-
-        count_query = select(func.count()).select_from(base_query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
+            base_query = base_query.where(search_filter(search, *search_columns))
 
         query = (
             select(Equipment, Inventory.quantity, EquipmentCategory)
@@ -125,31 +120,22 @@ class EquipmentService:
         if condition:
             query = query.where(Equipment.condition == condition)
         if search:
-            search_term = f"%{search}%"
-            query = query.where(
-                or_(
-                    Equipment.code.ilike(search_term),
-                    Equipment.name.ilike(search_term),
-                    Equipment.description.ilike(search_term),
-                )
-            )
+            query = query.where(search_filter(search, *search_columns))
 
         sort_column = getattr(Equipment, sort, Equipment.id)
-        if order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        offset = (page - 1) * size
-        query = query.offset(offset).limit(size)
-
-        result = await self.db.execute(query)
-        rows = result.all()
+        if sort == RELEVANCE and search:
+            # Best matches first, regardless of the requested order
+            sort_column, order = search_rank(search, *search_columns), "desc"
+        rows, page_info = await paginate(
+            self.db, query, sort_column, Equipment.id,
+            page=page, size=size, order=order, cursor=cursor, count=count,
+            count_query=base_query,
+        )
         items = [EquipmentDetailResponse.from_row(row) for row in rows]
 
-        logger.debug("Queried equipment: total=%d returned=%d", total, len(items))
+        logger.debug("Queried equipment: total=%s returned=%d", page_info.total, len(items))
 
-        return items, total
+        return items, page_info
 
     async def create(
         self, data: EquipmentCreate, created_by: Optional[str] = None
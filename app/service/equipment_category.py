@@ -6,6 +6,8 @@ from sqlalchemy import select, func, or_
 from app.model.equipment_category import EquipmentCategory
 from app.model.equipment import Equipment
 from app.schema.equipment_category import EquipmentCategoryCreate, EquipmentCategoryUpdate
+from app.schema.base import CountMode
+from app.utility.pagination import paginate, PageInfo
 
 logger = logging.getLogger("medbase.service.equipment_category")
 
@@ -43,7 +45,9 @@ class EquipmentCategoryService:
         search: Optional[str] = None,
         sort: str = "id",
         order: str = "asc",
-    ) -> Tuple[List[EquipmentCategory], int]:
+        cursor: Optional[str] = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[EquipmentCategory], PageInfo]:
         """Get all equipment categories with pagination, search, and sorting."""
         query = select(EquipmentCategory).where(EquipmentCategory.is_deleted == False)
 
@@ -57,28 +61,16 @@ class EquipmentCategoryService:
                 )
             )
 
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
-
-        # Apply sorting
         sort_column = getattr(EquipmentCategory, sort, EquipmentCategory.id)
-        if order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        # Apply pagination
-        offset = (page - 1) * size
-        query = query.offset(offset).limit(size)
-
-        result = await self.db.execute(query)
-        categories = result.scalars().all()
+        rows, page_info = await paginate(
+            self.db, query, sort_column, EquipmentCategory.id,
+            page=page, size=size, order=order, cursor=cursor, count=count,
+        )
+        categories = [row[0] for row in rows]
 
-        logger.debug("Queried equipment categories: total=%d returned=%d", total, len(categories))
+        logger.debug("Queried equipment categories: total=%s returned=%d", page_info.total, len(categories))
 
-        return list(categories), total
+        return categories, page_info
 
     async def create(
         self, data: EquipmentCategoryCreate, created_by: Optional[str] = None
@@ -2,10 +2,13 @@ import logging
 from typing import Optional, List, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 
 from app.model.inventory import Inventory
 from app.model.item import Item
+from app.service.statistics import mark_statistics_stale, INVENTORY, SUMMARY
+from app.schema.base import CountMode
+from app.utility.pagination import paginate, PageInfo
 
 logger = logging.getLogger("medbase.service.inventory")
 
@@ -80,7 +83,9 @@ class InventoryService:
         item_type: Optional[str] = None,
         sort: str = "id",
         order: str = "asc",
-    ) -> Tuple[List[dict], int]:
+        cursor: Optional[str] = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[dict], PageInfo]:
         """Get all inventory records with pagination and filtering."""
         query = (
             select(Inventory, Item.item_type, Item.name.label("item_name"))
@@ -92,30 +97,17 @@ class InventoryService:
         if item_type:
             query = query.where(Item.item_type == item_type)
 
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
-
-        # Apply sorting
         sort_column = getattr(Inventory, sort, Inventory.id)
-        if order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        # Apply pagination
-        offset = (page - 1) * size
-        query = query.offset(offset).limit(size)
-
-        result = await self.db.execute(query)
-        rows = result.all()
+        rows, page_info = await paginate(
+            self.db, query, sort_column, Inventory.id,
+            page=page, size=size, order=order, cursor=cursor, count=count,
+        )
 
         records = [self._row_to_dict(row) for row in rows]
 
-        logger.debug("Queried inventory: total=%d returned=%d", total, len(records))
+        logger.debug("Queried inventory: total=%s returned=%d", page_info.total, len(records))
 
-        return records, total
+        return records, page_info
 
     async def create(
         self,
@@ -133,6 +125,7 @@ class InventoryService:
         self.db.add(inventory)
         await self.db.flush()
         await self.db.refresh(inventory)
+        mark_statistics_stale(self.db, SUMMARY, INVENTORY)
         logger.info(
             "Created inventory id=%d item_id=%d quantity=%d",
             inventory.id, item_id, quantity,
@@ -148,5 +141,6 @@ class InventoryService:
         inventory.is_deleted = True
         inventory.updated_by = deleted_by
         await self.db.flush()
+        mark_statistics_stale(self.db, SUMMARY, INVENTORY)
         logger.info("Soft-deleted inventory id=%d item_id=%d", inventory.id, item_id)
         return True
@@ -1,8 +1,9 @@
 import logging
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, insert, update, values, column, bindparam, any_, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
 
 from app.model.inventory_transaction import InventoryTransaction
 from app.model.inventory_transaction_item import InventoryTransactionItem
@@ -21,6 +22,9 @@ from app.schema.inventory_transaction import (
     TransactionItemUpdate,
     TransactionItemResponse,
 )
+from app.service.statistics import mark_statistics_stale, INVENTORY, SUMMARY, TRANSACTIONS
+from app.schema.base import CountMode
+from app.utility.pagination import paginate, PageInfo
 
 logger = logging.getLogger("medbase.service.inventory_transaction")
 
@@ -69,6 +73,61 @@ class InventoryTransactionService:
             quantity, inventory.quantity,
         )
 
+    async def _adjust_inventory_batch(
+        self,
+        quantities: Dict[int, int],
+        transaction_type: str,
+        updated_by: Optional[str] = None,
+    ) -> None:
+        """Apply quantity changes for many items in one UPDATE ... FROM (VALUES ...).
+
+        Rows that would go negative are left untouched by the statement itself;
+        any item missing from RETURNING is then reported with the same errors
+        as _adjust_inventory.
+        """
+        sign = 1 if transaction_type in INCREASE_TYPES else -1
+        deltas = values(
+            column("item_id", Integer),
+            column("delta", Integer),
+            name="deltas",
+        ).data([(item_id, sign * qty) for item_id, qty in quantities.items()])
+
+        result = await self.db.execute(
+            update(Inventory)
+            .where(
+                Inventory.item_id == deltas.c.item_id,
+                Inventory.is_deleted == False,
+                Inventory.quantity + deltas.c.delta >= 0,
+            )
+            .values(quantity=Inventory.quantity + deltas.c.delta, updated_by=updated_by)
+            .returning(Inventory.item_id, Inventory.quantity)
+            .execution_options(synchronize_session="fetch")
+        )
+        adjusted = dict(result.all())
+
+        failed = [item_id for item_id in quantities if item_id not in adjusted]
+        if failed:
+            result = await self.db.execute(
+                select(Inventory.item_id, Inventory.quantity).where(
+                    Inventory.item_id.in_(failed),
+                    Inventory.is_deleted == False,
+                )
+            )
+            available = dict(result.all())
+            for item_id in failed:
+                if item_id not in available:
+                    raise ValueError(f"Inventory record not found for item_id={item_id}")
+            item_id = failed[0]
+            raise ValueError(
+                f"Insufficient inventory for item_id={item_id}: "
+                f"available={available[item_id]}, requested={quantities[item_id]}"
+            )
+
+        logger.info(
+            "Adjusted inventory for %d items by %s (type=%s)",
+            len(adjusted), "+" if sign > 0 else "-", transaction_type,
+        )
+
     async def _reverse_inventory(self, item_id: int, quantity: int, transaction_type: str, updated_by: Optional[str] = None) -> None:
         """Reverse an inventory adjustment (for delete/update)."""
         result = await self.db.execute(
@@ -138,6 +197,37 @@ class InventoryTransactionService:
         if item_type == "equipment":
             raise ValueError("Equipment cannot be prescribed")
 
+    async def validate_items(self, item_ids: List[int], transaction_type: str) -> List[dict]:
+        """Validate every requested item with a single query.
+
+        Checks the same rules as validate_inventory_item and (for prescriptions)
+        validate_prescription_item, but returns all problems at once as a list of
+        {"item_id", "detail"} dicts instead of raising on the first one.
+        """
+        result = await self.db.execute(
+            select(Inventory.item_id, Item.item_type)
+            .outerjoin(Item, Inventory.item_id == Item.id)
+            .where(
+                Inventory.item_id == any_(bindparam("item_ids", item_ids, type_=ARRAY(Integer))),
+                Inventory.is_deleted == False,
+            )
+        )
+        item_types = dict(result.all())
+
+        errors = []
+        for item_id in dict.fromkeys(item_ids):
+            if item_id not in item_types:
+                errors.append({
+                    "item_id": item_id,
+                    "detail": f"Inventory record not found for item_id={item_id}",
+                })
+            elif transaction_type == "prescription" and item_types[item_id] == "equipment":
+                errors.append({
+                    "item_id": item_id,
+                    "detail": "Equipment cannot be prescribed",
+                })
+        return errors
+
     async def build_item_response(self, item: InventoryTransactionItem) -> TransactionItemResponse:
         """Build a TransactionItemResponse from a model instance."""
         item_name, item_type = await self._get_item_info(item.item_id)
@@ -251,7 +341,9 @@ class InventoryTransactionService:
         transaction_date: Optional[str] = None,
         sort: str = "id",
         order: str = "asc",
-    ) -> Tuple[List[dict], int]:
+        cursor: Optional[str] = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[dict], PageInfo]:
         """Get all transactions with pagination and filtering."""
         query = (
             select(
@@ -271,29 +363,19 @@ class InventoryTransactionService:
         if transaction_date is not None:
             query = query.where(InventoryTransaction.transaction_date == transaction_date)
 
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
-
         sort_column = getattr(InventoryTransaction, sort, InventoryTransaction.id)
-        if order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        offset = (page - 1) * size
-        query = query.offset(offset).limit(size)
-
-        result = await self.db.execute(query)
-        rows = result.all()
+        rows, page_info = await paginate(
+            self.db, query, sort_column, InventoryTransaction.id,
+            page=page, size=size, order=order, cursor=cursor, count=count,
+        )
 
         transactions = [
             InventoryTransactionListResponse.from_row(row).model_dump()
             for row in rows
         ]
 
-        logger.debug("Queried inventory transactions: total=%d returned=%d", total, len(transactions))
-        return transactions, total
+        logger.debug("Queried inventory transactions: total=%s returned=%d", page_info.total, len(transactions))
+        return transactions, page_info
 
     async def get_transactions_by_item(
         self,
@@ -303,7 +385,9 @@ class InventoryTransactionService:
         transaction_type: Optional[str] = None,
         sort: str = "id",
         order: str = "asc",
-    ) -> Tuple[List[TransactionByItemResponse], int]:
+        cursor: Optional[str] = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[TransactionByItemResponse], PageInfo]:
         """Get inventory transactions that include a specific item, with the transaction item details."""
         query = (
             select(
@@ -327,26 +411,16 @@ class InventoryTransactionService:
         if transaction_type is not None:
             query = query.where(InventoryTransaction.transaction_type == transaction_type)
 
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
-
         sort_column = getattr(InventoryTransaction, sort, InventoryTransaction.id)
-        if order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        offset = (page - 1) * size
-        query = query.offset(offset).limit(size)
-
-        result = await self.db.execute(query)
-        rows = result.all()
+        rows, page_info = await paginate(
+            self.db, query, sort_column, InventoryTransaction.id,
+            page=page, size=size, order=order, cursor=cursor, count=count,
+        )
 
         transactions = [TransactionByItemResponse.from_row(row) for row in rows]
 
-        logger.debug("Queried transactions for item_id=%d: total=%d returned=%d", item_id, total, len(transactions))
-        return transactions, total
+        logger.debug("Queried transactions for item_id=%d: total=%s returned=%d", item_id, page_info.total, len(transactions))
+        return transactions, page_info
 
     async def create(
         self,
@@ -368,6 +442,7 @@ class InventoryTransactionService:
         await self.db.flush()
         await self.db.refresh(transaction)
 
+        mark_statistics_stale(self.db, SUMMARY, INVENTORY, TRANSACTIONS)
         logger.info(
             "Created inventory transaction id=%d type=%s third_party_id=%d",
             transaction.id, data.transaction_type, third_party_id,
@@ -375,13 +450,12 @@ class InventoryTransactionService:
 
         # Create items if provided
         if data.items:
-            for item_data in data.items:
-                await self.create_item(
-                    transaction.id,
-                    item_data,
-                    data.transaction_type,
-                    created_by=created_by,
-                )
+            await self.create_items(
+                transaction.id,
+                data.items,
+                data.transaction_type,
+                created_by=created_by,
+            )
 
         return transaction
 
@@ -404,6 +478,7 @@ class InventoryTransactionService:
         await self.db.flush()
         await self.db.refresh(transaction)
 
+        mark_statistics_stale(self.db, TRANSACTIONS)
         logger.info("Updated inventory transaction id=%d fields=%s", transaction_id, list(update_data.keys()))
         return transaction
 
@@ -434,6 +509,7 @@ class InventoryTransactionService:
         transaction.updated_by = deleted_by
         await self.db.flush()
 
+        mark_statistics_stale(self.db, SUMMARY, INVENTORY, TRANSACTIONS)
         logger.info("Soft-deleted inventory transaction id=%d (reversed %d items)", transaction_id, len(items))
         return True
 
@@ -504,12 +580,46 @@ class InventoryTransactionService:
             transaction_type, updated_by=created_by,
         )
 
+        mark_statistics_stale(self.db, INVENTORY, TRANSACTIONS)
         logger.info(
             "Created transaction item id=%d transaction_id=%d item_id=%d qty=%d",
             item.id, transaction_id, data.item_id, data.quantity,
         )
         return item
 
+    async def create_items(
+        self,
+        transaction_id: int,
+        items: List[TransactionItemCreate],
+        transaction_type: str,
+        created_by: Optional[str] = None,
+    ) -> None:
+        """Create many transaction items and adjust inventory with one statement each."""
+        await self.db.execute(
+            insert(InventoryTransactionItem).values([
+                {
+                    "transaction_id": transaction_id,
+                    "item_id": item_data.item_id,
+                    "quantity": item_data.quantity,
+                    "created_by": created_by,
+                    "updated_by": created_by,
+                }
+                for item_data in items
+            ])
+        )
+
+        # Lines for the same item are applied (and stock-checked) as one total
+        quantities: Dict[int, int] = {}
+        for item_data in items:
+            quantities[item_data.item_id] = quantities.get(item_data.item_id, 0) + item_data.quantity
+
+        await self._adjust_inventory_batch(quantities, transaction_type, updated_by=created_by)
+
+        logger.info(
+            "Created %d transaction items transaction_id=%d",
+            len(items), transaction_id,
+        )
+
     async def update_item(
         self,
         item_id: int,
@@ -546,6 +656,7 @@ class InventoryTransactionService:
             transaction.transaction_type, updated_by=updated_by,
         )
 
+        mark_statistics_stale(self.db, INVENTORY, TRANSACTIONS)
         logger.info("Updated transaction item id=%d fields=%s", item_id, list(update_data.keys()))
         return item
 
@@ -569,5 +680,6 @@ class InventoryTransactionService:
         item.updated_by = deleted_by
         await self.db.flush()
 
+        mark_statistics_stale(self.db, INVENTORY, TRANSACTIONS)
         logger.info("Soft-deleted transaction item id=%d", item_id)
         return True
@@ -2,7 +2,7 @@ import logging
 from typing import Optional, List, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from sqlalchemy import select
 
 from app.model.medical_device import MedicalDevice
 from app.model.medical_device_category import MedicalDeviceCategory
@@ -10,6 +10,9 @@ from app.model.inventory import Inventory
 from app.model.item import Item, ItemType
 from app.schema.medical_device import MedicalDeviceCreate, MedicalDeviceUpdate, MedicalDeviceDetailResponse
 from app.service.inventory import InventoryService
+from app.schema.base import CountMode
+from app.utility.pagination import paginate, PageInfo
+from app.utility.search import search_filter, search_rank, RELEVANCE
 
 logger = logging.getLogger("medbase.service.medical_device")
 
@@ -78,7 +81,9 @@ class MedicalDeviceService:
         search: Optional[str] = None,
         sort: str = "id",
         order: str = "asc",
-    ) -> Tuple[List[MedicalDeviceDetailResponse], int]:
+        cursor: Optional[str] = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[MedicalDeviceDetailResponse], PageInfo]:
         """Get all medical devices with pagination, filtering, sorting, and details."""
         base_query = select(MedicalDevice).where(MedicalDevice.is_deleted == False)
 
@@ -86,19 +91,9 @@ class MedicalDeviceService:
             base_query = base_query.where(MedicalDevice.category_id == category_id)
         if is_active is not None:
             base_query = base_query.where(MedicalDevice.is_active == is_active)
+        search_columns = (MedicalDevice.code, MedicalDevice.name, MedicalDevice.description)
         if search:
-            search_term = f"%{search}%"
-            base_query = base_query.where(
-                or_(
-                    MedicalDevice.code.ilike(search_term),
-                    MedicalDevice.name.ilike(search_term),
-                    MedicalDevice.description.ilike(search_term),
-                )
-            )
-
-        count_query = select(func.count()).select_from(base_query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
+            base_query = base_query.where(search_filter(search, *search_columns))
 
         query = (
             select(MedicalDevice, Inventory.quantity, MedicalDeviceCategory)
@@ -120,31 +115,22 @@ class MedicalDeviceService:
         if is_active is not None:
             query = query.where(MedicalDevice.is_active == is_active)
         if search:
-            search_term = f"%{search}%"
-            query = query.where(
-                or_(
-                    MedicalDevice.code.ilike(search_term),
-                    MedicalDevice.name.ilike(search_term),
-                    MedicalDevice.description.ilike(search_term),
-                )
-            )
+            query = query.where(search_filter(search, *search_columns))
 
         sort_column = getattr(MedicalDevice, sort, MedicalDevice.id)
-        if order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        offset = (page - 1) * size
-        query = query.offset(offset).limit(size)
-
-        result = await self.db.execute(query)
-        rows = result.all()
+        if sort == RELEVANCE and search:
+            # Best matches first, regardless of the requested order
+            sort_column, order = search_rank(search, *search_columns), "desc"
+        rows, page_info = await paginate(
+            self.db, query, sort_column, MedicalDevice.id,
+            page=page, size=size, order=order, cursor=cursor, count=count,
+            count_query=base_query,
+        )
         devices = [MedicalDeviceDetailResponse.from_row(row) for row in rows]
 
-        logger.debug("Queried medical devices: total=%d returned=%d", total, len(devices))
+        logger.debug("Queried medical devices: total=%s returned=%d", page_info.total, len(devices))
 
-        return devices, total
+        return devices, page_info
 
     async def create(
         self, data: MedicalDeviceCreate, created_by: Optional[str] = None
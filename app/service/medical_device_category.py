@@ -6,6 +6,8 @@ from sqlalchemy import select, func, or_
 from app.model.medical_device_category import MedicalDeviceCategory
 from app.model.medical_device import MedicalDevice
 from app.schema.medical_device_category import MedicalDeviceCategoryCreate, MedicalDeviceCategoryUpdate
+from app.schema.base import CountMode
+from app.utility.pagination import paginate, PageInfo
 
 logger = logging.getLogger("medbase.service.medical_device_category")
 
@@ -43,7 +45,9 @@ class MedicalDeviceCategoryService:
         search: Optional[str] = None,
         sort: str = "id",
         order: str = "asc",
-    ) -> Tuple[List[MedicalDeviceCategory], int]:
+        cursor: Optional[str] = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[MedicalDeviceCategory], PageInfo]:
         """Get all medical device categories with pagination, search, and sorting."""
         query = select(MedicalDeviceCategory).where(MedicalDeviceCategory.is_deleted == False)
 
@@ -57,28 +61,16 @@ class MedicalDeviceCategoryService:
                 )
             )
 
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
-
-        # Apply sorting
         sort_column = getattr(MedicalDeviceCategory, sort, MedicalDeviceCategory.id)
-        if order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        # Apply pagination
-        offset = (page - 1) * size
-        query = query.offset(offset).limit(size)
-
-        result = await self.db.execute(query)
-        categories = result.scalars().all()
+        rows, page_info = await paginate(
+            self.db, query, sort_column, MedicalDeviceCategory.id,
+            page=page, size=size, order=order, cursor=cursor, count=count,
+        )
+        categories = [row[0] for row in rows]
 
-        logger.debug("Queried medical device categories: total=%d returned=%d", total, len(categories))
+        logger.debug("Queried medical device categories: total=%s returned=%d", page_info.total, len(categories))
 
-        return list(categories), total
+        return categories, page_info
 
     async def create(
         self, data: MedicalDeviceCategoryCreate, created_by: Optional[str] = None
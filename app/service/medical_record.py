@@ -1,13 +1,15 @@
 import logging
 from typing import Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 
 from app.model.medical_record import MedicalRecord
 from app.model.appointment import Appointment
 from app.model.patient import Patient
 from app.model.third_party import ThirdParty
 from app.schema.medical_record import MedicalRecordCreate, MedicalRecordUpdate, MedicalRecordResponse
+from app.schema.base import CountMode
+from app.utility.pagination import paginate, PageInfo
 
 logger = logging.getLogger("medbase.service.medical_record")
 
@@ -67,7 +69,9 @@ class MedicalRecordService:
         appointment_id: Optional[int] = None,
         sort: str = "id",
         order: str = "asc",
-    ) -> Tuple[List[dict], int]:
+        cursor: Optional[str] = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[dict], PageInfo]:
         """Get all medical records with pagination and filtering."""
         query = (
             select(
@@ -85,29 +89,19 @@ class MedicalRecordService:
         if appointment_id is not None:
             query = query.where(MedicalRecord.appointment_id == appointment_id)
 
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
-
         sort_column = getattr(MedicalRecord, sort, MedicalRecord.id)
-        if order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        offset = (page - 1) * size
-        query = query.offset(offset).limit(size)
-
-        result = await self.db.execute(query)
-        rows = result.all()
+        rows, page_info = await paginate(
+            self.db, query, sort_column, MedicalRecord.id,
+            page=page, size=size, order=order, cursor=cursor, count=count,
+        )
 
         records = [
             MedicalRecordResponse.from_row(row).model_dump()
             for row in rows
         ]
 
-        logger.debug("Queried medical records: total=%d returned=%d", total, len(records))
-        return records, total
+        logger.debug("Queried medical records: total=%s returned=%d", page_info.total, len(records))
+        return records, page_info
 
     async def create(self, appointment_id: int, data: MedicalRecordCreate, created_by: Optional[str] = None) -> MedicalRecord:
         """Create a medical record for an appointment."""
@@ -2,7 +2,7 @@ import logging
 from typing import Optional, List, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from sqlalchemy import select
 
 from app.model.medicine import Medicine
 from app.model.medicine_category import MedicineCategory
@@ -10,6 +10,9 @@ from app.model.inventory import Inventory
 from app.model.item import Item, ItemType
 from app.schema.medicine import MedicineCreate, MedicineUpdate, MedicineDetailResponse
 from app.service.inventory import InventoryService
+from app.schema.base import CountMode
+from app.utility.pagination import paginate, PageInfo
+from app.utility.search import search_filter, search_rank, RELEVANCE
 
 logger = logging.getLogger("medbase.service.medicine")
 
@@ -78,7 +81,9 @@ class MedicineService:
         search: Optional[str] = None,
         sort: str = "id",
         order: str = "asc",
-    ) -> Tuple[List[MedicineDetailResponse], int]:
+        cursor: Optional[str] = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[MedicineDetailResponse], PageInfo]:
         """Get all medicines with pagination, filtering, sorting, and details."""
         # Base filter query for counting
         base_query = select(Medicine).where(Medicine.is_deleted == False)
@@ -88,20 +93,9 @@ class MedicineService:
             base_query = base_query.where(Medicine.category_id == category_id)
         if is_active is not None:
             base_query = base_query.where(Medicine.is_active == is_active)
+        search_columns = (Medicine.code, Medicine.name, Medicine.description)
         if search:
-            search_term = f"%{search}%"
-            base_query = base_query.where(
-                or_(
-                    Medicine.code.ilike(search_term),
-                    Medicine.name.ilike(search_term),
-                    Medicine.description.ilike(search_term),
-                )
-            )
-
-        # Get total count
-        count_query = select(func.count()).select_from(base_query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
+            base_query = base_query.where(search_filter(search, *search_columns))
 
         # Build detail query with joins
         query = (
@@ -125,33 +119,22 @@ class MedicineService:
         if is_active is not None:
             query = query.where(Medicine.is_active == is_active)
         if search:
-            search_term = f"%{search}%"
-            query = query.where(
-                or_(
-                    Medicine.code.ilike(search_term),
-                    Medicine.name.ilike(search_term),
-                    Medicine.description.ilike(search_term),
-                )
-            )
+            query = query.where(search_filter(search, *search_columns))
 
-        # Apply sorting
         sort_column = getattr(Medicine, sort, Medicine.id)
-        if order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        # Apply pagination
-        offset = (page - 1) * size
-        query = query.offset(offset).limit(size)
-
-        result = await self.db.execute(query)
-        rows = result.all()
+        if sort == RELEVANCE and search:
+            # Best matches first, regardless of the requested order
+            sort_column, order = search_rank(search, *search_columns), "desc"
+        rows, page_info = await paginate(
+            self.db, query, sort_column, Medicine.id,
+            page=page, size=size, order=order, cursor=cursor, count=count,
+            count_query=base_query,
+        )
         medicines = [MedicineDetailResponse.from_row(row) for row in rows]
 
-        logger.debug("Queried medicines: total=%d returned=%d", total, len(medicines))
+        logger.debug("Queried medicines: total=%s returned=%d", page_info.total, len(medicines))
 
-        return medicines, total
+        return medicines, page_info
 
     async def create(
         self, data: MedicineCreate, created_by: Optional[str] = None
@@ -1,13 +1,17 @@
 import logging
 from typing import Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from sqlalchemy import select
 from sqlalchemy.orm import contains_eager
 
 from app.model.partner import Partner
 from app.model.third_party import ThirdParty
 from app.schema.partner import PartnerCreate, PartnerUpdate
 from app.service.third_party import ThirdPartyService
+from app.service.statistics import mark_statistics_stale, SUMMARY
+from app.schema.base import CountMode
+from app.utility.pagination import paginate, PageInfo
+from app.utility.search import search_filter, search_rank, RELEVANCE
 
 logger = logging.getLogger("medbase.service.partner")
 
@@ -47,7 +51,9 @@ class PartnerService:
         search: Optional[str] = None,
         sort: str = "id",
         order: str = "asc",
-    ) -> Tuple[List[Partner], int]:
+        cursor: Optional[str] = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[Partner], PageInfo]:
         """Get all partners with pagination, filtering, and sorting."""
         query = (
             select(Partner)
@@ -62,36 +68,23 @@ class PartnerService:
             query = query.where(Partner.organization_type == organization_type)
         if is_active is not None:
             query = query.where(Partner.is_active == is_active)
+        search_columns = (ThirdParty.name, Partner.contact_person, ThirdParty.email, ThirdParty.phone)
         if search:
-            search_term = f"%{search}%"
-            query = query.where(
-                or_(
-                    ThirdParty.name.ilike(search_term),
-                    Partner.contact_person.ilike(search_term),
-                    ThirdParty.email.ilike(search_term),
-                    ThirdParty.phone.ilike(search_term),
-                )
-            )
-
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
+            query = query.where(search_filter(search, *search_columns))
 
         tp_sort_map = {"name": ThirdParty.name, "phone": ThirdParty.phone, "email": ThirdParty.email}
         sort_column = tp_sort_map.get(sort, getattr(Partner, sort, Partner.id))
-        if order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        offset = (page - 1) * size
-        query = query.offset(offset).limit(size)
-
-        result = await self.db.execute(query)
-        partners = result.unique().scalars().all()
+        if sort == RELEVANCE and search:
+            # Best matches first, regardless of the requested order
+            sort_column, order = search_rank(search, *search_columns), "desc"
+        rows, page_info = await paginate(
+            self.db, query, sort_column, Partner.id,
+            page=page, size=size, order=order, cursor=cursor, count=count,
+        )
+        partners = [row[0] for row in rows]
 
-        logger.debug("Queried partners: total=%d returned=%d", total, len(partners))
-        return list(partners), total
+        logger.debug("Queried partners: total=%s returned=%d", page_info.total, len(partners))
+        return partners, page_info
 
     async def create(
         self, data: PartnerCreate, created_by: Optional[str] = None
@@ -129,6 +122,7 @@ class PartnerService:
         await self.db.refresh(partner)
         partner.third_party = tp
 
+        mark_statistics_stale(self.db, SUMMARY)
         logger.info("Created partner id=%d name='%s' third_party_id=%d", partner.id, tp.name, third_party_id)
         return partner
 
@@ -150,6 +144,7 @@ class PartnerService:
         partner.updated_by = updated_by
 
         await self.db.flush()
+        mark_statistics_stale(self.db, SUMMARY)
         logger.info("Updated partner id=%d fields=%s", partner_id, list(update_data.keys()))
         return await self.get_by_id(partner_id)
 
@@ -162,5 +157,6 @@ class PartnerService:
         partner.is_deleted = True
         partner.updated_by = deleted_by
         await self.db.flush()
+        mark_statistics_stale(self.db, SUMMARY)
         logger.info("Soft-deleted partner id=%d", partner_id)
         return True
@@ -1,7 +1,7 @@
 import logging
 from typing import Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from sqlalchemy import select
 from sqlalchemy.orm import contains_eager
 
 from app.model.patient import Patient
@@ -10,7 +10,11 @@ from app.model.third_party import ThirdParty
 from app.schema.patient import PatientCreate, PatientUpdate
 from app.schema.patient_document import PatientDocumentResponse
 from app.service.third_party import ThirdPartyService
-from app.utility import storage
+from app.service.patient_document import documents_to_responses
+from app.service.statistics import mark_statistics_stale, SUMMARY
+from app.schema.base import CountMode
+from app.utility.pagination import paginate, PageInfo
+from app.utility.search import search_filter, search_rank, RELEVANCE
 
 logger = logging.getLogger("medbase.service.patient")
 
@@ -64,7 +68,7 @@ class PatientService:
         )
         docs = result.scalars().all()
 
-        documents = [PatientDocumentResponse.from_model(doc, await storage.generate_presigned_url(doc.file_path, download_filename=doc.document_name)) for doc in docs]
+        documents = await documents_to_responses(docs)
         return patient, documents
 
     async def get_all(
@@ -76,7 +80,9 @@ class PatientService:
         search: Optional[str] = None,
         sort: str = "id",
         order: str = "asc",
-    ) -> Tuple[List[Patient], int]:
+        cursor: Optional[str] = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[Patient], PageInfo]:
         """Get all patients with pagination, filtering, and sorting."""
         query = (
             select(Patient)
@@ -89,35 +95,23 @@ class PatientService:
             query = query.where(Patient.is_active == is_active)
         if gender is not None:
             query = query.where(Patient.gender == gender)
+        search_columns = (ThirdParty.name, ThirdParty.phone, ThirdParty.email)
         if search:
-            search_term = f"%{search}%"
-            query = query.where(
-                or_(
-                    ThirdParty.name.ilike(search_term),
-                    ThirdParty.phone.ilike(search_term),
-                    ThirdParty.email.ilike(search_term),
-                )
-            )
-
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
+            query = query.where(search_filter(search, *search_columns))
 
         tp_sort_map = {"name": ThirdParty.name, "phone": ThirdParty.phone, "email": ThirdParty.email}
         sort_column = tp_sort_map.get(sort, getattr(Patient, sort, Patient.id))
-        if order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        offset = (page - 1) * size
-        query = query.offset(offset).limit(size)
-
-        result = await self.db.execute(query)
-        patients = list(result.unique().scalars().all())
+        if sort == RELEVANCE and search:
+            # Best matches first, regardless of the requested order
+            sort_column, order = search_rank(search, *search_columns), "desc"
+        rows, page_info = await paginate(
+            self.db, query, sort_column, Patient.id,
+            page=page, size=size, order=order, cursor=cursor, count=count,
+        )
+        patients = [row[0] for row in rows]
 
-        logger.debug("Queried patients: total=%d returned=%d", total, len(patients))
-        return patients, total
+        logger.debug("Queried patients: total=%s returned=%d", page_info.total, len(patients))
+        return patients, page_info
 
     async def create(self, data: PatientCreate, created_by: Optional[str] = None) -> Patient:
         """Create a new patient. Auto-creates a third_party record if third_party_id not provided."""
@@ -154,6 +148,7 @@ class PatientService:
         await self.db.refresh(patient)
         patient.third_party = tp
 
+        mark_statistics_stale(self.db, SUMMARY)
         logger.info("Created patient id=%d name='%s' third_party_id=%d", patient.id, tp.name, third_party_id)
         return patient
 
@@ -170,6 +165,7 @@ class PatientService:
         patient.updated_by = updated_by
 
         await self.db.flush()
+        mark_statistics_stale(self.db, SUMMARY)
         logger.info("Updated patient id=%d fields=%s", patient_id, list(update_data.keys()))
         return await self.get_by_id(patient_id)
 
@@ -181,5 +177,6 @@ class PatientService:
         patient.is_deleted = True
         patient.updated_by = deleted_by
         await self.db.flush()
+        mark_statistics_stale(self.db, SUMMARY)
         logger.info("Soft-deleted patient id=%d", patient_id)
         return True
@@ -1,27 +1,186 @@
 import logging
 import uuid
-from typing import Optional, List, Tuple
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from datetime import timedelta
+from typing import Dict, Optional, List, Sequence, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import select, update, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from fastapi import UploadFile
 
 from app.model.patient_document import PatientDocument
-from app.schema.patient_document import PatientDocumentResponse
-from app.utility import storage
+from app.model.stored_object import StoredObject
+from app.schema.patient_document import (
+    PatientDocumentResponse,
+    PatientDocumentUploadRequest,
+    PatientDocumentUploadTicket,
+    PatientDocumentUploadComplete,
+)
+from app.utility import storage, thumbnail
+from app.utility.cache import presigned_url_cache
+from app.utility.config import settings
+from app.utility.database import AsyncSessionLocal, after_commit, after_rollback
+from app.utility.security import create_access_token, decode_access_token
+from app.schema.base import CountMode
+from app.utility.pagination import paginate, PageInfo
 
 logger = logging.getLogger("medbase.service.patient_document")
 
+# Upload tokens are JWTs whose non-numeric subject keeps them from passing as access tokens
+_UPLOAD_TOKEN_SUBJECT = "document-upload"
+_UPLOAD_TOKEN_GRACE = timedelta(hours=1)
 
-async def document_to_response(doc: PatientDocument) -> PatientDocumentResponse:
-    """Convert a PatientDocument model to a response with presigned file_url."""
+
+def _download_name(doc: PatientDocument) -> str:
+    """Display name with the file extension from the stored path appended."""
     download_name = doc.document_name
-    # Ensure download filename has the file extension from the stored path
     if doc.file_path and "." in doc.file_path.rsplit("/", 1)[-1]:
         stored_ext = "." + doc.file_path.rsplit(".", 1)[-1]
         if not download_name.lower().endswith(stored_ext.lower()):
             download_name += stored_ext
-    file_url = await storage.generate_presigned_url(doc.file_path, download_filename=download_name)
-    return PatientDocumentResponse.from_model(doc, file_url)
+    return download_name
+
+
+def _extension(filename: Optional[str]) -> str:
+    """``.ext`` of filename (or of a storage key), or "" if it has none."""
+    name = (filename or "").rsplit("/", 1)[-1]
+    return "." + name.rsplit(".", 1)[-1] if "." in name else ""
+
+
+def _new_file_key(filename: Optional[str]) -> str:
+    """Unique staging key ``uploads/{uuid}.{ext}`` for an upload whose content is not yet known."""
+    return f"uploads/{uuid.uuid4().hex}{_extension(filename)}"
+
+
+def _content_key(sha256: str, staging_key: str) -> str:
+    """Key ``objects/{sha256}.{ext}`` that stored content is shared under."""
+    return f"objects/{sha256}{_extension(staging_key)}"
+
+
+def _url_expiry(document_type: Optional[str]) -> int:
+    """Presigned URL lifetime in seconds for a document type."""
+    return settings.PRESIGNED_URL_EXPIRY_BY_TYPE.get(document_type or "", settings.PRESIGNED_URL_EXPIRY_SECONDS)
+
+
+async def _presigned_urls(files: Sequence[Tuple[str, str, Optional[str]]]) -> List[str]:
+    """URLs for (file_path, download_filename, document_type) entries, reusing
+    cached signatures and signing misses in bulk.
+
+    A cached URL is served until PRESIGNED_URL_REUSE_MARGIN_SECONDS before it
+    expires, so clients always receive a URL with at least that long to live.
+    URLs are cached per expiry, so one signed for another document type's
+    lifetime is never handed out.
+    """
+    keys = [
+        (file_path, download_name, _url_expiry(document_type))
+        for file_path, download_name, document_type in files
+    ]
+    urls = [presigned_url_cache.get(key) for key in keys]
+
+    misses: Dict[int, List[int]] = {}
+    for i, ((_path, _name, expires_in), url) in enumerate(zip(keys, urls)):
+        if url is None:
+            misses.setdefault(expires_in, []).append(i)
+
+    for expires_in, indexes in misses.items():
+        signed = await storage.generate_presigned_urls(
+            [keys[i][:2] for i in indexes], expires_in=expires_in,
+        )
+        reuse_for = expires_in - settings.PRESIGNED_URL_REUSE_MARGIN_SECONDS
+        for i, url in zip(indexes, signed):
+            urls[i] = url
+            if reuse_for > 0:
+                presigned_url_cache.set(keys[i], url, ttl=reuse_for)
+    return urls
+
+
+async def document_to_response(doc: PatientDocument) -> PatientDocumentResponse:
+    """Convert a PatientDocument model to a response with presigned file_url."""
+    response, = await documents_to_responses([doc])
+    return response
+
+
+async def documents_to_responses(docs: Sequence[PatientDocument]) -> List[PatientDocumentResponse]:
+    """Convert many documents, presigning all their file and thumbnail URLs in one batch."""
+    files = [(doc.file_path, _download_name(doc), doc.document_type) for doc in docs]
+    files += [(doc.thumbnail_path, "", doc.document_type) for doc in docs if doc.thumbnail_path]
+    urls = iter(await _presigned_urls(files))
+
+    file_urls = [next(urls) for _doc in docs]
+    return [
+        PatientDocumentResponse.from_model(doc, file_url, next(urls) if doc.thumbnail_path else None)
+        for doc, file_url in zip(docs, file_urls)
+    ]
+
+
+async def generate_thumbnail(session_factory: async_sessionmaker, file_path: str) -> Optional[str]:
+    """Render and store the preview for file_path, then record it on every
+    document using that file. Runs as a background task after upload.
+
+    An existing preview (e.g. for deduplicated content) is reused as is.
+    Returns the thumbnail key, or None if no preview could be made.
+    """
+    key = thumbnail.thumbnail_key(file_path)
+    try:
+        if await storage.stat_file(key) is None:
+            preview = await thumbnail.render(file_path)
+            if preview is None:
+                logger.info("No thumbnail for missing, oversized or unsupported file_path='%s'", file_path)
+                return None
+            await storage.upload_file(key, preview, "image/jpeg")
+    except Exception as e:
+        logger.warning("Thumbnail generation failed file_path='%s': %s", file_path, str(e))
+        return None
+
+    async with session_factory() as db:
+        await db.execute(
+            update(PatientDocument)
+            .where(PatientDocument.file_path == file_path)
+            # A derived rendition is not an edit, so keep updated_at as it was
+            .values(thumbnail_path=key, updated_at=PatientDocument.updated_at)
+        )
+        await db.commit()
+
+    logger.info("Stored thumbnail key='%s'", key)
+    return key
+
+
+async def _delete_quietly(key: str) -> None:
+    try:
+        await storage.delete_file(key)
+    except Exception as e:
+        logger.warning("Failed to delete file from storage key='%s': %s", key, str(e))
+
+
+async def _settle_object(staging_key: str, file_key: str) -> None:
+    """Put a committed upload's content at file_key, then drop its staging object.
+
+    Runs after commit. If file_key already holds the content (a duplicate
+    upload) the staging object is simply removed.
+    """
+    try:
+        if await storage.stat_file(file_key) is None:
+            await storage.move_file(staging_key, file_key)
+            return
+    except Exception as e:
+        logger.error("Failed to store upload key='%s' at key='%s': %s", staging_key, file_key, str(e))
+        return
+    await _delete_quietly(staging_key)
+
+
+async def _delete_unreferenced(keys: Sequence[str]) -> None:
+    """Delete a released object and its thumbnail. Runs after commit.
+
+    Skipped if an upload of the same content has registered the object again
+    since the release committed.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(StoredObject.content_sha256).where(StoredObject.file_path == keys[0]))
+        if result.first():
+            logger.info("Kept re-registered stored object key='%s'", keys[0])
+            return
+    for key in keys:
+        await _delete_quietly(key)
+        presigned_url_cache.pop_where(lambda cached, _url: cached[0] == key)
 
 
 class PatientDocumentService:
@@ -48,7 +207,9 @@ class PatientDocumentService:
         document_type: Optional[str] = None,
         sort: str = "id",
         order: str = "asc",
-    ) -> Tuple[List[PatientDocument], int]:
+        cursor: Optional[str] = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[PatientDocument], PageInfo]:
         """Get all documents for a patient with pagination and filtering."""
         query = select(PatientDocument).where(
             PatientDocument.patient_id == patient_id,
@@ -58,24 +219,15 @@ class PatientDocumentService:
         if document_type is not None:
             query = query.where(PatientDocument.document_type == document_type)
 
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
-
         sort_column = getattr(PatientDocument, sort, PatientDocument.id)
-        if order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        offset = (page - 1) * size
-        query = query.offset(offset).limit(size)
-
-        result = await self.db.execute(query)
-        documents = result.scalars().all()
+        rows, page_info = await paginate(
+            self.db, query, sort_column, PatientDocument.id,
+            page=page, size=size, order=order, cursor=cursor, count=count,
+        )
+        documents = [row[0] for row in rows]
 
-        logger.debug("Queried patient documents: patient_id=%d total=%d returned=%d", patient_id, total, len(documents))
-        return list(documents), total
+        logger.debug("Queried patient documents: patient_id=%d total=%s returned=%d", patient_id, page_info.total, len(documents))
+        return documents, page_info
 
     async def upload(
         self,
@@ -86,17 +238,15 @@ class PatientDocumentService:
         created_by: Optional[str] = None,
     ) -> PatientDocument:
         """Upload a document for a patient."""
-        # Generate unique file key
-        ext = ""
-        if file.filename and "." in file.filename:
-            ext = file.filename.rsplit(".", 1)[-1]
-        unique_name = f"{uuid.uuid4().hex}.{ext}" if ext else uuid.uuid4().hex
-        file_key = f"{patient_id}/{unique_name}"
-
-        # Read file content and upload to storage
-        content = await file.read()
+        file_key = _new_file_key(file.filename)
+        unique_name = file_key.rsplit("/", 1)[-1]
+
+        # Stream file content to storage in parts
         content_type = file.content_type or "application/octet-stream"
-        await storage.upload_file(file_key, content, content_type)
+        stored = await storage.upload_stream(file_key, file.read, content_type)
+        # Nothing else knows the staging key, so drop it if the document is not recorded
+        after_rollback(self.db, lambda: _delete_quietly(stored.key))
+        file_key = await self._claim_object(stored)
 
         document_name = document_name or file.filename or unique_name
 
@@ -105,6 +255,151 @@ class PatientDocumentService:
             document_name=document_name,
             document_type=document_type,
             file_path=file_key,
+            content_sha256=stored.sha256,
+            created_by=created_by,
+            updated_by=created_by,
+        )
+        self.db.add(doc)
+        await self.db.flush()
+        await self.db.refresh(doc)
+
+        logger.info(
+            "Uploaded document id=%d patient_id=%d file_key='%s' size=%d sha256=%s",
+            doc.id, patient_id, file_key, stored.size, stored.sha256,
+        )
+        return doc
+
+    async def _claim_object(self, stored: storage.UploadResult) -> str:
+        """Take a reference on the stored object with this content and return its key.
+
+        stored is a freshly written staging object. The upsert is atomic, so
+        concurrent uploads of the same file agree on one content key. The
+        staging object is only moved there (or dropped, if the content is
+        already stored) once the reference commits; until then it is left
+        alone, so a rolled-back request loses nothing and a direct upload
+        can be completed again.
+        """
+        content_key = _content_key(stored.sha256, stored.key)
+        result = await self.db.execute(
+            pg_insert(StoredObject)
+            .values(content_sha256=stored.sha256, file_path=content_key, size=stored.size, ref_count=1)
+            .on_conflict_do_update(
+                index_elements=[StoredObject.content_sha256],
+                set_={"ref_count": StoredObject.ref_count + 1},
+            )
+            .returning(StoredObject.file_path, StoredObject.ref_count)
+        )
+        file_key, ref_count = result.one()
+        if ref_count > 1:
+            logger.info("Deduplicating upload key='%s' onto existing key='%s'", stored.key, file_key)
+        after_commit(self.db, lambda: _settle_object(stored.key, file_key))
+        return file_key
+
+    async def _discard(self, key: str) -> None:
+        """Delete an uploaded object that will not be recorded.
+
+        Keys registered in stored_objects are shared by documents and are
+        never removed here.
+        """
+        registered = await self.db.execute(select(StoredObject.content_sha256).where(StoredObject.file_path == key))
+        if registered.first():
+            logger.error("Refused to discard shared stored object key='%s'", key)
+            return
+        await storage.delete_file(key)
+
+    async def _release_object(self, doc: PatientDocument) -> bool:
+        """Drop doc's reference to its stored object. Returns True if the object
+        has no references left and should be removed from storage.
+
+        Documents uploaded before hashing own their object outright.
+        """
+        if not doc.content_sha256:
+            return True
+        result = await self.db.execute(
+            update(StoredObject)
+            .where(StoredObject.content_sha256 == doc.content_sha256)
+            .values(ref_count=StoredObject.ref_count - 1)
+            .returning(StoredObject.ref_count)
+        )
+        remaining = result.scalar_one_or_none()
+        if remaining is None:
+            return True
+        if remaining > 0:
+            return False
+        await self.db.execute(
+            delete(StoredObject).where(
+                StoredObject.content_sha256 == doc.content_sha256,
+                StoredObject.ref_count <= 0,
+            )
+        )
+        return True
+
+    async def create_upload(self, patient_id: int, data: PatientDocumentUploadRequest) -> PatientDocumentUploadTicket:
+        """Issue a presigned URL for the client to upload a document straight to storage.
+
+        The file always goes to a new staging key: a declared checksum alone
+        does not prove the client has the content, so existing objects are
+        only shared once the upload has been verified by complete_upload. The
+        returned upload_token carries the key, size and checksum there, so
+        nothing is recorded until the upload is confirmed.
+        """
+        if data.size > settings.DIRECT_UPLOAD_MAX_BYTES:
+            raise ValueError(f"File exceeds the {settings.DIRECT_UPLOAD_MAX_BYTES} byte upload limit")
+
+        expires_in = settings.DIRECT_UPLOAD_EXPIRY_SECONDS
+        file_key = _new_file_key(data.filename)
+        upload_url, headers = storage.presign_upload(
+            file_key, data.content_type, data.size, data.sha256, expires_in=expires_in,
+        )
+        token = create_access_token(
+            {
+                "sub": f"{_UPLOAD_TOKEN_SUBJECT}:{patient_id}",
+                "key": file_key, "size": data.size, "sha256": data.sha256, "filename": data.filename,
+            },
+            # Outlives the URL so a long upload started just before expiry can still complete
+            expires_delta=timedelta(seconds=expires_in) + _UPLOAD_TOKEN_GRACE,
+        )
+
+        logger.info("Issued direct upload patient_id=%d file_key='%s' size=%d", patient_id, file_key, data.size)
+        return PatientDocumentUploadTicket(
+            upload_url=upload_url, headers=headers, file_path=file_key, upload_token=token, expires_in=expires_in,
+        )
+
+    async def complete_upload(
+        self,
+        patient_id: int,
+        data: PatientDocumentUploadComplete,
+        created_by: Optional[str] = None,
+    ) -> PatientDocument:
+        """Record a directly uploaded document once storage confirms its size and checksum.
+
+        The staging object is consumed (moved or removed) once the document
+        commits, so a token can complete only once; if the request rolls
+        back it is kept and the same token can be completed again.
+        """
+        claims = decode_access_token(data.upload_token)
+        if not claims or claims.get("sub") != f"{_UPLOAD_TOKEN_SUBJECT}:{patient_id}":
+            raise ValueError("Invalid or expired upload token")
+        file_key = claims["key"]
+
+        stored = await storage.stat_file(file_key)
+        if stored is None:
+            raise ValueError("Uploaded file not found in storage (or the upload was already completed)")
+        if stored.size != claims["size"] or stored.sha256 != claims["sha256"]:
+            await self._discard(file_key)
+            logger.warning(
+                "Discarded direct upload file_key='%s' size=%d sha256=%s (expected size=%d sha256=%s)",
+                file_key, stored.size, stored.sha256, claims["size"], claims["sha256"],
+            )
+            raise ValueError("Uploaded file does not match the declared size and checksum")
+        file_key = await self._claim_object(stored)
+
+        doc = PatientDocument(
+            patient_id=patient_id,
+            document_name=data.document_name or claims["filename"],
+            document_type=data.document_type,
+            file_path=file_key,
+            content_sha256=stored.sha256,
             created_by=created_by,
             updated_by=created_by,
         )
@@ -112,7 +407,7 @@ class PatientDocumentService:
         await self.db.flush()
         await self.db.refresh(doc)
 
-        logger.info("Uploaded document id=%d patient_id=%d file_key='%s'", doc.id, patient_id, file_key)
+        logger.info("Completed direct upload id=%d patient_id=%d file_key='%s' size=%d", doc.id, patient_id, file_key, stored.size)
         return doc
 
     async def delete(self, document_id: int, deleted_by: Optional[str] = None) -> bool:
@@ -121,11 +416,11 @@ class PatientDocumentService:
         if not doc:
             return False
 
-        # Delete from storage
-        try:
-            await storage.delete_file(doc.file_path)
-        except Exception as e:
-            logger.warning("Failed to delete file from storage key='%s': %s", doc.file_path, str(e))
+        # Delete from storage once no other document shares the file, and only
+        # after the release commits: a rollback brings the references back
+        if await self._release_object(doc):
+            keys = [key for key in (doc.file_path, doc.thumbnail_path) if key]
+            after_commit(self.db, lambda: _delete_unreferenced(keys))
 
         doc.is_deleted = True
         doc.updated_by = deleted_by
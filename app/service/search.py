@@ -0,0 +1,104 @@
+import logging
+from typing import Optional, List, Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, literal, union_all
+
+from app.model.third_party import ThirdParty
+from app.model.patient import Patient
+from app.model.doctor import Doctor
+from app.model.partner import Partner
+from app.model.medicine import Medicine
+from app.model.equipment import Equipment
+from app.model.medical_device import MedicalDevice
+from app.model.appointment import Appointment
+from app.schema.search import SearchEntity, SearchHit
+from app.utility.search import search_filter, search_rank
+
+logger = logging.getLogger("medbase.service.search")
+
+
+class SearchService:
+    """Service layer for cross-entity search."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def _third_party_branch(entity: SearchEntity, model, term: str):
+        """Patients, doctors and partners are found through their third party."""
+        columns = (ThirdParty.name, ThirdParty.code, ThirdParty.phone, ThirdParty.email)
+        return (
+            select(
+                literal(entity.value).label("type"),
+                model.id.label("id"),
+                ThirdParty.name.label("name"),
+                ThirdParty.code.label("code"),
+                search_rank(term, *columns).label("rank"),
+            )
+            .join(ThirdParty, model.third_party_id == ThirdParty.id)
+            .where(model.is_deleted == False, search_filter(term, *columns))
+        )
+
+    @staticmethod
+    def _catalog_branch(entity: SearchEntity, model, term: str):
+        columns = (model.name, model.code)
+        return (
+            select(
+                literal(entity.value).label("type"),
+                model.id.label("id"),
+                model.name.label("name"),
+                model.code.label("code"),
+                search_rank(term, *columns).label("rank"),
+            )
+            .where(model.is_deleted == False, search_filter(term, *columns))
+        )
+
+    @staticmethod
+    def _appointment_branch(term: str):
+        return (
+            select(
+                literal(SearchEntity.APPOINTMENT.value).label("type"),
+                Appointment.id.label("id"),
+                ThirdParty.name.label("name"),
+                Appointment.code.label("code"),
+                search_rank(term, Appointment.code).label("rank"),
+            )
+            .join(Patient, Appointment.patient_id == Patient.id)
+            .join(ThirdParty, Patient.third_party_id == ThirdParty.id)
+            .where(Appointment.is_deleted == False, search_filter(term, Appointment.code))
+        )
+
+    async def search(
+        self,
+        term: str,
+        types: Optional[Iterable[SearchEntity]] = None,
+        limit: int = 20,
+    ) -> List[SearchHit]:
+        """Rank matches for term across entity types in one UNION ALL query.
+
+        Hits are ordered by rank, then name; ``types`` restricts which
+        entities are searched (all by default).
+        """
+        wanted = set(types) if types else set(SearchEntity)
+        branches = {
+            SearchEntity.PATIENT: lambda: self._third_party_branch(SearchEntity.PATIENT, Patient, term),
+            SearchEntity.DOCTOR: lambda: self._third_party_branch(SearchEntity.DOCTOR, Doctor, term),
+            SearchEntity.PARTNER: lambda: self._third_party_branch(SearchEntity.PARTNER, Partner, term),
+            SearchEntity.MEDICINE: lambda: self._catalog_branch(SearchEntity.MEDICINE, Medicine, term),
+            SearchEntity.EQUIPMENT: lambda: self._catalog_branch(SearchEntity.EQUIPMENT, Equipment, term),
+            SearchEntity.MEDICAL_DEVICE: lambda: self._catalog_branch(SearchEntity.MEDICAL_DEVICE, MedicalDevice, term),
+            SearchEntity.APPOINTMENT: lambda: self._appointment_branch(term),
+        }
+        selects = [build() for entity, build in branches.items() if entity in wanted]
+
+        hits = union_all(*selects).subquery()
+        result = await self.db.execute(
+            select(hits)
+            .order_by(hits.c.rank.desc(), hits.c.name.asc(), hits.c.type.asc(), hits.c.id.asc())
+            .limit(limit)
+        )
+        items = [SearchHit.model_validate(dict(row._mapping)) for row in result.all()]
+
+        logger.debug("Searched term='%s' types=%s returned=%d", term, sorted(wanted), len(items))
+        return items
@@ -1,9 +1,14 @@
+import asyncio
 import logging
 from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional, Set
 
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import select, func, and_, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
+from app.utility.config import settings
+from app.utility.database import after_commit
 from app.model.patient import Patient
 from app.model.appointment import Appointment
 from app.model.inventory import Inventory
@@ -13,6 +18,7 @@ from app.model.partner import Partner
 from app.model.doctor import Doctor
 from app.model.item import Item
 from app.model.third_party import ThirdParty
+from app.model.statistics_snapshot import StatisticsSnapshot
 from app.schema.statistics import (
     SummaryStats,
     InventoryStats,
@@ -30,52 +36,186 @@ logger = logging.getLogger("medbase.service.statistics")
 
 LOW_STOCK_THRESHOLD = 10
 
+# Statistics groups, each backed by one statistics_snapshots row
+SUMMARY = "summary"
+INVENTORY = "inventory"
+APPOINTMENTS = "appointments"
+TRANSACTIONS = "transactions"
+
+
+# Groups a committed write has invalidated, waiting for the background refresher (per worker)
+pending_refreshes: Set[str] = set()
+_wakeup: Optional[asyncio.Event] = None
+_refresher: Optional[asyncio.Task] = None
+# Pooled connections _fetch_all may hold at once across all statistics reads (per worker)
+_query_slots = asyncio.Semaphore(max(1, settings.STATS_QUERY_CONCURRENCY))
+
+
+def mark_statistics_stale(db: AsyncSession, *groups: str) -> None:
+    """Queue snapshot groups for a background refresh once db's transaction commits.
+
+    Called by service-layer writes. Nothing is written to the database here, so
+    concurrent writes never wait on the shared snapshot rows; a rollback drops
+    the request.
+    """
+    after_commit(db, lambda: request_refresh(*groups))
+
+
+def request_refresh(*groups: str) -> None:
+    """Ask the background refresher to recompute groups."""
+    pending_refreshes.update(groups)
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+async def refresh_snapshots(
+    session_factory: async_sessionmaker, groups: Optional[Iterable[str]] = None,
+) -> List[str]:
+    """Recompute snapshot groups from session_factory and store them; returns the groups refreshed.
+
+    Without groups, refreshes the queued ones plus any whose snapshot is
+    missing or due. session_factory should be the primary so a queued
+    group sees the write that queued it.
+    """
+    async with session_factory() as db:
+        service = StatisticsService(db, session_factory)
+        if groups is None:
+            groups = set(pending_refreshes)
+            pending_refreshes.clear()
+            groups |= await service._due_groups()
+        groups = sorted(groups)
+        try:
+            for group in groups:
+                await service._store(group)
+            await db.commit()
+        except Exception:
+            pending_refreshes.update(groups)
+            raise
+    return groups
+
+
+async def _refresh_loop(session_factory: async_sessionmaker, interval: float, delay: float) -> None:
+    while True:
+        try:
+            groups = await refresh_snapshots(session_factory)
+            if groups:
+                logger.debug("Refreshed statistics snapshots groups=%s", ",".join(groups))
+        except Exception as e:
+            logger.warning("Statistics snapshot refresh failed: %s", str(e))
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=interval)
+            # Let a burst of writes settle into one refresh
+            await asyncio.sleep(delay)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup.clear()
+
+
+def start_statistics_refresher(session_factory: async_sessionmaker) -> None:
+    """Start refreshing snapshots in the background. Called from the app lifespan."""
+    global _refresher, _wakeup
+    max_age = settings.STATS_SNAPSHOT_MAX_AGE_SECONDS
+    if _refresher is None and max_age > 0:
+        _wakeup = asyncio.Event()
+        _refresher = asyncio.get_running_loop().create_task(
+            _refresh_loop(session_factory, max_age / 2, settings.STATS_REFRESH_DELAY_SECONDS)
+        )
+
+
+async def stop_statistics_refresher() -> None:
+    """Stop the background snapshot refresher."""
+    global _refresher, _wakeup
+    if _refresher is not None:
+        _refresher.cancel()
+        try:
+            await _refresher
+        except asyncio.CancelledError:
+            pass
+        _refresher = None
+        _wakeup = None
+
 
 class StatisticsService:
     """Service layer for dashboard statistics."""
 
-    def __init__(self, db: AsyncSession):
+    # Schema and compute method per group
+    _GROUPS = {
+        SUMMARY: (SummaryStats, "_compute_summary"),
+        INVENTORY: (InventoryStats, "_compute_inventory_stats"),
+        APPOINTMENTS: (AppointmentStats, "_compute_appointment_stats"),
+        TRANSACTIONS: (TransactionStats, "_compute_transaction_stats"),
+    }
+
+    def __init__(self, db: AsyncSession, session_factory: Optional[async_sessionmaker] = None):
         self.db = db
+        self.session_factory = session_factory
 
     async def get_summary(self) -> SummaryStats:
         """Get overall summary statistics."""
-        total_patients = await self._count(Patient)
-        active_patients = await self._count(Patient, Patient.is_active == True)
-        total_appointments = await self._count(Appointment)
-        total_inventory = await self._count(Inventory)
-        total_transactions = await self._count(InventoryTransaction)
-        total_partners = await self._count(Partner)
-        active_partners = await self._count(Partner, Partner.is_active == True)
-        total_doctors = await self._count(Doctor)
-        active_doctors = await self._count(Doctor, Doctor.is_active == True)
+        return await self._snapshot(SUMMARY)
+
+    async def get_inventory_stats(self) -> InventoryStats:
+        """Get inventory statistics."""
+        return await self._snapshot(INVENTORY)
+
+    async def get_appointment_stats(self) -> AppointmentStats:
+        """Get appointment statistics."""
+        return await self._snapshot(APPOINTMENTS)
+
+    async def get_transaction_stats(self) -> TransactionStats:
+        """Get transaction statistics."""
+        return await self._snapshot(TRANSACTIONS)
+
+    # --- Computation ---
+
+    async def _compute_summary(self) -> SummaryStats:
+        """Compute overall summary statistics (single query)."""
+        patients = self._counts_subquery(Patient, Patient.is_active == True)
+        appointments = self._counts_subquery(Appointment)
+        inventory = self._counts_subquery(Inventory)
+        transactions = self._counts_subquery(InventoryTransaction)
+        partners = self._counts_subquery(Partner, Partner.is_active == True)
+        doctors = self._counts_subquery(Doctor, Doctor.is_active == True)
+
+        query = select(
+            patients.c.total, patients.c.active,
+            appointments.c.total,
+            inventory.c.total,
+            transactions.c.total,
+            partners.c.total, partners.c.active,
+            doctors.c.total, doctors.c.active,
+        ).select_from(
+            patients
+            .join(appointments, true())
+            .join(inventory, true())
+            .join(transactions, true())
+            .join(partners, true())
+            .join(doctors, true())
+        )
+        (row,), = await self._fetch_all(query)
 
         return SummaryStats(
-            total_patients=total_patients,
-            total_appointments=total_appointments,
-            total_inventory_items=total_inventory,
-            total_transactions=total_transactions,
-            total_partners=total_partners,
-            total_doctors=total_doctors,
-            active_patients=active_patients,
-            active_partners=active_partners,
-            active_doctors=active_doctors,
+            total_patients=row[0],
+            total_appointments=row[2],
+            total_inventory_items=row[3],
+            total_transactions=row[4],
+            total_partners=row[5],
+            total_doctors=row[7],
+            active_patients=row[1],
+            active_partners=row[6],
+            active_doctors=row[8],
         )
 
-    async def get_inventory_stats(self) -> InventoryStats:
-        """Get inventory statistics."""
+    async def _compute_inventory_stats(self) -> InventoryStats:
+        """Compute inventory statistics."""
         # Total items and total quantity
-        result = await self.db.execute(
-            select(
-                func.count(Inventory.id),
-                func.coalesce(func.sum(Inventory.quantity), 0),
-            ).where(Inventory.is_deleted == False)
-        )
-        row = result.one()
-        total_items = row[0]
-        total_quantity = row[1]
+        totals_query = select(
+            func.count(Inventory.id),
+            func.coalesce(func.sum(Inventory.quantity), 0),
+        ).where(Inventory.is_deleted == False)
 
         # Items by type (join with Item to get item_type)
-        result = await self.db.execute(
+        by_type_query = (
             select(
                 Item.item_type,
                 func.count(Inventory.id),
@@ -85,14 +225,10 @@ class StatisticsService:
             .where(Inventory.is_deleted == False)
             .group_by(Item.item_type)
         )
-        items_by_type = [
-            InventoryByType(item_type=r[0], count=r[1], total_quantity=r[2])
-            for r in result.all()
-        ]
 
         # Low stock items
         low_stock_query = (
-            select(Inventory, Item.name, Item.item_type)
+            select(Inventory.item_id, Inventory.quantity, Item.name, Item.item_type)
             .join(Item, Inventory.item_id == Item.id)
             .where(
                 Inventory.is_deleted == False,
@@ -101,20 +237,25 @@ class StatisticsService:
             .order_by(Inventory.quantity.asc())
             .limit(20)
         )
-        result = await self.db.execute(low_stock_query)
-        low_stock_rows = result.all()
-
-        low_stock_items = []
-        for row in low_stock_rows:
-            inv = row[0]
-            low_stock_items.append(
-                LowStockItem(
-                    item_type=row[2],
-                    item_id=inv.item_id,
-                    item_name=row[1] or "Unknown",
-                    quantity=inv.quantity,
-                )
+
+        totals_rows, by_type_rows, low_stock_rows = await self._fetch_all(
+            totals_query, by_type_query, low_stock_query,
+        )
+        total_items, total_quantity = totals_rows[0]
+
+        items_by_type = [
+            InventoryByType(item_type=r[0], count=r[1], total_quantity=r[2])
+            for r in by_type_rows
+        ]
+        low_stock_items = [
+            LowStockItem(
+                item_type=r[3],
+                item_id=r[0],
+                item_name=r[2] or "Unknown",
+                quantity=r[1],
             )
+            for r in low_stock_rows
+        ]
 
         return InventoryStats(
             total_items=total_items,
@@ -123,34 +264,26 @@ class StatisticsService:
             items_by_type=items_by_type,
         )
 
-    async def get_appointment_stats(self) -> AppointmentStats:
-        """Get appointment statistics."""
+    async def _compute_appointment_stats(self) -> AppointmentStats:
+        """Compute appointment statistics."""
         today = date.today()
         today_start = datetime.combine(today, datetime.min.time())
         today_end = datetime.combine(today, datetime.max.time())
 
-        # Today's appointments
-        result = await self.db.execute(
-            select(func.count(Appointment.id)).where(
-                Appointment.is_deleted == False,
+        # Today's and upcoming (future, excluding today, not cancelled) appointments
+        counts_query = select(
+            func.count(Appointment.id).filter(
                 Appointment.appointment_date >= today_start,
                 Appointment.appointment_date <= today_end,
-            )
-        )
-        today_count = result.scalar()
-
-        # Upcoming appointments (future, excluding today, not cancelled)
-        result = await self.db.execute(
-            select(func.count(Appointment.id)).where(
-                Appointment.is_deleted == False,
+            ),
+            func.count(Appointment.id).filter(
                 Appointment.appointment_date > today_end,
                 Appointment.status != "cancelled",
-            )
-        )
-        upcoming_count = result.scalar()
+            ),
+        ).where(Appointment.is_deleted == False)
 
         # By status
-        result = await self.db.execute(
+        by_status_query = (
             select(
                 Appointment.status,
                 func.count(Appointment.id),
@@ -158,28 +291,35 @@ class StatisticsService:
             .where(Appointment.is_deleted == False)
             .group_by(Appointment.status)
         )
-        by_status = [
-            AppointmentsByStatus(status=r[0], count=r[1])
-            for r in result.all()
-        ]
 
         # By month (last 6 months)
         six_months_ago = today - timedelta(days=180)
-        result = await self.db.execute(
+        month = func.to_char(Appointment.appointment_date, 'YYYY-MM')
+        by_month_query = (
             select(
-                func.to_char(Appointment.appointment_date, 'YYYY-MM').label("month"),
+                month.label("month"),
                 func.count(Appointment.id),
             )
             .where(
                 Appointment.is_deleted == False,
                 Appointment.appointment_date >= six_months_ago,
             )
-            .group_by(func.to_char(Appointment.appointment_date, 'YYYY-MM'))
-            .order_by(func.to_char(Appointment.appointment_date, 'YYYY-MM'))
+            .group_by(month)
+            .order_by(month)
         )
+
+        counts_rows, by_status_rows, by_month_rows = await self._fetch_all(
+            counts_query, by_status_query, by_month_query,
+        )
+        today_count, upcoming_count = counts_rows[0]
+
+        by_status = [
+            AppointmentsByStatus(status=r[0], count=r[1])
+            for r in by_status_rows
+        ]
         by_month = [
             AppointmentsByMonth(month=r[0], count=r[1])
-            for r in result.all()
+            for r in by_month_rows
         ]
 
         # Totals for completed and cancelled
@@ -200,85 +340,151 @@ class StatisticsService:
             total_cancelled=total_cancelled,
         )
 
-    async def get_transaction_stats(self) -> TransactionStats:
-        """Get transaction statistics."""
-        # Total transactions
-        total = await self._count(InventoryTransaction)
+    async def _compute_transaction_stats(self) -> TransactionStats:
+        """Compute transaction statistics."""
+        active_items_join = and_(
+            InventoryTransactionItem.transaction_id == InventoryTransaction.id,
+            InventoryTransactionItem.is_deleted == False,
+        )
 
         # By type with item counts
-        result = await self.db.execute(
+        by_type_query = (
             select(
                 InventoryTransaction.transaction_type,
-                func.count(InventoryTransaction.id),
-                func.coalesce(
-                    func.sum(
-                        select(func.count(InventoryTransactionItem.id))
-                        .where(
-                            InventoryTransactionItem.transaction_id == InventoryTransaction.id,
-                            InventoryTransactionItem.is_deleted == False,
-                        )
-                        .correlate(InventoryTransaction)
-                        .scalar_subquery()
-                    ),
-                    0,
-                ),
+                func.count(func.distinct(InventoryTransaction.id)),
+                func.count(InventoryTransactionItem.id),
             )
+            .outerjoin(InventoryTransactionItem, active_items_join)
             .where(InventoryTransaction.is_deleted == False)
             .group_by(InventoryTransaction.transaction_type)
         )
-        by_type = [
-            TransactionsByType(transaction_type=r[0], count=r[1], total_items=r[2])
-            for r in result.all()
-        ]
 
-        # Recent transactions (last 10)
-        result = await self.db.execute(
+        # Recent transactions (last 10) with their item counts
+        recent = (
+            select(InventoryTransaction.id)
+            .where(InventoryTransaction.is_deleted == False)
+            .order_by(InventoryTransaction.created_at.desc())
+            .limit(10)
+            .subquery()
+        )
+        recent_query = (
             select(
-                InventoryTransaction,
+                InventoryTransaction.id,
+                InventoryTransaction.transaction_type,
+                InventoryTransaction.transaction_date,
                 ThirdParty.name.label("third_party_name"),
+                func.count(InventoryTransactionItem.id).label("item_count"),
             )
+            .join(recent, recent.c.id == InventoryTransaction.id)
             .outerjoin(ThirdParty, InventoryTransaction.third_party_id == ThirdParty.id)
-            .where(InventoryTransaction.is_deleted == False)
+            .outerjoin(InventoryTransactionItem, active_items_join)
+            .group_by(InventoryTransaction.id, ThirdParty.name)
             .order_by(InventoryTransaction.created_at.desc())
-            .limit(10)
         )
-        recent_rows = result.all()
-
-        recent_transactions = []
-        for row in recent_rows:
-            txn = row[0]
-            tp_name = row[1]
-            # Count items for this transaction
-            item_count_result = await self.db.execute(
-                select(func.count(InventoryTransactionItem.id)).where(
-                    InventoryTransactionItem.transaction_id == txn.id,
-                    InventoryTransactionItem.is_deleted == False,
-                )
-            )
-            item_count = item_count_result.scalar()
-
-            recent_transactions.append(
-                RecentTransaction(
-                    id=txn.id,
-                    transaction_type=txn.transaction_type,
-                    transaction_date=str(txn.transaction_date),
-                    third_party_name=tp_name,
-                    item_count=item_count,
-                )
+
+        by_type_rows, recent_rows = await self._fetch_all(by_type_query, recent_query)
+
+        by_type = [
+            TransactionsByType(transaction_type=r[0], count=r[1], total_items=r[2])
+            for r in by_type_rows
+        ]
+        recent_transactions = [
+            RecentTransaction(
+                id=r[0],
+                transaction_type=r[1],
+                transaction_date=str(r[2]),
+                third_party_name=r[3],
+                item_count=r[4],
             )
+            for r in recent_rows
+        ]
 
         return TransactionStats(
-            total_transactions=total,
+            total_transactions=sum(t.count for t in by_type),
             by_type=by_type,
             recent_transactions=recent_transactions,
         )
 
     # --- Helpers ---
 
-    async def _count(self, model, *extra_filters):
-        """Count non-deleted records for a model."""
-        query = select(func.count(model.id)).where(model.is_deleted == False)
-        for f in extra_filters:
-            query = query.where(f)
-        result = await self.db.execute(query)
-        return result.scalar()
+    async def _snapshot(self, group: str):
+        """Return the stored snapshot for group, or compute it inline if missing or expired.
+
+        Snapshots are only written by the background refresher. One expires
+        after STATS_SNAPSHOT_MAX_AGE_SECONDS or at midnight (today/upcoming
+        counts roll over); an inline result is not stored, the refresher is
+        asked to catch up instead.
+        """
+        schema, compute = self._GROUPS[group]
+        max_age = settings.STATS_SNAPSHOT_MAX_AGE_SECONDS
+        now = datetime.now()
+        if max_age > 0:
+            result = await self.db.execute(
+                select(StatisticsSnapshot.payload, StatisticsSnapshot.refreshed_at)
+                .where(StatisticsSnapshot.key == group)
+            )
+            row = result.one_or_none()
+            if row is not None and self._is_fresh(row.refreshed_at, now, max_age):
+                return schema.model_validate({**row.payload, "refreshed_at": row.refreshed_at})
+            request_refresh(group)
+
+        stats = await getattr(self, compute)()
+        stats.refreshed_at = now
+        return stats
+
+    async def _due_groups(self) -> Set[str]:
+        """Groups whose snapshot is missing or past half its max age."""
+        now = datetime.now()
+        max_age = settings.STATS_SNAPSHOT_MAX_AGE_SECONDS / 2
+        result = await self.db.execute(
+            select(StatisticsSnapshot.key, StatisticsSnapshot.refreshed_at)
+        )
+        fresh = {key for key, refreshed_at in result.all() if self._is_fresh(refreshed_at, now, max_age)}
+        return set(self._GROUPS) - fresh
+
+    async def _store(self, group: str) -> None:
+        """Compute group and upsert its snapshot, unless a newer one was stored meanwhile."""
+        schema, compute = self._GROUPS[group]
+        # Stamp with the start time: the figures include everything committed before it
+        started = datetime.now()
+        stats = await getattr(self, compute)()
+        stmt = pg_insert(StatisticsSnapshot).values(
+            key=group,
+            payload=stats.model_dump(mode="json", exclude={"refreshed_at"}),
+            refreshed_at=started,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StatisticsSnapshot.key],
+            set_={"payload": stmt.excluded.payload, "refreshed_at": stmt.excluded.refreshed_at},
+            where=StatisticsSnapshot.refreshed_at < stmt.excluded.refreshed_at,
+        )
+        await self.db.execute(stmt)
+
+    @staticmethod
+    def _is_fresh(refreshed_at: datetime, now: datetime, max_age: float) -> bool:
+        return refreshed_at.date() == now.date() and now - refreshed_at < timedelta(seconds=max_age)
+
+    @staticmethod
+    def _counts_subquery(model, active_filter=None):
+        """Subquery with the non-deleted total (and optionally active count) for a model."""
+        columns = [func.count(model.id).label("total")]
+        if active_filter is not None:
+            columns.append(func.count(model.id).filter(active_filter).label("active"))
+        return select(*columns).where(model.is_deleted == False).subquery()
+
+    async def _fetch_all(self, *queries) -> List[list]:
+        """Run independent read queries and return their rows in order.
+
+        With a session factory each query gets its own session (and pooled
+        connection) so they run concurrently, at most STATS_QUERY_CONCURRENCY
+        at a time across the worker so a burst of dashboard loads cannot drain
+        the pool; otherwise they run one after another on the request session.
+        """
+        if self.session_factory is None:
+            return [(await self.db.execute(q)).all() for q in queries]
+
+        async def fetch(query):
+            async with _query_slots, self.session_factory() as session:
+                return (await session.execute(query)).all()
+
+        return list(await asyncio.gather(*(fetch(q) for q in queries)))
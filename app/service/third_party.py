@@ -1,13 +1,18 @@
 import logging
 from typing import Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from sqlalchemy import select
 
 from app.model.third_party import ThirdParty
 from app.model.patient import Patient
 from app.model.doctor import Doctor
 from app.model.partner import Partner
 from app.model.user import User
+from app.utility.cache import principal_cache
+from app.utility.database import after_commit
+from app.schema.base import CountMode
+from app.utility.pagination import paginate, PageInfo
+from app.utility.search import search_filter, search_rank, RELEVANCE
 
 logger = logging.getLogger("medbase.service.third_party")
 
@@ -55,7 +60,9 @@ class ThirdPartyService:
         exclude_doctors: bool = False,
         exclude_partners: bool = False,
         exclude_users: bool = False,
-    ) -> Tuple[List[ThirdParty], int]:
+        cursor: Optional[str] = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[ThirdParty], PageInfo]:
         """Get all third parties with pagination and filtering."""
         query = select(ThirdParty).where(ThirdParty.is_deleted == False)
 
@@ -74,35 +81,22 @@ class ThirdPartyService:
 
         if is_active is not None:
             query = query.where(ThirdParty.is_active == is_active)
+        search_columns = (ThirdParty.code, ThirdParty.name, ThirdParty.email, ThirdParty.phone)
         if search:
-            search_term = f"%{search}%"
-            query = query.where(
-                or_(
-                    ThirdParty.code.ilike(search_term),
-                    ThirdParty.name.ilike(search_term),
-                    ThirdParty.email.ilike(search_term),
-                    ThirdParty.phone.ilike(search_term),
-                )
-            )
-
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
+            query = query.where(search_filter(search, *search_columns))
 
         sort_column = getattr(ThirdParty, sort, ThirdParty.id)
-        if order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        offset = (page - 1) * size
-        query = query.offset(offset).limit(size)
-
-        result = await self.db.execute(query)
-        records = result.scalars().all()
+        if sort == RELEVANCE and search:
+            # Best matches first, regardless of the requested order
+            sort_column, order = search_rank(search, *search_columns), "desc"
+        rows, page_info = await paginate(
+            self.db, query, sort_column, ThirdParty.id,
+            page=page, size=size, order=order, cursor=cursor, count=count,
+        )
+        records = [row[0] for row in rows]
 
-        logger.debug("Queried third parties: total=%d returned=%d", total, len(records))
-        return list(records), total
+        logger.debug("Queried third parties: total=%s returned=%d", page_info.total, len(records))
+        return records, page_info
 
     async def create(
         self,
@@ -153,5 +147,12 @@ class ThirdPartyService:
 
         await self.db.flush()
         await self.db.refresh(tp)
+        # Cached principals embed their third party record; evict again once
+        # committed in case a concurrent request re-cached the old one
+        def evict() -> None:
+            principal_cache.pop_where(lambda _user_id, user: user.third_party_id == third_party_id)
+
+        evict()
+        after_commit(self.db, evict)
         logger.info("Updated third party id=%d", third_party_id)
         return tp
@@ -1,7 +1,7 @@
 import logging
 from typing import Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.orm import aliased
 
 from app.model.treatment import Treatment
@@ -9,6 +9,8 @@ from app.model.patient import Patient
 from app.model.partner import Partner
 from app.model.third_party import ThirdParty
 from app.schema.treatment import TreatmentCreate, TreatmentUpdate, TreatmentResponse
+from app.schema.base import CountMode
+from app.utility.pagination import paginate, PageInfo
 
 logger = logging.getLogger("medbase.service.treatment")
 
@@ -64,7 +66,9 @@ class TreatmentService:
         status: Optional[str] = None,
         sort: str = "id",
         order: str = "asc",
-    ) -> Tuple[List[dict], int]:
+        cursor: Optional[str] = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[dict], PageInfo]:
         """Get all treatments with pagination and filtering."""
         PatientTP = aliased(ThirdParty)
         PartnerTP = aliased(ThirdParty)
@@ -90,29 +94,19 @@ class TreatmentService:
         if status is not None:
             query = query.where(Treatment.status == status)
 
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
-
         sort_column = getattr(Treatment, sort, Treatment.id)
-        if order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        offset = (page - 1) * size
-        query = query.offset(offset).limit(size)
-
-        result = await self.db.execute(query)
-        rows = result.all()
+        rows, page_info = await paginate(
+            self.db, query, sort_column, Treatment.id,
+            page=page, size=size, order=order, cursor=cursor, count=count,
+        )
 
         treatments = [
             TreatmentResponse.from_row(row).model_dump()
             for row in rows
         ]
 
-        logger.debug("Queried treatments: total=%d returned=%d", total, len(treatments))
-        return treatments, total
+        logger.debug("Queried treatments: total=%s returned=%d", page_info.total, len(treatments))
+        return treatments, page_info
 
     async def create(self, data: TreatmentCreate, created_by: Optional[str] = None) -> Treatment:
         """Create a new treatment."""
@@ -1,14 +1,19 @@
 import logging
+from datetime import datetime
 from typing import Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, or_
 from sqlalchemy.orm import contains_eager
 
 from app.model.user import User
 from app.model.third_party import ThirdParty
 from app.schema.user import UserCreate, UserUpdate
-from app.utility.security import get_password_hash, verify_password
+from app.utility.security import hash_password, verify_and_update_password
+from app.utility.cache import principal_cache
+from app.utility.database import after_commit
 from app.service.third_party import ThirdPartyService
+from app.schema.base import CountMode
+from app.utility.pagination import paginate, PageInfo
 
 logger = logging.getLogger("medbase.service.user")
 
@@ -29,6 +34,13 @@ class UserService:
         )
         return result.unique().scalar_one_or_none()
 
+    async def get_version(self, user_id: int) -> Optional[datetime]:
+        """Get a user's updated_at, which every write to the row advances (None if deleted)."""
+        result = await self.db.execute(
+            select(User.updated_at).where(User.id == user_id, User.is_deleted == False)
+        )
+        return result.scalar_one_or_none()
+
     async def get_by_username(self, username: str) -> Optional[User]:
         """Get user by username."""
         result = await self.db.execute(
@@ -54,8 +66,10 @@ class UserService:
         is_active: Optional[bool] = None,
         search: Optional[str] = None,
         sort: str = "id",
-        order: str = "asc"
-    ) -> Tuple[List[User], int]:
+        order: str = "asc",
+        cursor: Optional[str] = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[User], PageInfo]:
         """Get all users with pagination, filtering, and sorting."""
         query = (
             select(User)
@@ -78,29 +92,17 @@ class UserService:
                 )
             )
 
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
-
-        # Apply sorting
         tp_sort_map = {"email": ThirdParty.email, "name": ThirdParty.name}
         sort_column = tp_sort_map.get(sort, getattr(User, sort, User.id))
-        if order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        # Apply pagination
-        offset = (page - 1) * size
-        query = query.offset(offset).limit(size)
-
-        result = await self.db.execute(query)
-        users = result.unique().scalars().all()
+        rows, page_info = await paginate(
+            self.db, query, sort_column, User.id,
+            page=page, size=size, order=order, cursor=cursor, count=count,
+        )
+        users = [row[0] for row in rows]
 
-        logger.debug("Queried users: total=%d returned=%d", total, len(users))
+        logger.debug("Queried users: total=%s returned=%d", page_info.total, len(users))
 
-        return list(users), total
+        return users, page_info
 
     async def create(self, user_data: UserCreate, created_by: Optional[str] = None) -> User:
         """Create a new user. Auto-creates a third_party record if third_party_id not provided."""
@@ -123,7 +125,7 @@ class UserService:
         user = User(
             third_party_id=third_party_id,
             username=user_data.username,
-            password_hash=get_password_hash(user_data.password),
+            password_hash=await hash_password(user_data.password),
             role=user_data.role,
             is_active=user_data.is_active,
             created_by=created_by,
@@ -150,13 +152,14 @@ class UserService:
         update_data = user_data.model_dump(exclude_unset=True)
 
         if "password" in update_data:
-            update_data["password_hash"] = get_password_hash(update_data.pop("password"))
+            update_data["password_hash"] = await hash_password(update_data.pop("password"))
 
         for field, value in update_data.items():
             setattr(user, field, value)
         user.updated_by = updated_by
 
         await self.db.flush()
+        self._evict_principal(user_id)
         logger.info("Updated user id=%d fields=%s", user_id, list(update_data.keys()))
         return await self.get_by_id(user_id)
 
@@ -169,11 +172,22 @@ class UserService:
         user.is_deleted = True
         user.updated_by = deleted_by
         await self.db.flush()
+        self._evict_principal(user_id)
         logger.info("Soft-deleted user id=%d", user_id)
         return True
 
+    def _evict_principal(self, user_id: int) -> None:
+        """Drop user_id's cached principal now and again once the write commits,
+        so a request that re-caches the old row in between does not keep it."""
+        principal_cache.pop(user_id)
+        after_commit(self.db, lambda: principal_cache.pop(user_id))
+
     async def authenticate(self, username: str, password: str) -> Optional[User]:
-        """Authenticate a user by username and password."""
+        """Authenticate a user by username and password.
+
+        A password hashed with an outdated cost factor is rehashed with the
+        current one; the new hash commits with the request.
+        """
         user = await self.get_by_username(username)
         if not user:
             logger.debug("Auth failed: user not found username='%s'", username)
@@ -181,7 +195,13 @@ class UserService:
         if not user.is_active:
             logger.debug("Auth failed: user inactive username='%s'", username)
             return None
-        if not verify_password(password, user.password_hash):
+        valid, new_hash = await verify_and_update_password(password, user.password_hash)
+        if not valid:
             logger.debug("Auth failed: wrong password username='%s'", username)
             return None
+        if new_hash:
+            user.password_hash = new_hash
+            await self.db.flush()
+            self._evict_principal(user.id)
+            logger.info("Rehashed password with current cost factor user_id=%d", user.id)
         return user
@@ -1,12 +1,14 @@
 import logging
-from typing import Optional
-from fastapi import Depends, HTTPException, status
+from typing import AsyncGenerator, Optional
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
-from app.utility.database import get_db
+from app.utility.database import get_read_session_factory, get_session_factory, mark_recent_write
 from app.utility.security import decode_access_token
+from app.utility.cache import principal_cache
 from app.model.user import User
+from app.model.third_party import ThirdParty
 from app.service.user import UserService
 from app.schema.user import UserRole
 
@@ -14,12 +16,43 @@ logger = logging.getLogger("medbase.utility.auth")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+_READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+_USER_COLUMNS = [c.key for c in User.__table__.columns]
+_THIRD_PARTY_COLUMNS = [c.key for c in ThirdParty.__table__.columns]
+
+
+def _snapshot_user(user: User) -> User:
+    """Copy a session-bound user (and its third party) into a detached, transient instance.
+
+    Cached principals outlive the session that loaded them, so they must not be
+    tied to its identity map (a rollback there would expire them).
+    """
+    snapshot = User(**{key: getattr(user, key) for key in _USER_COLUMNS})
+    if user.third_party is not None:
+        snapshot.third_party = ThirdParty(
+            **{key: getattr(user.third_party, key) for key in _THIRD_PARTY_COLUMNS}
+        )
+    return snapshot
+
 
 async def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
-) -> User:
-    """Get current authenticated user from JWT token."""
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+    read_session_factory: async_sessionmaker = Depends(get_read_session_factory),
+) -> AsyncGenerator[User, None]:
+    """Get current authenticated user from JWT token.
+
+    The user is looked up in a short session of its own, read-only on read
+    requests and on the primary otherwise, so authentication never holds a
+    connection for the rest of the request. A cached principal is only used
+    while the row's updated_at still matches it, so a role change,
+    deactivation or deletion made through any worker applies at once; its
+    third party may lag by up to PRINCIPAL_CACHE_TTL_SECONDS. After a
+    successful write request the user's reads are pinned to the primary for
+    a while (see app.utility.database.ReadSession).
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -44,12 +77,25 @@ async def get_current_user(
         logger.warning("Invalid 'sub' claim format: %s", user_id_str)
         raise credentials_exception
     
-    user_service = UserService(db)
-    user = await user_service.get_by_id(user_id)
-    
-    if user is None:
-        logger.warning("User not found in database for id=%s", user_id)
-        raise credentials_exception
+    # Set before the lookup: the read session picks primary or replica by it
+    request.state.user_id = user_id
+    if request.method in _READ_METHODS:
+        session = read_session_factory(info={"request": request})
+    else:
+        session = session_factory()
+    async with session:
+        user_service = UserService(session)
+        user = principal_cache.get(user_id)
+        if user is not None and await user_service.get_version(user_id) != user.updated_at:
+            user = None
+        if user is None:
+            user = await user_service.get_by_id(user_id)
+            if user is None:
+                logger.warning("User not found in database for id=%s", user_id)
+                principal_cache.pop(user_id)
+                raise credentials_exception
+            user = _snapshot_user(user)
+            principal_cache.set(user_id, user)
     
     if not user.is_active:
         logger.warning("User account is inactive id=%s", user_id)
@@ -57,8 +103,12 @@ async def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is deactivated"
         )
-    
-    return user
+
+    yield user
+
+    # Only reached when the endpoint succeeded; errors are raised at the yield
+    if request.method not in _READ_METHODS:
+        mark_recent_write(user.id)
 
 
 async def get_current_active_user(
@@ -0,0 +1,89 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from app.utility.config import settings
+
+
+class TTLCache:
+    """Small in-process LRU cache whose entries expire after a fixed TTL.
+
+    Intended for per-worker memoization of hot lookups. A ``ttl`` or
+    ``maxsize`` of 0 disables the cache (every ``get`` misses).
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value under key, evicting the least recently used entry if full."""
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Evict a single key if present."""
+        self._data.pop(key, None)
+
+    def pop_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """Evict every entry for which predicate(key, value) is true. Returns the count."""
+        keys = [k for k, (_exp, v) in self._data.items() if predicate(k, v)]
+        for key in keys:
+            self._data.pop(key, None)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Evict everything."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Authenticated principals keyed by user id (see app.utility.auth.get_current_user).
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+# Paginated list totals keyed by the compiled count query (see app.utility.pagination).
+count_cache = TTLCache(
+    maxsize=settings.COUNT_CACHE_SIZE,
+    ttl=settings.COUNT_CACHE_TTL_SECONDS,
+)
+
+# Presigned document URLs keyed by (file_path, download_filename, expires_in);
+# entries are stored with a per-URL TTL (see app.service.patient_document).
+presigned_url_cache = TTLCache(
+    maxsize=settings.PRESIGNED_URL_CACHE_SIZE,
+    ttl=settings.PRESIGNED_URL_EXPIRY_SECONDS,
+)
+
+# Users who wrote within the read-your-writes window, keyed by user id
+# (see app.utility.database.ReadSession).
+recent_writers = TTLCache(
+    maxsize=settings.READ_YOUR_WRITES_CACHE_SIZE,
+    ttl=settings.READ_YOUR_WRITES_SECONDS,
+)
@@ -1,3 +1,5 @@
+from typing import Dict
+
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
@@ -8,24 +10,110 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     TEST_DATABASE_URL: str = ""
+
+    # Connection pool, per worker process (recycle -1 keeps connections
+    # indefinitely). DB_PGBOUNCER disables prepared statement caching for
+    # transaction-mode poolers; DB_POOL_WARMUP opens DB_POOL_SIZE connections at startup,
+    # giving up on each after DB_POOL_WARMUP_TIMEOUT_SECONDS
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    DB_POOL_RECYCLE_SECONDS: int = -1
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_PGBOUNCER: bool = False
+    DB_POOL_WARMUP: bool = True
+    DB_POOL_WARMUP_TIMEOUT_SECONDS: float = 10
+
+    # Read replica for list, detail and statistics reads (empty: use the primary).
+    # A user's reads stay on the primary for READ_YOUR_WRITES_SECONDS after their
+    # own write (tracked per worker process)
+    READ_REPLICA_URL: str = ""
+    READ_YOUR_WRITES_SECONDS: int = 10
+    READ_YOUR_WRITES_CACHE_SIZE: int = 4096
     
     # JWT Authentication
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
-    
+
+    # Password hashing: bcrypt cost factor (stored hashes with another cost are
+    # rehashed at login) and threads hashing off the event loop, per worker
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+
+    # Authenticated-principal cache (per worker). Entries are checked against
+    # the user row's updated_at on every request; the TTL bounds how stale
+    # their third party details can get.
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_SIZE: int = 1024
+
+    # Paginated list totals (count=estimated / count=cached)
+    COUNT_ESTIMATE_THRESHOLD: int = 1000
+    COUNT_CACHE_TTL_SECONDS: int = 10
+    COUNT_CACHE_SIZE: int = 512
+
+    # Dashboard statistics snapshots, refreshed in the background (0 disables);
+    # a write shows up STATS_REFRESH_DELAY_SECONDS plus one recompute after it commits
+    STATS_SNAPSHOT_MAX_AGE_SECONDS: int = 300
+    STATS_REFRESH_DELAY_SECONDS: float = 1.0
+    # Extra pooled connections the statistics queries may use at once (per worker)
+    STATS_QUERY_CONCURRENCY: int = 2
+
     # Application
     DEBUG: bool = False
     CORS_ORIGINS: str = "*"
     API_V1_PREFIX: str = "/api/v1"
     PROJECT_NAME: str = "MedBase API"
 
+    # Logging: "text" or "json" lines written by a background thread; INFO lines
+    # can be sampled per logger prefix as JSON, e.g. {"medbase.service": 0.1}
+    LOG_FORMAT: str = "text"
+    LOG_SAMPLE_RATES: Dict[str, float] = {}
+
+    # Per-request SQL statistics as Server-Timing headers; a statement repeated more
+    # than N_PLUS_ONE_THRESHOLD times in one request is logged as a likely N+1 (0 disables)
+    QUERY_STATS_ENABLED: bool = True
+    N_PLUS_ONE_THRESHOLD: int = 10
+
+    # Prometheus metrics at /metrics (per worker process), off unless enabled;
+    # with METRICS_TOKEN set, scrapes must send it as a bearer token. Event-loop
+    # lag sampling interval (0 disables)
+    METRICS_ENABLED: bool = False
+    METRICS_TOKEN: str = ""
+    EVENT_LOOP_LAG_INTERVAL_SECONDS: float = 0.5
+
+    # Request logging: JSON/form/text bodies are logged up to this many bytes (0 disables)
+    LOG_BODY_MAX_BYTES: int = 2048
+
+    # Document storage backend: "s3" (Lightsail bucket below) or "local" (files
+    # under LOCAL_STORAGE_ROOT, served from signed URLs prefixed with LOCAL_STORAGE_BASE_URL)
+    STORAGE_BACKEND: str = "s3"
+    LOCAL_STORAGE_ROOT: str = "storage"
+    LOCAL_STORAGE_BASE_URL: str = ""
+
     # Lightsail Object Storage
     LIGHTSAIL_BUCKET_NAME: str = ""
     LIGHTSAIL_ACCESS_KEY: str = ""
     LIGHTSAIL_SECRET_KEY: str = ""
     LIGHTSAIL_ENDPOINT: str = ""
     LIGHTSAIL_REGION: str = ""
+
+    # Presigned document URLs (expiry overrides per document type as JSON,
+    # e.g. {"imaging": 3600}; signed URLs are reused until the margin before expiry)
+    PRESIGNED_URL_EXPIRY_SECONDS: int = 300
+    PRESIGNED_URL_EXPIRY_BY_TYPE: Dict[str, int] = {}
+    PRESIGNED_URL_REUSE_MARGIN_SECONDS: int = 60
+    PRESIGNED_URL_CACHE_SIZE: int = 4096
+
+    # Document thumbnails rendered in a process pool (0 workers disables them)
+    THUMBNAIL_WORKERS: int = 2
+    THUMBNAIL_MAX_SIZE: int = 256
+    THUMBNAIL_MAX_SOURCE_BYTES: int = 50 * 1024 * 1024
+
+    # Direct-to-storage document uploads (presigned PUT, then complete)
+    DIRECT_UPLOAD_EXPIRY_SECONDS: int = 900
+    DIRECT_UPLOAD_MAX_BYTES: int = 5 * 1024 * 1024 * 1024
     
     class Config:
         env_file = ".env"
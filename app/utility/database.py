@@ -1,16 +1,78 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
-from typing import AsyncGenerator
+import asyncio
+import inspect
+import logging
+import time
+import uuid
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from typing import Any, AsyncGenerator, Callable, Dict, Optional
 
+from app.utility.cache import recent_writers
 from app.utility.config import settings
+from app.utility.metrics import DB_POOL_WAIT, track_pool
+from app.utility.query_stats import instrument_engine
+
+logger = logging.getLogger("medbase.utility.database")
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Connection pool that records how long each checkout waits for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - start, pool=self.logging_name or "primary")
+
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def engine_options(pool_name: str) -> Dict[str, Any]:
+    """create_async_engine keyword arguments from the DB_* pool settings.
+
+    DB_STATEMENT_CACHE_SIZE sizes the dialect's prepared statement cache;
+    asyncpg's own statement cache is bypassed by SQLAlchemy. In DB_PGBOUNCER
+    mode both caches are off and statements get unique names, because with
+    transaction pooling consecutive statements may run on different server
+    connections that never saw the earlier PREPARE.
+    """
+    connect_args: Dict[str, Any] = {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    if settings.DB_PGBOUNCER:
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _unique_statement_name,
+        }
+    return {
+        "echo": settings.DEBUG,
+        "poolclass": TimedQueuePool,
+        "pool_logging_name": pool_name,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
 
 
 # Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,
-)
+engine = create_async_engine(settings.DATABASE_URL, **engine_options("primary"))
+instrument_engine(engine)
+track_pool("primary", engine.pool)
+
+# Optional read replica for list, detail and statistics reads
+replica_engine: Optional[AsyncEngine] = None
+if settings.READ_REPLICA_URL:
+    replica_engine = create_async_engine(settings.READ_REPLICA_URL, **engine_options("replica"))
+    instrument_engine(replica_engine)
+    track_pool("replica", replica_engine.pool)
 
 # Create session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -22,6 +84,101 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+def after_commit(session: AsyncSession, callback: Callable[[], Any]) -> None:
+    """Run callback once session's current transaction commits; dropped on rollback.
+
+    For side effects such as evicting in-process caches or removing stored
+    files that must not happen before other requests can see the write (or
+    at all if it rolls back). A callback returning an awaitable runs as a
+    task; get_db waits for those before the response is sent (see
+    wait_for_hooks).
+    """
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+def after_rollback(session: AsyncSession, callback: Callable[[], Any]) -> None:
+    """Run callback if session's current transaction rolls back; dropped on commit.
+
+    The counterpart of after_commit, for undoing side effects the
+    transaction's rows would have owned.
+    """
+    session.info.setdefault("after_rollback", []).append(callback)
+
+
+async def wait_for_hooks(session: AsyncSession) -> None:
+    """Wait for the async after_commit/after_rollback callbacks started for session."""
+    tasks = session.info.pop("hook_tasks", ())
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _log_hook_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Transaction hook failed: %s", str(task.exception()))
+
+
+def _run_hooks(session: Session, name: str) -> None:
+    for callback in session.info.pop(name, ()):
+        try:
+            result = callback()
+            if inspect.isawaitable(result):
+                task = asyncio.ensure_future(result)
+                task.add_done_callback(_log_hook_failure)
+                session.info.setdefault("hook_tasks", []).append(task)
+        except Exception as e:
+            logger.warning("Transaction hook %r failed: %s", callback, str(e))
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    session.info.pop("after_rollback", None)
+    _run_hooks(session, "after_commit")
+
+
+@event.listens_for(Session, "after_rollback")
+def _run_after_rollback(session: Session) -> None:
+    session.info.pop("after_commit", None)
+    _run_hooks(session, "after_rollback")
+
+
+def mark_recent_write(user_id: int) -> None:
+    """Route user_id's reads to the primary for READ_YOUR_WRITES_SECONDS."""
+    recent_writers.set(user_id, True)
+
+
+class ReadSession(Session):
+    """Read-only session that reads from the replica when one is configured.
+
+    Transactions begin with BEGIN READ ONLY, so a write fails instead of
+    being silently rolled back. Reads stay on the primary while the
+    requesting user is within the read-your-writes window after a write of
+    their own, so they never see a replica that has not caught up with it.
+    That window is tracked per worker (recent_writers), so a read served by
+    another worker than the write may still hit a lagging replica; the API
+    docs state this limit. The choice is made when the session first needs a connection, i.e.
+    after authentication has put the user id on request.state, and is kept
+    for the rest of the session.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if "bind" not in self.info:
+            request: Optional[Request] = self.info.get("request")
+            user_id = getattr(request.state, "user_id", None) if request is not None else None
+            sticky = user_id is not None and recent_writers.get(user_id) is not None
+            target = engine if replica_engine is None or sticky else replica_engine
+            self.info["bind"] = target.sync_engine.execution_options(postgresql_readonly=True)
+        return self.info["bind"]
+
+
+ReadSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=ReadSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
+
 class Base(DeclarativeBase):
     """Base class for all SQLAlchemy models."""
     pass
@@ -37,9 +194,79 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.rollback()
             raise
         finally:
+            await wait_for_hooks(session)
             await session.close()
 
 
+async def get_session_factory() -> async_sessionmaker:
+    """Dependency to get the session factory.
+
+    For services that fan independent read queries out over several pooled
+    connections instead of the single request session.
+    """
+    return AsyncSessionLocal
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get a read-only session for GET requests (see ReadSession).
+
+    FastAPI closes the session only after the response has been serialized,
+    so endpoints call release_read_session once their last query is done.
+    """
+    async with ReadSessionLocal(info={"request": request}) as session:
+        yield session
+
+
+async def release_read_session(session: AsyncSession) -> None:
+    """End a read session's transaction, returning its connection to the pool.
+
+    For GET endpoints to call after their last query, so the connection is
+    not held while the response is serialized. Read sessions do not expire
+    on commit, so everything already loaded stays readable; a later query
+    would simply check a connection out again. Does nothing for other
+    sessions, whose commit belongs to get_db.
+    """
+    if isinstance(session.sync_session, ReadSession):
+        await session.commit()
+
+
+async def get_read_session_factory() -> async_sessionmaker:
+    """Dependency to get the session factory for replica reads.
+
+    Sessions from it carry no request, so they always use the replica (when
+    configured); callers that must see the latest writes use get_session_factory.
+    """
+    return ReadSessionLocal
+
+
+async def warm_up_pool(target: AsyncEngine = engine, connections: Optional[int] = None) -> int:
+    """Open pool connections ahead of the first requests. Called from the app lifespan.
+
+    Opens DB_POOL_SIZE connections at once (or connections, if given) and
+    returns them to the pool. Failures, and connections not open within
+    DB_POOL_WARMUP_TIMEOUT_SECONDS, are logged, not raised, so the API still
+    starts while the database is unreachable or hangs. Returns how many opened.
+    """
+    count = settings.DB_POOL_SIZE if connections is None else connections
+    timeout = settings.DB_POOL_WARMUP_TIMEOUT_SECONDS
+    # Time out each connection rather than the whole gather, so the ones
+    # that did open are still returned to the pool
+    results = await asyncio.gather(
+        *(asyncio.wait_for(target.connect().start(), timeout) for _ in range(count)),
+        return_exceptions=True,
+    )
+    opened = [conn for conn in results if not isinstance(conn, BaseException)]
+    for conn in opened:
+        await conn.close()
+    if len(opened) < count:
+        error = next(r for r in results if isinstance(r, BaseException))
+        reason = f"timed out after {timeout}s" if isinstance(error, asyncio.TimeoutError) else str(error)
+        logger.warning("Pool warm-up opened %d of %d connections: %s", len(opened), count, reason)
+    else:
+        logger.info("Pool warm-up opened %d connections", len(opened))
+    return len(opened)
+
+
 async def init_db() -> None:
     """Initialize database tables."""
     async with engine.begin() as conn:
@@ -1,102 +1,275 @@
+import atexit
+import copy
+import json
 import logging
+import queue
+import random
+import re
 import time
-import json
-from typing import Set
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Set, TextIO, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utility.config import settings
 
 
 # Sensitive fields to mask in request body logs
 SENSITIVE_FIELDS: Set[str] = {"password", "password_hash", "secret_key", "access_token"}
 
+# Bodies of these types are logged (up to LOG_BODY_MAX_BYTES); anything else,
+# e.g. multipart uploads or binary files, only by content type and length
+_JSON_TYPES = ("application/json",)
+_FORM_TYPES = ("application/x-www-form-urlencoded",)
+_BODY_METHODS = {"POST", "PUT", "PATCH"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log shippers."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _SamplingFilter(logging.Filter):
+    """Keep only a fraction of INFO-and-below records from chatty loggers.
+
+    rates maps logger name prefixes to the share of records kept; the longest
+    matching prefix applies. Warnings and errors are never dropped.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._by_logger: Dict[str, Optional[float]] = {}
+
+    def _rate(self, name: str) -> Optional[float]:
+        if name not in self._by_logger:
+            prefixes = [p for p in self.rates if name == p or name.startswith(p + ".")]
+            self._by_logger[name] = self.rates[max(prefixes, key=len)] if prefixes else None
+        return self._by_logger[name]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        rate = self._rate(record.name)
+        return rate is None or random.random() < rate
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+
+    The stock prepare() formats the whole record on the calling thread;
+    here only the message arguments are merged (so later mutation of an
+    argument cannot change the line), and timestamps, JSON encoding and
+    tracebacks are rendered off the event loop.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(debug: bool = False, stream: Optional[TextIO] = None) -> None:
+    """Configure application-wide logging.
+
+    Records are put on an in-memory queue and written to stream (stderr by
+    default) by a background QueueListener thread, so log I/O never blocks
+    the event loop. LOG_FORMAT selects text or JSON lines; LOG_SAMPLE_RATES
+    thins out INFO lines of the given loggers before they are queued.
+    """
+    global _listener
+    shutdown_logging()
 
-def setup_logging(debug: bool = False) -> None:
-    """Configure application-wide logging."""
     log_level = logging.DEBUG if debug else logging.INFO
 
-    logging.basicConfig(
-        level=log_level,
-        format="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
+    output = logging.StreamHandler(stream)
+    if settings.LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter(
+            "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        ))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    handler = _DeferredQueueHandler(log_queue)
+    if settings.LOG_SAMPLE_RATES:
+        handler.addFilter(_SamplingFilter(settings.LOG_SAMPLE_RATES))
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(log_level)
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
 
     # Quiet noisy third-party loggers
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 
 
-def _mask_sensitive(data: dict) -> dict:
-    """Return a copy of data with sensitive field values replaced by '***'."""
-    masked = {}
-    for key, value in data.items():
-        if key.lower() in SENSITIVE_FIELDS:
-            masked[key] = "***"
-        elif isinstance(value, dict):
-            masked[key] = _mask_sensitive(value)
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+def _masking_patterns() -> Tuple["re.Pattern[str]", "re.Pattern[str]"]:
+    fields = "|".join(re.escape(field) for field in sorted(SENSITIVE_FIELDS))
+    # A JSON member or form pair whose value may be cut short by the capture limit
+    json_pattern = re.compile(
+        rf'("(?:{fields})"\s*:\s*)(?:"(?:[^"\\]|\\.)*"?|[^,}}\]\s]*)', re.IGNORECASE,
+    )
+    form_pattern = re.compile(rf"((?:^|&)(?:{fields})=)[^&]*", re.IGNORECASE)
+    return json_pattern, form_pattern
+
+
+_JSON_MASK, _FORM_MASK = _masking_patterns()
+
+
+def _mask_body(text: str, media_type: str) -> str:
+    """Mask sensitive values in a JSON, form or text body.
+
+    Works on the raw text rather than a parsed document, so a body truncated
+    at the capture limit is masked as reliably as a complete one.
+    """
+    if media_type not in _FORM_TYPES:
+        text = _JSON_MASK.sub(r'\1"***"', text)
+    if media_type not in _JSON_TYPES:
+        text = _FORM_MASK.sub(r"\1***", text)
+    return text
+
+
+def _is_textual(media_type: str) -> bool:
+    return (
+        media_type in _JSON_TYPES
+        or media_type in _FORM_TYPES
+        or media_type.startswith("text/")
+        or media_type.endswith("+json")
+    )
+
+
+class _BodyCapture:
+    """Receive wrapper that keeps the first limit bytes of the request body
+    as the application reads it, and logs them once the body is complete."""
+
+    __slots__ = ("receive", "logger", "media_type", "limit", "captured", "size", "done")
+
+    def __init__(self, receive: Receive, logger: logging.Logger, media_type: str, limit: int):
+        self.receive = receive
+        self.logger = logger
+        self.media_type = media_type
+        self.limit = limit
+        self.captured = bytearray()
+        self.size = 0
+        self.done = False
+
+    async def __call__(self) -> Message:
+        message = await self.receive()
+        if message["type"] == "http.request" and not self.done:
+            body = message.get("body", b"")
+            self.size += len(body)
+            room = self.limit - len(self.captured)
+            if room > 0 and body:
+                self.captured += body[:room]
+            if not message.get("more_body", False):
+                self.log()
+        return message
+
+    def log(self) -> None:
+        """Log what was captured. Also called at the end of the request in
+        case the application never read the whole body."""
+        if self.done:
+            return
+        self.done = True
+        if not self.size:
+            return
+        text = _mask_body(self.captured.decode("utf-8", errors="replace"), self.media_type)
+        if self.size > len(self.captured):
+            self.logger.info("  Body: %s... (%d bytes)", text, self.size)
         else:
-            masked[key] = value
-    return masked
+            self.logger.info("  Body: %s", text)
+
 
+class RequestLoggingMiddleware:
+    """Middleware that logs every request and response.
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware that logs every request and response."""
+    A plain ASGI middleware: the request body is not buffered up front but
+    observed as the endpoint reads it, keeping at most max_body_bytes of
+    JSON, form or text bodies. Multipart uploads and other binary bodies are
+    logged by content type and length only.
+    """
 
-    def __init__(self, app):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, max_body_bytes: Optional[int] = None):
+        self.app = app
+        self.max_body_bytes = settings.LOG_BODY_MAX_BYTES if max_body_bytes is None else max_body_bytes
         self.logger = logging.getLogger("medbase.request")
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        start = time.time()
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.logger.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
 
-        # --- Log request ---
-        method = request.method
-        path = request.url.path
-        query = str(request.query_params) if request.query_params else ""
-        url_display = f"{path}?{query}" if query else path
+        start = time.perf_counter()
 
-        self.logger.info("→ %s %s", method, url_display)
+        # --- Log request ---
+        method = scope["method"]
+        path = scope["path"]
+        query = scope.get("query_string", b"").decode("latin-1")
+        self.logger.info("→ %s %s", method, f"{path}?{query}" if query else path)
 
         # Log body for mutating methods
-        if method in ("POST", "PUT", "PATCH"):
-            try:
-                body_bytes = await request.body()
-                if body_bytes:
-                    # Try JSON first
-                    try:
-                        body_json = json.loads(body_bytes)
-                        masked = _mask_sensitive(body_json)
-                        self.logger.info("  Body: %s", json.dumps(masked))
-                    except (json.JSONDecodeError, UnicodeDecodeError):
-                        # Form data — parse it manually
-                        body_text = body_bytes.decode("utf-8", errors="replace")
-                        # Mask password in form data (key=value&key=value)
-                        parts = body_text.split("&")
-                        masked_parts = []
-                        for part in parts:
-                            if "=" in part:
-                                k, _v = part.split("=", 1)
-                                if k.lower() in SENSITIVE_FIELDS:
-                                    masked_parts.append(f"{k}=***")
-                                else:
-                                    masked_parts.append(part)
-                            else:
-                                masked_parts.append(part)
-                        self.logger.info("  Body: %s", "&".join(masked_parts))
-            except Exception:
-                self.logger.debug("  Body: <unreadable>")
+        capture = None
+        if method in _BODY_METHODS:
+            content_type = content_length = None
+            for name, value in scope["headers"]:
+                if name == b"content-type":
+                    content_type = value.decode("latin-1")
+                elif name == b"content-length":
+                    content_length = value.decode("latin-1")
+            media_type = (content_type or "").split(";", 1)[0].strip().lower()
+
+            if _is_textual(media_type) and self.max_body_bytes > 0:
+                capture = _BodyCapture(receive, self.logger, media_type, self.max_body_bytes)
+                receive = capture
+            elif media_type and content_length != "0":
+                self.logger.info("  Body: <%s, %s bytes>", media_type, content_length or "unknown")
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
         # --- Call the actual endpoint ---
-        response = await call_next(request)
-
-        # --- Log response ---
-        duration_ms = (time.time() - start) * 1000
-        self.logger.info(
-            "← %s %s %d (%.0fms)",
-            method,
-            path,
-            response.status_code,
-            duration_ms,
-        )
-
-        return response
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if capture is not None:
+                capture.log()
+
+            # --- Log response ---
+            duration_ms = (time.perf_counter() - start) * 1000
+            self.logger.info("← %s %s %d (%.0fms)", method, path, status_code, duration_ms)
@@ -0,0 +1,286 @@
+import asyncio
+import bisect
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utility.config import settings
+
+logger = logging.getLogger("medbase.utility.metrics")
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+class _Metric(ABC):
+    """A named family of samples, one series per combination of label values."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if labels.keys() != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues, extra: Iterable[Tuple[str, str]] = ()) -> str:
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Exposition lines for every series, without the HELP/TYPE header."""
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}", *self.samples()]
+
+
+class Gauge(_Metric):
+    """A value that goes up and down, set directly or read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._functions: Dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float], **labels: str) -> None:
+        """Report function() as the value of this series whenever metrics are scraped."""
+        with self._lock:
+            self._functions[self._key(labels)] = function
+
+    def value(self, **labels: str) -> float:
+        key = self._key(labels)
+        function = self._functions.get(key)
+        return function() if function else self._values.get(key, 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        for key, function in functions.items():
+            try:
+                values[key] = function()
+            except Exception as e:
+                logger.warning("Failed to read gauge %s%s: %s", self.name, self._labels(key), str(e))
+        return [f"{self.name}{self._labels(key)} {_format_value(value)}" for key, value in sorted(values.items())]
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, with their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: [count per bucket (+Inf last), sum]
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            snapshot = {key: (list(counts), total[0]) for key, (counts, total) in self._series.items()}
+        lines = []
+        for key, (counts, total) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{self._labels(key, [('le', _format_value(bound))])} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._labels(key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """In-process collection of metrics rendered together for /metrics.
+
+    Each uvicorn worker has its own registry, so each scrape reports the
+    worker that served it.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_DURATION: Histogram = REGISTRY.register(Histogram(
+    "medbase_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+))
+HTTP_REQUESTS_IN_FLIGHT: Gauge = REGISTRY.register(Gauge(
+    "medbase_http_requests_in_flight",
+    "HTTP requests currently being handled.",
+))
+HTTP_REQUESTS_IN_FLIGHT.set(0)
+DB_POOL_SIZE: Gauge = REGISTRY.register(Gauge(
+    "medbase_db_pool_size", "Configured connection pool size.", ["pool"],
+))
+DB_POOL_CHECKED_OUT: Gauge = REGISTRY.register(Gauge(
+    "medbase_db_pool_checked_out", "Connections currently checked out of the pool.", ["pool"],
+))
+DB_POOL_OVERFLOW: Gauge = REGISTRY.register(Gauge(
+    "medbase_db_pool_overflow", "Connections open beyond the pool size (negative while below it).", ["pool"],
+))
+DB_POOL_WAIT: Histogram = REGISTRY.register(Histogram(
+    "medbase_db_pool_wait_seconds",
+    "Time to obtain a pooled connection, including opening a new one.",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+))
+STORAGE_REQUEST_DURATION: Histogram = REGISTRY.register(Histogram(
+    "medbase_storage_request_duration_seconds",
+    "Object storage API call latency.",
+    ["operation"],
+))
+EVENT_LOOP_LAG: Histogram = REGISTRY.register(Histogram(
+    "medbase_event_loop_lag_seconds",
+    "How late the event loop ran a timer scheduled every EVENT_LOOP_LAG_INTERVAL_SECONDS.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+))
+
+
+def track_pool(name: str, pool) -> None:
+    """Report an engine pool's size, checked-out and overflow counts as gauges."""
+    DB_POOL_SIZE.set_function(pool.size, pool=name)
+    DB_POOL_CHECKED_OUT.set_function(pool.checkedout, pool=name)
+    DB_POOL_OVERFLOW.set_function(pool.overflow, pool=name)
+
+
+class MetricsMiddleware:
+    """Time every HTTP request into HTTP_REQUEST_DURATION and count requests in flight.
+
+    Requests are labelled by route template (e.g. ``/api/v1/patients/{patient_id}``)
+    so ids do not create a series each; unmatched paths share one label.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "<unmatched>"),
+                status=str(status_code),
+            )
+
+
+_loop_monitor: Optional[asyncio.Task] = None
+
+
+async def _monitor_event_loop(interval: float) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - expected))
+
+
+def start_loop_monitor() -> None:
+    """Start sampling event-loop lag. Called from the app lifespan."""
+    global _loop_monitor
+    if _loop_monitor is None and settings.EVENT_LOOP_LAG_INTERVAL_SECONDS > 0:
+        _loop_monitor = asyncio.get_running_loop().create_task(
+            _monitor_event_loop(settings.EVENT_LOOP_LAG_INTERVAL_SECONDS)
+        )
+
+
+async def stop_loop_monitor() -> None:
+    """Stop the event-loop lag sampler."""
+    global _loop_monitor
+    if _loop_monitor is not None:
+        _loop_monitor.cancel()
+        try:
+            await _loop_monitor
+        except asyncio.CancelledError:
+            pass
+        _loop_monitor = None
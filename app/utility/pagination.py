@@ -0,0 +1,256 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import Select, Table, select, func, text, tuple_, or_, and_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable, Label
+
+from app.schema.base import CountMode
+from app.utility.cache import count_cache
+from app.utility.config import settings
+
+_CURSOR_SORT = "_cursor_sort"
+_CURSOR_ID = "_cursor_id"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded or does not match the request."""
+
+
+@dataclass
+class PageInfo:
+    """Pagination metadata returned alongside a page of rows."""
+
+    total: Optional[int]
+    next_cursor: Optional[str] = None
+    count_strategy: CountMode = CountMode.EXACT
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _decode_value(value: Any, column) -> Any:
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is Decimal:
+        return Decimal(value)
+    return value
+
+
+def encode_cursor(sort_key: str, order: str, sort_value: Any, row_id: int) -> str:
+    """Build an opaque cursor pointing just after (sort_value, row_id)."""
+    raw = json.dumps([sort_key, order, _encode_value(sort_value), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str, order: str, sort_column) -> Tuple[Any, int]:
+    """Decode a cursor into (sort_value, row_id), checking it was issued for this sort."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, cursor_order, value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        value = _decode_value(value, sort_column)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+    if cursor_sort != sort_key or cursor_order != order or not isinstance(row_id, int):
+        raise InvalidCursorError("Cursor does not match the requested sort and order")
+    return value, row_id
+
+
+class _Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON) <select>`` with the select's own bind parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def _exact_count(db: AsyncSession, counted: Select) -> int:
+    result = await db.execute(select(func.count()).select_from(counted.subquery()))
+    return result.scalar()
+
+
+async def _estimated_count(db: AsyncSession, counted: Select) -> int:
+    """Planner row estimate for the filtered query; no rows are read."""
+    result = await db.execute(_Explain(counted))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _unfiltered_table(counted: Select) -> Optional[Table]:
+    """The table whose every row ``counted`` returns, or None if it filters, joins or groups."""
+    froms = counted.get_final_froms()
+    if (
+        counted.whereclause is not None
+        or len(froms) != 1
+        or not isinstance(froms[0], Table)
+        or counted._group_by_clauses
+        or counted._having_criteria
+        or counted._distinct
+        or counted._limit_clause is not None
+        or counted._offset_clause is not None
+    ):
+        return None
+    return froms[0]
+
+
+async def _table_estimate(db: AsyncSession, table: Table) -> Optional[int]:
+    """Row count kept in pg_class by autovacuum/ANALYZE; None if never gathered."""
+    result = await db.execute(
+        text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:name)"), {"name": table.fullname},
+    )
+    estimate = result.scalar()
+    return int(estimate) if estimate is not None and estimate >= 0 else None
+
+
+def _count_key(counted: Select) -> Tuple[str, str]:
+    """Filter signature: the compiled SQL plus its bound values."""
+    compiled = counted.compile(dialect=postgresql.dialect())
+    return compiled.string, repr(sorted(compiled.params.items()))
+
+
+async def count_rows(db: AsyncSession, counted: Select, mode: CountMode) -> Tuple[Optional[int], CountMode]:
+    """Total rows of ``counted`` using the requested strategy.
+
+    Returns ``(total, strategy_used)``. ``estimated`` reads the table's
+    pg_class.reltuples when ``counted`` has no filter, and asks the planner
+    (EXPLAIN) otherwise; it falls back to an exact count when that expects
+    fewer than COUNT_ESTIMATE_THRESHOLD rows, where counting is cheap and
+    estimates are least reliable. ``cached`` reports ``exact`` on a miss
+    (the value was just counted).
+    """
+    if mode == CountMode.NONE:
+        return None, CountMode.NONE
+
+    if mode == CountMode.ESTIMATED:
+        table = _unfiltered_table(counted)
+        estimate = await _table_estimate(db, table) if table is not None else None
+        if estimate is None:
+            estimate = await _estimated_count(db, counted)
+        if estimate >= settings.COUNT_ESTIMATE_THRESHOLD:
+            return estimate, CountMode.ESTIMATED
+        return await _exact_count(db, counted), CountMode.EXACT
+
+    if mode == CountMode.CACHED and count_cache.enabled:
+        key = _count_key(counted)
+        total = count_cache.get(key)
+        if total is not None:
+            return total, CountMode.CACHED
+        total = await _exact_count(db, counted)
+        count_cache.set(key, total)
+        return total, CountMode.EXACT
+
+    return await _exact_count(db, counted), CountMode.EXACT
+
+
+def _seek_predicate(sort_column, id_column, descending: bool, value: Any, row_id: int):
+    """Rows strictly after (value, row_id) in (sort_column, id_column) order.
+
+    PostgreSQL sorts NULLs last ascending and first descending, so a NULL
+    sort value is handled explicitly rather than through the row comparison.
+    """
+    if sort_column is id_column:
+        return id_column < row_id if descending else id_column > row_id
+
+    if descending:
+        if value is None:
+            return or_(
+                and_(sort_column.is_(None), id_column < row_id),
+                sort_column.is_not(None),
+            )
+        return tuple_(sort_column, id_column) < tuple_(value, row_id)
+
+    if value is None:
+        return and_(sort_column.is_(None), id_column > row_id)
+    return or_(
+        tuple_(sort_column, id_column) > tuple_(value, row_id),
+        sort_column.is_(None),
+    )
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    sort_column,
+    id_column,
+    page: int = 1,
+    size: int = 10,
+    order: str = "asc",
+    cursor: Optional[str] = None,
+    count: CountMode = CountMode.EXACT,
+    count_query: Optional[Select] = None,
+) -> Tuple[List[Any], PageInfo]:
+    """Sort, count and fetch one page of a filtered query.
+
+    Page mode uses OFFSET; when a cursor is given it seeks with
+    ``WHERE (sort_column, id) > (...)`` instead and ``page`` is ignored.
+    Either way the returned ``next_cursor`` continues after the last row.
+
+    Rows are returned as fetched, with two trailing cursor columns appended,
+    so positional access (``row[0]``, ``row[1]``...) is unaffected.
+
+    Args:
+        query: Filtered select without ORDER BY / LIMIT.
+        sort_column: Column to sort by; ``id_column`` breaks ties. A labeled
+            expression may be given, its label names the sort in cursors.
+        count: Count strategy for ``total`` (see ``count_rows``).
+        count_query: Optional select whose rows are counted instead of ``query``.
+    """
+    counted = count_query if count_query is not None else query
+    total, count_strategy = await count_rows(db, counted, count)
+
+    descending = order.lower() == "desc"
+    order_key = "desc" if descending else "asc"
+    sort_key = sort_column.key
+    if isinstance(sort_column, Label):
+        sort_column = sort_column.element
+
+    if cursor:
+        value, row_id = decode_cursor(cursor, sort_key, order_key, sort_column)
+        query = query.where(_seek_predicate(sort_column, id_column, descending, value, row_id))
+
+    columns = [id_column] if sort_column is id_column else [sort_column, id_column]
+    query = query.order_by(*(c.desc() if descending else c.asc() for c in columns))
+    query = query.add_columns(sort_column.label(_CURSOR_SORT), id_column.label(_CURSOR_ID))
+
+    if not cursor:
+        query = query.offset((page - 1) * size)
+    # One extra row tells us whether there is a next page
+    query = query.limit(size + 1)
+
+    result = await db.execute(query)
+    rows = list(result.all())
+
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort_key, order_key, last[-2], last[-1])
+
+    return rows, PageInfo(total=total, next_cursor=next_cursor, count_strategy=count_strategy)
@@ -0,0 +1,130 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utility.config import settings
+
+logger = logging.getLogger("medbase.utility.query_stats")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryStats:
+    """SQL statements run while handling one request."""
+
+    __slots__ = ("count", "total_seconds", "slowest_seconds", "slowest_statement", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+        # Statements are parameterized, so equal text means the same query shape
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.shapes[statement] += 1
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def server_timing(self) -> str:
+        """Server-Timing header value: total DB time with the query count, and the slowest query."""
+        return (
+            f'db;dur={self.total_seconds * 1000:.2f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest_seconds * 1000:.2f}"
+        )
+
+    def repeated(self, threshold: int):
+        """(statement, count) for shapes run more than threshold times, most frequent first."""
+        return [(statement, n) for statement, n in self.shapes.most_common() if n > threshold]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_stats() -> Optional[QueryStats]:
+    """Stats of the request being handled, or None outside a request."""
+    return _current.get()
+
+
+def _shorten(statement: str, limit: int = 300) -> str:
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None and conn.info.get("query_start"):
+        stats.record(statement, time.perf_counter() - conn.info["query_start"].pop())
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Time every statement engine runs into the current request's QueryStats."""
+    sync_engine: Engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """Collect SQL statistics per request.
+
+    Adds a Server-Timing header with the query count, total DB time and the
+    slowest query's duration, and logs a warning when one statement shape
+    runs more than N_PLUS_ONE_THRESHOLD times in a request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.QUERY_STATS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and stats.count:
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            self._report(scope, stats)
+
+    @staticmethod
+    def _report(scope: Scope, stats: QueryStats) -> None:
+        if not stats.count:
+            return
+        method, path = scope["method"], scope["path"]
+        logger.debug(
+            "%s %s ran %d queries in %.1fms, slowest %.1fms: %s",
+            method, path, stats.count, stats.total_seconds * 1000,
+            stats.slowest_seconds * 1000, _shorten(stats.slowest_statement),
+        )
+        threshold = settings.N_PLUS_ONE_THRESHOLD
+        if threshold > 0:
+            for statement, n in stats.repeated(threshold):
+                logger.warning("Possible N+1 in %s %s: statement ran %d times: %s", method, path, n, _shorten(statement))
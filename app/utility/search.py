@@ -0,0 +1,35 @@
+from sqlalchemy import case, func, or_
+
+# Sort value accepted by list endpoints that support ranked search
+RELEVANCE = "relevance"
+
+
+def search_filter(term: str, *columns):
+    """Case-insensitive substring match of term against any of columns.
+
+    Served by the pg_trgm GIN indexes (migration f6a7b8c9d0e1) for terms of
+    three or more characters.
+    """
+    pattern = f"%{term}%"
+    return or_(*(column.ilike(pattern) for column in columns))
+
+
+def search_rank(term: str, *columns):
+    """Relevance of a row for term: the best match across columns, labeled
+    ``relevance`` so it can be passed to ``paginate`` as the sort column.
+
+    4 = whole value equals term, 3 = value starts with term,
+    2 = a word in the value starts with term, 1 = substring match.
+    """
+    scores = [
+        case(
+            (func.lower(column) == term.lower(), 4),
+            (column.ilike(f"{term}%"), 3),
+            (column.ilike(f"% {term}%"), 2),
+            (column.ilike(f"%{term}%"), 1),
+            else_=0,
+        )
+        for column in columns
+    ]
+    rank = func.greatest(*scores) if len(scores) > 1 else scores[0]
+    return rank.label(RELEVANCE)
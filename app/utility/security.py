@@ -1,13 +1,28 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.utility.config import settings
 
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing. Hashes made with any other cost factor need an update,
+# so changing BCRYPT_ROUNDS rehashes each password at its owner's next login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL, so hashing in these threads keeps the event loop
+# free; the bound caps how many cores concurrent logins can take
+_hash_pool = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash",
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -20,6 +35,22 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def hash_password(password: str) -> str:
+    """Hash a password in the password hashing thread pool."""
+    return await asyncio.get_running_loop().run_in_executor(_hash_pool, get_password_hash, password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password in the password hashing thread pool.
+
+    Returns (valid, new_hash); new_hash is set when the password is valid
+    but hashed_password does not use the current cost factor.
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        _hash_pool, pwd_context.verify_and_update, plain_password, hashed_password,
+    )
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -1,83 +1,645 @@
+import asyncio
+import base64
+import functools
+import hashlib
+import hmac
 import logging
 import os
+import time
+from abc import ABC, abstractmethod
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, urlencode
 
 import aioboto3
+import botocore.session
 from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from app.utility.config import settings
+from app.utility.metrics import STORAGE_REQUEST_DURATION
 
 logger = logging.getLogger("medbase.utility.storage")
 
-BUCKET_NAME = os.getenv("LIGHTSAIL_BUCKET_NAME", "")
-ACCESS_KEY = os.getenv("LIGHTSAIL_ACCESS_KEY", "")
-SECRET_KEY = os.getenv("LIGHTSAIL_SECRET_KEY", "")
-ENDPOINT = os.getenv("LIGHTSAIL_ENDPOINT", "")
-REGION = os.getenv("LIGHTSAIL_REGION", "")
+S3_CONFIG = Config(signature_version="s3v4", max_pool_connections=20)
+
+# Streaming uploads: part size (S3 minimum is 5 MiB) and parts in flight per
+# upload. Peak memory per upload is about MULTIPART_CHUNK_SIZE * (MULTIPART_CONCURRENCY + 1).
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+MULTIPART_CONCURRENCY = 4
+
+# Server-side copies: copy_object takes objects up to 5 GiB, larger ones are
+# copied in COPY_PART_SIZE byte ranges with upload_part_copy
+MAX_COPY_OBJECT_BYTES = 5 * 1024 * 1024 * 1024
+COPY_PART_SIZE = 512 * 1024 * 1024
+
+
+@dataclass
+class UploadResult:
+    """Outcome of a streamed upload."""
+
+    key: str
+    size: int
+    sha256: str
+
+
+class _HashingReader:
+    """Pulls full parts from read(n), tracking size and SHA-256 as it goes."""
+
+    def __init__(self, read: Callable[[int], Awaitable[bytes]]):
+        self.read = read
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    async def next_chunk(self) -> bytes:
+        """Read one full part (shorter only at end of file)."""
+        chunk = b""
+        while len(chunk) < MULTIPART_CHUNK_SIZE:
+            piece = await self.read(MULTIPART_CHUNK_SIZE - len(chunk))
+            if not piece:
+                break
+            chunk += piece
+        if chunk:
+            # hashlib releases the GIL on large buffers
+            await asyncio.to_thread(self.digest.update, chunk)
+            self.size += len(chunk)
+        return chunk
+
+    def result(self, key: str) -> UploadResult:
+        return UploadResult(key=key, size=self.size, sha256=self.digest.hexdigest())
+
+
+class StorageBackend(ABC):
+    """Where patient document files are kept.
+
+    Keys are relative paths such as ``objects/{sha256}.pdf``; download
+    URLs are presigned so clients fetch files without an API token.
+    """
+
+    async def open(self) -> None:
+        """Acquire long-lived resources. Called from the app lifespan."""
+
+    async def close(self) -> None:
+        """Release resources acquired by open()."""
+
+    @abstractmethod
+    def presign(self, key: str, expires_in: int, download_filename: str = "") -> str:
+        """Return a time-limited download URL for key."""
+
+    @abstractmethod
+    def presign_upload(
+        self, key: str, expires_in: int, content_type: str, size: int, sha256: str,
+    ) -> Tuple[str, Dict[str, str]]:
+        """Return a time-limited PUT URL for key and the headers the client must send.
+
+        The upload is only accepted if its content matches size and sha256.
+        """
+
+    @abstractmethod
+    async def stat(self, key: str) -> Optional[UploadResult]:
+        """Size and SHA-256 of the stored object, or None if key does not exist."""
+
+    @abstractmethod
+    async def read(self, key: str, max_bytes: int) -> Optional[bytes]:
+        """Content of key, or None if it does not exist or is larger than max_bytes."""
+
+    @abstractmethod
+    async def put(self, key: str, content: bytes, content_type: str) -> None:
+        """Store content under key."""
+
+    @abstractmethod
+    async def upload_stream(
+        self, key: str, read: Callable[[int], Awaitable[bytes]], content_type: str,
+    ) -> UploadResult:
+        """Store the content returned by read(n) under key without buffering it whole."""
+
+    @abstractmethod
+    async def move(self, source: str, destination: str) -> None:
+        """Rename source to destination, replacing any object already there."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove key. Missing keys are not an error."""
+
+
+class S3Backend(StorageBackend):
+    """Lightsail (S3-compatible) object storage."""
+
+    def __init__(self, bucket: str, access_key: str, secret_key: str, endpoint: str, region: str):
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.endpoint = endpoint
+        self.region = region
+        # Shared async client, opened by the app lifespan (or lazily on first use)
+        self._client = None
+        self._client_stack: Optional[AsyncExitStack] = None
+        self._client_lock = asyncio.Lock()
+
+    def _client_kwargs(self) -> dict:
+        """Connection settings for the bucket.
+
+        Uses LIGHTSAIL_ENDPOINT as the S3-compatible endpoint URL, matching
+        the configuration used by the test script.
+        """
+        endpoint = self.endpoint
+        endpoint_url = f"https://{endpoint}" if endpoint and not endpoint.startswith("http") else endpoint
+        kwargs = {
+            "region_name": self.region,
+            "aws_access_key_id": self.access_key,
+            "aws_secret_access_key": self.secret_key,
+            "config": S3_CONFIG,
+        }
+        if endpoint_url:
+            kwargs["endpoint_url"] = endpoint_url
+        return kwargs
 
-S3_CONFIG = Config(signature_version="s3v4")
+    async def open(self) -> None:
+        """Open the shared S3 client (skipped while no bucket is configured)."""
+        if not self.bucket:
+            return
+        async with self._client_lock:
+            if self._client is not None:
+                return
+            stack = AsyncExitStack()
+            self._client = await stack.enter_async_context(
+                aioboto3.Session().client("s3", **self._client_kwargs())
+            )
+            self._client_stack = stack
+        logger.info("Opened shared S3 client for bucket='%s'", self.bucket)
 
+    async def close(self) -> None:
+        """Close the shared S3 client and its connection pool."""
+        async with self._client_lock:
+            if self._client_stack is None:
+                return
+            await self._client_stack.aclose()
+            self._client, self._client_stack = None, None
+        logger.info("Closed shared S3 client")
 
-def _s3_client():
-    """Create an async S3 client for Lightsail object storage.
+    async def _s3(self):
+        """Return the shared async S3 client, opening it if the lifespan has not."""
+        if self._client is None:
+            await self.open()
+        return self._client
 
-    Uses the LIGHTSAIL_ENDPOINT env var as the S3-compatible endpoint URL,
-    matching the configuration used by the test script.
+    async def _call(self, operation: str, **params):
+        """Run one S3 API call on the shared client, recording its latency."""
+        s3 = await self._s3()
+        start = time.perf_counter()
+        try:
+            return await getattr(s3, operation)(**params)
+        finally:
+            STORAGE_REQUEST_DURATION.observe(time.perf_counter() - start, operation=operation)
+
+    @functools.cached_property
+    def _signer(self):
+        """Synchronous botocore client used only for presigning.
+
+        Presigning is a local HMAC computation, so a single cached client
+        serves every request without touching the network or the event loop.
+        """
+        return botocore.session.get_session().create_client("s3", **self._client_kwargs())
+
+    def presign(self, key: str, expires_in: int, download_filename: str = "") -> str:
+        params = {"Bucket": self.bucket, "Key": key}
+        if download_filename:
+            params["ResponseContentDisposition"] = f'attachment; filename="{download_filename}"'
+        return self._signer.generate_presigned_url("get_object", Params=params, ExpiresIn=expires_in)
+
+    def presign_upload(
+        self, key: str, expires_in: int, content_type: str, size: int, sha256: str,
+    ) -> Tuple[str, Dict[str, str]]:
+        """Presign a put_object whose SHA-256 checksum header is part of the signature,
+        so the bucket itself rejects content that does not match."""
+        checksum = base64.b64encode(bytes.fromhex(sha256)).decode()
+        url = self._signer.generate_presigned_url(
+            "put_object",
+            Params={
+                "Bucket": self.bucket, "Key": key, "ContentType": content_type,
+                "ContentLength": size, "ChecksumSHA256": checksum,
+            },
+            ExpiresIn=expires_in,
+        )
+        return url, {"Content-Type": content_type, "x-amz-checksum-sha256": checksum}
+
+    async def stat(self, key: str) -> Optional[UploadResult]:
+        try:
+            head = await self._call("head_object", Bucket=self.bucket, Key=key, ChecksumMode="ENABLED")
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        checksum = head.get("ChecksumSHA256", "")
+        sha256 = base64.b64decode(checksum).hex() if checksum else ""
+        return UploadResult(key=key, size=head["ContentLength"], sha256=sha256)
+
+    async def read(self, key: str, max_bytes: int) -> Optional[bytes]:
+        try:
+            response = await self._call("get_object", Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        async with response["Body"] as body:
+            if response["ContentLength"] > max_bytes:
+                return None
+            return await body.read()
+
+    async def put(self, key: str, content: bytes, content_type: str) -> None:
+        await self._call("put_object", Bucket=self.bucket, Key=key, Body=content, ContentType=content_type)
+        logger.info("Uploaded file key='%s' to bucket='%s'", key, self.bucket)
+
+    async def upload_stream(
+        self, key: str, read: Callable[[int], Awaitable[bytes]], content_type: str,
+    ) -> UploadResult:
+        """Upload in MULTIPART_CHUNK_SIZE parts, at most MULTIPART_CONCURRENCY in flight.
+
+        Files that fit in one part are sent with a single put_object. A
+        failed multipart upload is aborted so no orphaned parts are left behind.
+        """
+        reader = _HashingReader(read)
+        chunk = await reader.next_chunk()
+        if len(chunk) < MULTIPART_CHUNK_SIZE:
+            await self.put(key, chunk, content_type)
+            return reader.result(key)
+
+        upload = await self._call("create_multipart_upload", Bucket=self.bucket, Key=key, ContentType=content_type)
+        upload_id = upload["UploadId"]
+        slots = asyncio.Semaphore(MULTIPART_CONCURRENCY)
+        parts: List[asyncio.Task] = []
+
+        async def send_part(number: int, body: bytes) -> dict:
+            try:
+                response = await self._call(
+                    "upload_part", Bucket=self.bucket, Key=key, UploadId=upload_id, PartNumber=number, Body=body,
+                )
+                return {"PartNumber": number, "ETag": response["ETag"]}
+            finally:
+                slots.release()
+
+        try:
+            number = 0
+            while chunk:
+                number += 1
+                await slots.acquire()
+                parts.append(asyncio.create_task(send_part(number, chunk)))
+                chunk = await reader.next_chunk()
+            completed = await asyncio.gather(*parts)
+            await self._call(
+                "complete_multipart_upload", Bucket=self.bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": completed},
+            )
+        except BaseException:
+            for task in parts:
+                task.cancel()
+            await asyncio.gather(*parts, return_exceptions=True)
+            try:
+                await self._call("abort_multipart_upload", Bucket=self.bucket, Key=key, UploadId=upload_id)
+            except Exception as e:
+                logger.warning("Failed to abort multipart upload key='%s': %s", key, str(e))
+            logger.warning("Aborted multipart upload key='%s' after %d parts", key, len(parts))
+            raise
+
+        logger.info("Uploaded file key='%s' to bucket='%s' in %d parts size=%d", key, self.bucket, len(parts), reader.size)
+        return reader.result(key)
+
+    async def move(self, source: str, destination: str) -> None:
+        head = await self._call("head_object", Bucket=self.bucket, Key=source)
+        if head["ContentLength"] <= MAX_COPY_OBJECT_BYTES:
+            # Server-side copy that also records the object's SHA-256 checksum
+            await self._call(
+                "copy_object", Bucket=self.bucket, Key=destination,
+                CopySource={"Bucket": self.bucket, "Key": source}, ChecksumAlgorithm="SHA256",
+            )
+        else:
+            await self._copy_in_parts(source, destination, head["ContentLength"], head.get("ContentType"))
+        await self._call("delete_object", Bucket=self.bucket, Key=source)
+        logger.info("Moved file key='%s' to key='%s' in bucket='%s'", source, destination, self.bucket)
+
+    async def _copy_in_parts(self, source: str, destination: str, size: int, content_type: Optional[str]) -> None:
+        """Server-side multipart copy, at most MULTIPART_CONCURRENCY parts in flight.
+
+        Used above copy_object's 5 GiB limit. A failed copy is aborted so no
+        orphaned parts are left behind.
+        """
+        extra = {"ContentType": content_type} if content_type else {}
+        upload = await self._call("create_multipart_upload", Bucket=self.bucket, Key=destination, **extra)
+        upload_id = upload["UploadId"]
+        slots = asyncio.Semaphore(MULTIPART_CONCURRENCY)
+
+        async def copy_part(number: int, start: int) -> dict:
+            async with slots:
+                response = await self._call(
+                    "upload_part_copy", Bucket=self.bucket, Key=destination, UploadId=upload_id, PartNumber=number,
+                    CopySource={"Bucket": self.bucket, "Key": source},
+                    CopySourceRange=f"bytes={start}-{min(start + COPY_PART_SIZE, size) - 1}",
+                )
+                return {"PartNumber": number, "ETag": response["CopyPartResult"]["ETag"]}
+
+        parts = [
+            asyncio.create_task(copy_part(number, start))
+            for number, start in enumerate(range(0, size, COPY_PART_SIZE), start=1)
+        ]
+        try:
+            completed = await asyncio.gather(*parts)
+            await self._call(
+                "complete_multipart_upload", Bucket=self.bucket, Key=destination, UploadId=upload_id,
+                MultipartUpload={"Parts": completed},
+            )
+        except BaseException:
+            for task in parts:
+                task.cancel()
+            await asyncio.gather(*parts, return_exceptions=True)
+            try:
+                await self._call("abort_multipart_upload", Bucket=self.bucket, Key=destination, UploadId=upload_id)
+            except Exception as e:
+                logger.warning("Failed to abort multipart copy key='%s': %s", destination, str(e))
+            raise
+        logger.info("Copied file key='%s' to key='%s' in %d parts size=%d", source, destination, len(parts), size)
+
+    async def delete(self, key: str) -> None:
+        await self._call("delete_object", Bucket=self.bucket, Key=key)
+        logger.info("Deleted file key='%s' from bucket='%s'", key, self.bucket)
+
+
+class LocalBackend(StorageBackend):
+    """Files on local disk, for single-site deployments and offline benchmarks.
+
+    Download URLs point at the ``/files`` route (app.router.files) and carry
+    an HMAC signature over key, expiry and download filename.
     """
-    session = aioboto3.Session()
-    endpoint_url = f"https://{ENDPOINT}" if ENDPOINT and not ENDPOINT.startswith("http") else ENDPOINT
-    kwargs = {
-        "region_name": REGION,
-        "aws_access_key_id": ACCESS_KEY,
-        "aws_secret_access_key": SECRET_KEY,
-        "config": S3_CONFIG,
-    }
-    if endpoint_url:
-        kwargs["endpoint_url"] = endpoint_url
-    return session.client("s3", **kwargs)
+
+    def __init__(self, root: str, base_url: str, secret: str):
+        self.root = Path(root).resolve()
+        self.base_url = base_url.rstrip("/")
+        self.secret = secret.encode()
+
+    def path(self, key: str) -> Path:
+        """Absolute path for key, refusing keys that escape the storage root."""
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root) or path == self.root:
+            raise ValueError(f"Invalid storage key '{key}'")
+        return path
+
+    def _signature(self, method: str, key: str, expires: int, *extra) -> str:
+        message = "\n".join(str(part) for part in (method, key, expires, *extra)).encode()
+        return hmac.new(self.secret, message, hashlib.sha256).hexdigest()
+
+    def _url(self, key: str, query: dict) -> str:
+        return f"{self.base_url}{settings.API_V1_PREFIX}/files/{quote(key)}?{urlencode(query)}"
+
+    def _check(self, signature: str, expected: str, expires: int) -> None:
+        if not hmac.compare_digest(expected, signature):
+            raise ValueError("Invalid signature")
+        if expires < time.time():
+            raise ValueError("URL has expired")
+
+    def presign(self, key: str, expires_in: int, download_filename: str = "") -> str:
+        expires = int(time.time()) + expires_in
+        query = {"expires": expires, "signature": self._signature("GET", key, expires, download_filename)}
+        if download_filename:
+            query["filename"] = download_filename
+        return self._url(key, query)
+
+    def verify(self, key: str, expires: int, signature: str, download_filename: str = "") -> Path:
+        """Check a presigned download URL's parameters and return the file path.
+
+        Raises ValueError if the signature does not match or has expired.
+        """
+        self._check(signature, self._signature("GET", key, expires, download_filename), expires)
+        return self.path(key)
+
+    def presign_upload(
+        self, key: str, expires_in: int, content_type: str, size: int, sha256: str,
+    ) -> Tuple[str, Dict[str, str]]:
+        expires = int(time.time()) + expires_in
+        query = {
+            "expires": expires, "size": size, "sha256": sha256,
+            "signature": self._signature("PUT", key, expires, size, sha256),
+        }
+        return self._url(key, query), {"Content-Type": content_type}
+
+    def verify_upload(self, key: str, expires: int, size: int, sha256: str, signature: str) -> None:
+        """Check a presigned upload URL's parameters.
+
+        Raises ValueError if the signature does not match or has expired.
+        """
+        self._check(signature, self._signature("PUT", key, expires, size, sha256), expires)
+        self.path(key)
+
+    async def stat(self, key: str) -> Optional[UploadResult]:
+        path = self.path(key)
+
+        def digest() -> Optional[UploadResult]:
+            if not path.is_file():
+                return None
+            with open(path, "rb") as handle:
+                sha256 = hashlib.file_digest(handle, "sha256").hexdigest()
+            return UploadResult(key=key, size=path.stat().st_size, sha256=sha256)
+
+        return await asyncio.to_thread(digest)
+
+    async def read(self, key: str, max_bytes: int) -> Optional[bytes]:
+        path = self.path(key)
+
+        def load() -> Optional[bytes]:
+            if not path.is_file() or path.stat().st_size > max_bytes:
+                return None
+            return path.read_bytes()
+
+        return await asyncio.to_thread(load)
+
+    async def put(self, key: str, content: bytes, content_type: str) -> None:
+        path = self.path(key)
+
+        def write() -> None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(content)
+
+        await asyncio.to_thread(write)
+        logger.info("Stored file key='%s' under root='%s'", key, self.root)
+
+    async def upload_stream(
+        self, key: str, read: Callable[[int], Awaitable[bytes]], content_type: str,
+    ) -> UploadResult:
+        """Write parts to a temporary file as they arrive, then move it into place."""
+        path = self.path(key)
+        partial = path.with_name(path.name + ".part")
+        await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
+
+        reader = _HashingReader(read)
+        handle = await asyncio.to_thread(open, partial, "wb")
+        try:
+            while chunk := await reader.next_chunk():
+                await asyncio.to_thread(handle.write, chunk)
+            await asyncio.to_thread(handle.close)
+            await asyncio.to_thread(os.replace, partial, path)
+        except BaseException:
+            handle.close()
+            partial.unlink(missing_ok=True)
+            raise
+
+        logger.info("Stored file key='%s' under root='%s' size=%d", key, self.root, reader.size)
+        return reader.result(key)
+
+    async def move(self, source: str, destination: str) -> None:
+        source_path, destination_path = self.path(source), self.path(destination)
+
+        def rename() -> None:
+            destination_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(source_path, destination_path)
+
+        await asyncio.to_thread(rename)
+        logger.info("Moved file key='%s' to key='%s' under root='%s'", source, destination, self.root)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self.path(key).unlink, missing_ok=True)
+        logger.info("Deleted file key='%s' under root='%s'", key, self.root)
+
+
+_backend: Optional[StorageBackend] = None
+
+
+def create_backend() -> StorageBackend:
+    """A new backend for STORAGE_BACKEND, for processes and event loops that
+    cannot share the one get_backend returns."""
+    if settings.STORAGE_BACKEND == "local":
+        return LocalBackend(
+            root=settings.LOCAL_STORAGE_ROOT,
+            base_url=settings.LOCAL_STORAGE_BASE_URL,
+            secret=settings.SECRET_KEY,
+        )
+    return S3Backend(
+        bucket=settings.LIGHTSAIL_BUCKET_NAME,
+        access_key=settings.LIGHTSAIL_ACCESS_KEY,
+        secret_key=settings.LIGHTSAIL_SECRET_KEY,
+        endpoint=settings.LIGHTSAIL_ENDPOINT,
+        region=settings.LIGHTSAIL_REGION,
+    )
+
+
+def get_backend() -> StorageBackend:
+    """The configured storage backend (STORAGE_BACKEND), created on first use."""
+    global _backend
+    if _backend is None:
+        _backend = create_backend()
+    return _backend
+
+
+async def open_backend() -> None:
+    """Open the configured backend. Called from the app lifespan."""
+    await get_backend().open()
+
+
+async def close_backend() -> None:
+    """Close the configured backend. Called from the app lifespan."""
+    await get_backend().close()
 
 
 async def generate_presigned_url(key: str, expires_in: int = 300, download_filename: str = "") -> str:
-    """Generate a presigned URL for a file in the bucket.
+    """Generate a presigned URL for a stored file.
 
     Args:
-        key: The S3 object key.
+        key: The storage key.
         expires_in: URL expiry time in seconds (default 300 = 5 minutes).
         download_filename: If provided, the browser will download the file with this name.
 
     Returns:
         A presigned URL string.
     """
-    params = {"Bucket": BUCKET_NAME, "Key": key}
-    if download_filename:
-        params["ResponseContentDisposition"] = f'attachment; filename="{download_filename}"'
-
-    async with _s3_client() as s3:
-        url = await s3.generate_presigned_url(
-            "get_object",
-            Params=params,
-            ExpiresIn=expires_in,
-        )
-    return url
+    return get_backend().presign(key, expires_in, download_filename)
 
 
-async def upload_file(key: str, content: bytes, content_type: str = "application/octet-stream") -> str:
-    """Upload a file to the Lightsail bucket. Returns the file key."""
-    async with _s3_client() as s3:
-        await s3.put_object(
-            Bucket=BUCKET_NAME,
-            Key=key,
-            Body=content,
-            ContentType=content_type,
-        )
+async def generate_presigned_urls(
+    files: Iterable[Tuple[str, str]], expires_in: int = 300,
+) -> List[str]:
+    """Presign many files at once.
+
+    Args:
+        files: (key, download_filename) pairs; download_filename may be empty.
+        expires_in: URL expiry time in seconds.
+
+    Returns:
+        Presigned URLs in the same order as files.
+    """
+    backend = get_backend()
+    return [backend.presign(key, expires_in, download_filename) for key, download_filename in files]
+
+
+def presign_upload(
+    key: str, content_type: str, size: int, sha256: str, expires_in: int = 900,
+) -> Tuple[str, Dict[str, str]]:
+    """Presigned PUT URL (and required headers) for a client to upload key directly."""
+    return get_backend().presign_upload(key, expires_in, content_type, size, sha256)
+
 
-    logger.info("Uploaded file key='%s' to bucket='%s'", key, BUCKET_NAME)
+async def stat_file(key: str) -> Optional[UploadResult]:
+    """Size and SHA-256 of a stored file, or None if it does not exist."""
+    return await get_backend().stat(key)
+
+
+def stream_reader(
+    chunks: AsyncIterator[bytes], limit: Optional[int] = None,
+) -> Callable[[int], Awaitable[bytes]]:
+    """Adapt an async byte iterator (e.g. ``Request.stream()``) to a read(n) callable.
+
+    Raises ValueError once more than limit bytes have been received.
+    """
+    buffer = bytearray()
+    exhausted = False
+    received = 0
+
+    async def read(n: int) -> bytes:
+        nonlocal exhausted, received
+        while len(buffer) < n and not exhausted:
+            try:
+                piece = await chunks.__anext__()
+            except StopAsyncIteration:
+                exhausted = True
+                break
+            received += len(piece)
+            if limit is not None and received > limit:
+                raise ValueError("Upload is larger than declared")
+            buffer.extend(piece)
+        data = bytes(buffer[:n])
+        del buffer[:n]
+        return data
+
+    return read
+
+
+async def read_file(key: str, max_bytes: int) -> Optional[bytes]:
+    """Content of a stored file, or None if missing or larger than max_bytes."""
+    return await get_backend().read(key, max_bytes)
+
+
+async def upload_file(key: str, content: bytes, content_type: str = "application/octet-stream") -> str:
+    """Store a file. Returns the file key."""
+    await get_backend().put(key, content, content_type)
     return key
 
 
-async def delete_file(key: str) -> None:
-    """Delete a file from the Lightsail bucket."""
-    async with _s3_client() as s3:
-        await s3.delete_object(
-            Bucket=BUCKET_NAME,
-            Key=key,
-        )
+async def upload_stream(
+    key: str,
+    read: Callable[[int], Awaitable[bytes]],
+    content_type: str = "application/octet-stream",
+) -> UploadResult:
+    """Stream a file to storage without holding it in memory.
+
+    Content is pulled from read(n) (e.g. ``UploadFile.read``) one
+    MULTIPART_CHUNK_SIZE part at a time; size and SHA-256 are computed as
+    the parts go by.
+    """
+    return await get_backend().upload_stream(key, read, content_type)
+
 
-    logger.info("Deleted file key='%s' from bucket='%s'", key, BUCKET_NAME)
+async def move_file(source: str, destination: str) -> None:
+    """Rename a stored file, replacing any file already at destination."""
+    await get_backend().move(source, destination)
+
+
+async def delete_file(key: str) -> None:
+    """Delete a stored file."""
+    await get_backend().delete(key)
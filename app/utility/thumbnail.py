@@ -0,0 +1,126 @@
+import asyncio
+import io
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.utility import storage
+from app.utility.config import settings
+
+logger = logging.getLogger("medbase.utility.thumbnail")
+
+# Renditions are stored next to the original: "{file_path}.thumb.jpg"
+THUMBNAIL_SUFFIX = ".thumb.jpg"
+
+IMAGE_EXTENSIONS = {"jpg", "jpeg", "png", "gif", "bmp", "tif", "tiff", "webp"}
+PDF_EXTENSIONS = {"pdf"}
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def thumbnail_key(file_path: str) -> str:
+    return f"{file_path}{THUMBNAIL_SUFFIX}"
+
+
+def can_render(file_path: str) -> bool:
+    """Whether file_path has a type thumbnails are made for."""
+    ext = file_path.rsplit(".", 1)[-1].lower() if "." in file_path else ""
+    return ext in IMAGE_EXTENSIONS or ext in PDF_EXTENSIONS
+
+
+def render_thumbnail(content: bytes, file_path: str, max_size: int) -> Optional[bytes]:
+    """Render a JPEG preview no larger than max_size on either side.
+
+    Runs in a worker process. Images are decoded with Pillow, PDFs have
+    their first page rasterized with pypdfium2. Returns None when the file
+    type is not supported or the optional imaging packages are missing.
+    """
+    if not can_render(file_path):
+        return None
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return None
+
+    if file_path.lower().endswith(".pdf"):
+        try:
+            import pypdfium2
+        except ImportError:
+            return None
+        page = pypdfium2.PdfDocument(content)[0]
+        width, height = page.get_size()
+        image = page.render(scale=max_size / max(width, height)).to_pil()
+    else:
+        image = Image.open(io.BytesIO(content))
+        image.draft("RGB", (max_size, max_size))
+        image = ImageOps.exif_transpose(image)
+
+    image.thumbnail((max_size, max_size))
+    output = io.BytesIO()
+    image.convert("RGB").save(output, format="JPEG", quality=80, optimize=True)
+    return output.getvalue()
+
+
+async def _read_source(file_path: str, max_bytes: int) -> Optional[bytes]:
+    backend = storage.create_backend()
+    await backend.open()
+    try:
+        return await backend.read(file_path, max_bytes)
+    finally:
+        await backend.close()
+
+
+def render_stored_thumbnail(file_path: str, max_bytes: int, max_size: int) -> Optional[bytes]:
+    """Read file_path from storage and render its preview (see render_thumbnail).
+
+    Runs in a worker process with a storage backend of its own, so the
+    source never passes through the API process. Returns None when the file
+    is missing or larger than max_bytes.
+    """
+    content = asyncio.run(_read_source(file_path, max_bytes))
+    if content is None:
+        return None
+    return render_thumbnail(content, file_path, max_size)
+
+
+def start_pool() -> None:
+    """Start the rendering process pool. Called from the app lifespan."""
+    global _pool
+    if _pool is None and settings.THUMBNAIL_WORKERS > 0:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.THUMBNAIL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info("Started thumbnail pool workers=%d", settings.THUMBNAIL_WORKERS)
+
+
+def stop_pool() -> None:
+    """Shut the rendering pool down, abandoning queued renders."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+        logger.info("Stopped thumbnail pool")
+
+
+async def render(file_path: str) -> Optional[bytes]:
+    """Render the thumbnail for a stored file off the event loop.
+
+    With the process pool the app starts, the worker process reads the
+    source itself. Otherwise (scripts, tests) it is read here and rendered
+    in the default thread pool. Returns None when the file is missing,
+    larger than THUMBNAIL_MAX_SOURCE_BYTES or not previewable.
+    """
+    loop = asyncio.get_running_loop()
+    if _pool is not None:
+        return await loop.run_in_executor(
+            _pool, render_stored_thumbnail, file_path,
+            settings.THUMBNAIL_MAX_SOURCE_BYTES, settings.THUMBNAIL_MAX_SIZE,
+        )
+    content = await storage.read_file(file_path, settings.THUMBNAIL_MAX_SOURCE_BYTES)
+    if content is None:
+        return None
+    return await loop.run_in_executor(
+        None, render_thumbnail, content, file_path, settings.THUMBNAIL_MAX_SIZE,
+    )
@@ -1,12 +1,18 @@
 import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_redoc_html
 
 from app.utility.config import settings
-from app.utility.database import init_db
-from app.utility.logging import setup_logging, RequestLoggingMiddleware
+from app.utility.database import init_db, warm_up_pool, replica_engine, AsyncSessionLocal
+from app.utility import storage, thumbnail
+from app.utility.logging import setup_logging, shutdown_logging, RequestLoggingMiddleware
+from app.utility.query_stats import QueryStatsMiddleware
+from app.utility.metrics import MetricsMiddleware, start_loop_monitor, stop_loop_monitor
+from app.utility.pagination import InvalidCursorError
+from app.service.statistics import start_statistics_refresher, stop_statistics_refresher
 from app.router import (
     auth,
     user,
@@ -29,6 +35,9 @@ from app.router import (
     inventory_transaction,
     inventory_transaction_item,
     statistics,
+    search,
+    files,
+    metrics,
 )
 
 logger = logging.getLogger("medbase.app")
@@ -40,9 +49,22 @@ async def lifespan(app: FastAPI):
     # Startup
     setup_logging(debug=settings.DEBUG)
     logger.info("MedBase API starting up")
+    if settings.DB_POOL_WARMUP:
+        await warm_up_pool()
+        if replica_engine is not None:
+            await warm_up_pool(replica_engine)
+    await storage.open_backend()
+    thumbnail.start_pool()
+    start_loop_monitor()
+    start_statistics_refresher(AsyncSessionLocal)
     yield
     # Shutdown
+    await stop_statistics_refresher()
+    await stop_loop_monitor()
+    thumbnail.stop_pool()
+    await storage.close_backend()
     logger.info("MedBase API shutting down")
+    shutdown_logging()
 
 
 app = FastAPI(
@@ -64,9 +86,15 @@ async def redoc_html():
         redoc_js_url="https://cdn.jsdelivr.net/npm/redoc@2.1.5/bundles/redoc.standalone.js",
     )
 
+# Per-request SQL statistics (Server-Timing headers, N+1 warnings)
+app.add_middleware(QueryStatsMiddleware)
+
 # Request/response logging middleware
 app.add_middleware(RequestLoggingMiddleware)
 
+# Route latency histograms and in-flight requests for /metrics
+app.add_middleware(MetricsMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -76,6 +104,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    """Reject stale or tampered pagination cursors on any list endpoint."""
+    return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)})
+
+
 # Include routers
 app.include_router(auth.router, prefix=settings.API_V1_PREFIX)
 app.include_router(user.router, prefix=settings.API_V1_PREFIX)
@@ -98,6 +133,9 @@ app.include_router(treatment.router, prefix=settings.API_V1_PREFIX)
 app.include_router(inventory_transaction.router, prefix=settings.API_V1_PREFIX)
 app.include_router(inventory_transaction_item.router, prefix=settings.API_V1_PREFIX)
 app.include_router(statistics.router, prefix=settings.API_V1_PREFIX)
+app.include_router(search.router, prefix=settings.API_V1_PREFIX)
+app.include_router(files.router, prefix=settings.API_V1_PREFIX)
+app.include_router(metrics.router)
 
 
 @app.get("/")
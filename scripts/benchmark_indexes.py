@@ -0,0 +1,158 @@
+"""Compare query plans for hot soft-delete-filtered lookups with and without
+the partial indexes added in migration e5f6a7b8c9d0.
+
+Everything runs in one transaction that is rolled back, so the database is
+left untouched. Usage:
+
+    python scripts/benchmark_indexes.py                 # existing data
+    python scripts/benchmark_indexes.py --synthetic 50000  # add N rows per table first
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.utility.database import engine
+
+INDEXES = [
+    "ix_appointments_patient_id_appointment_date_not_deleted",
+    "ix_appointments_doctor_id_appointment_date_not_deleted",
+    "ix_appointments_appointment_date_not_deleted",
+    "ix_inventory_transaction_items_transaction_id_not_deleted",
+    "ix_inventory_transaction_items_item_id_not_deleted",
+    "ix_inventory_transactions_transaction_date_not_deleted",
+    "ix_vital_signs_appointment_id_not_deleted",
+    "ix_medical_records_appointment_id_not_deleted",
+    "ix_patient_documents_patient_id_not_deleted",
+]
+
+# (label, SQL) pairs mirroring the service-layer lookups.
+QUERIES = [
+    (
+        "appointments by patient",
+        "SELECT * FROM appointments WHERE patient_id = (SELECT min(id) FROM patients) AND is_deleted = false "
+        "ORDER BY appointment_date DESC LIMIT 10",
+    ),
+    (
+        "appointments by doctor",
+        "SELECT * FROM appointments WHERE doctor_id = (SELECT min(id) FROM doctors) AND is_deleted = false "
+        "ORDER BY appointment_date DESC LIMIT 10",
+    ),
+    (
+        "appointments on a day",
+        "SELECT * FROM appointments WHERE appointment_date >= date '2026-01-15' "
+        "AND appointment_date < date '2026-01-16' AND is_deleted = false",
+    ),
+    (
+        "vital signs for appointment",
+        "SELECT * FROM vital_signs WHERE appointment_id = (SELECT min(id) FROM appointments) AND is_deleted = false",
+    ),
+    (
+        "medical record for appointment",
+        "SELECT * FROM medical_records WHERE appointment_id = (SELECT min(id) FROM appointments) AND is_deleted = false",
+    ),
+    (
+        "documents for patient",
+        "SELECT * FROM patient_documents WHERE patient_id = (SELECT min(id) FROM patients) AND is_deleted = false",
+    ),
+    (
+        "items of transaction",
+        "SELECT * FROM inventory_transaction_items "
+        "WHERE transaction_id = (SELECT min(id) FROM inventory_transactions) AND is_deleted = false",
+    ),
+    (
+        "transactions on a date",
+        "SELECT * FROM inventory_transactions WHERE transaction_date = date '2026-01-15' AND is_deleted = false",
+    ),
+]
+
+SYNTHETIC_SQL = [
+    """INSERT INTO third_parties (code, name, is_active, is_deleted)
+       SELECT 'BENCH' || g, 'Bench Patient ' || g, true, false FROM generate_series(1, :n) g""",
+    """INSERT INTO patients (third_party_id, is_active, is_deleted)
+       SELECT id, true, false FROM third_parties WHERE code LIKE 'BENCH%'""",
+    """INSERT INTO appointments (code, patient_id, appointment_date, status, type, location, is_deleted)
+       SELECT 'BA' || p.id || '-' || g, p.id, timestamp '2025-01-01' + (random() * 700) * interval '1 day',
+              'completed', 'consultation', 'internal', random() < 0.1
+       FROM patients p, generate_series(1, 4) g
+       WHERE p.third_party_id IN (SELECT id FROM third_parties WHERE code LIKE 'BENCH%')""",
+    """INSERT INTO vital_signs (appointment_id, heart_rate, is_deleted)
+       SELECT id, 70, false FROM appointments WHERE code LIKE 'BA%'""",
+    """INSERT INTO medical_records (appointment_id, diagnosis, is_deleted)
+       SELECT id, 'bench', false FROM appointments WHERE code LIKE 'BA%'""",
+    """INSERT INTO patient_documents (patient_id, document_name, file_path, is_deleted)
+       SELECT patient_id, 'bench.pdf', 'bench/' || id, false FROM appointments WHERE code LIKE 'BA%'""",
+    """INSERT INTO items (item_type, name, is_deleted)
+       SELECT 'medicine', 'Bench Item ' || g, false FROM generate_series(1, 200) g""",
+    """INSERT INTO inventory_transactions (transaction_type, third_party_id, transaction_date, is_deleted)
+       SELECT 'purchase', (SELECT min(id) FROM third_parties WHERE code LIKE 'BENCH%'),
+              date '2025-01-01' + (random() * 700)::int, random() < 0.1
+       FROM generate_series(1, :n) g""",
+    """INSERT INTO inventory_transaction_items (transaction_id, item_id, quantity, is_deleted)
+       SELECT t.id, (SELECT min(id) FROM items WHERE name LIKE 'Bench Item%') + (random() * 199)::int, 1, false
+       FROM inventory_transactions t, generate_series(1, 3) g
+       WHERE t.transaction_type = 'purchase'""",
+]
+
+
+async def explain(conn: AsyncConnection, sql: str) -> dict:
+    """Run EXPLAIN ANALYZE and return the top plan node plus timings."""
+    result = await conn.execute(text("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]
+
+
+def summarize(plan: dict) -> str:
+    node = plan["Plan"]
+    while node.get("Plans") and node["Node Type"] in ("Gather", "Result"):
+        node = node["Plans"][-1]
+    name = node["Node Type"]
+    index_node = node
+    if node["Node Type"] == "Bitmap Heap Scan":
+        # Skip InitPlans (the min(id) subqueries) to reach the bitmap index scan
+        index_node = next(p for p in node["Plans"] if p.get("Parent Relationship") == "Outer")
+    if index_node.get("Index Name"):
+        name += f" using {index_node['Index Name']}"
+    return f"{name:<80} {plan['Execution Time']:>9.3f} ms"
+
+
+async def run(synthetic: int) -> None:
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            if synthetic:
+                print(f"Inserting synthetic rows (n={synthetic})...")
+                for sql in SYNTHETIC_SQL:
+                    await conn.execute(text(sql), {"n": synthetic})
+            await conn.execute(text("ANALYZE"))
+
+            for label, sql in QUERIES:
+                after = await explain(conn, sql)
+
+                savepoint = await conn.begin_nested()
+                for name in INDEXES:
+                    await conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+                before = await explain(conn, sql)
+                await savepoint.rollback()
+
+                print(label)
+                print(f"  before: {summarize(before)}")
+                print(f"  after:  {summarize(after)}")
+        finally:
+            await trans.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", type=int, default=0, help="Synthetic patients/transactions to add first")
+    args = parser.parse_args()
+    asyncio.run(run(args.synthetic))
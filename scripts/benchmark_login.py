@@ -0,0 +1,122 @@
+"""Measure login throughput and how much a burst of logins stalls other requests.
+
+A burst of concurrent logins (a shift change) is driven straight through the
+ASGI interface against two Starlette endpoints that check a password the way
+UserService.authenticate does: one verifies on the event loop as it used to,
+the other in the password hashing thread pool. While the burst runs, a cheap
+request is sent every few milliseconds; the longest gap between two of them
+completing is how long the event loop was unavailable to other requests. No
+database is involved. The cost factor and pool size come from BCRYPT_ROUNDS
+and PASSWORD_HASH_WORKERS. Usage:
+
+    python scripts/benchmark_login.py
+    BCRYPT_ROUNDS=10 PASSWORD_HASH_WORKERS=4 python scripts/benchmark_login.py --logins 60
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/unused")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from app.utility.config import settings
+from app.utility.security import get_password_hash, verify_and_update_password, verify_password
+
+PASSWORD = "testpass123"
+PASSWORD_HASH = get_password_hash(PASSWORD)
+
+
+async def login_on_loop(request: Request) -> Response:
+    return Response(status_code=200 if verify_password(PASSWORD, PASSWORD_HASH) else 401)
+
+
+async def login_in_pool(request: Request) -> Response:
+    valid, _ = await verify_and_update_password(PASSWORD, PASSWORD_HASH)
+    return Response(status_code=200 if valid else 401)
+
+
+async def ping(request: Request) -> Response:
+    return Response("ok")
+
+
+app = Starlette(routes=[
+    Route("/login/loop", login_on_loop, methods=["POST"]),
+    Route("/login/pool", login_in_pool, methods=["POST"]),
+    Route("/ping", ping),
+])
+
+
+async def call(method: str, path: str) -> None:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [], "client": ("127.0.0.1", 1), "server": ("test", 80),
+    }
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def burst(path: str, logins: int, ping_interval: float):
+    """Run logins concurrently while pinging; returns (seconds, pings, longest gap between pings)."""
+    finished = []
+    done = asyncio.Event()
+
+    async def pinger():
+        while not done.is_set():
+            await call("GET", "/ping")
+            finished.append(time.perf_counter())
+            await asyncio.sleep(ping_interval)
+
+    async def login():
+        await call("POST", path)
+
+    ping_task = asyncio.create_task(pinger())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    end = time.perf_counter()
+    done.set()
+    await ping_task
+    marks = [start] + [t for t in finished if start < t < end] + [end]
+    return end - start, len(marks) - 2, max(b - a for a, b in zip(marks, marks[1:]))
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=30, help="Concurrent logins per burst")
+    parser.add_argument("--ping-interval-ms", type=float, default=5, help="Delay between pings during the burst")
+    args = parser.parse_args()
+
+    print(
+        f"bcrypt rounds={settings.BCRYPT_ROUNDS} pool workers={settings.PASSWORD_HASH_WORKERS} "
+        f"logins={args.logins} cpus={os.cpu_count()}"
+    )
+    print(f"{'variant':<10}{'burst':>10}{'logins/s':>10}{'pings':>8}{'longest stall':>15}")
+    for label, path in (("on loop", "/login/loop"), ("pool", "/login/pool")):
+        await burst(path, 2, args.ping_interval_ms / 1000)
+        elapsed, pings, stall = await burst(path, args.logins, args.ping_interval_ms / 1000)
+        print(f"{label:<10}{elapsed:>9.2f}s{args.logins / elapsed:>10.1f}{pings:>8}{stall * 1000:>13.1f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,164 @@
+"""Measure the per-request overhead of RequestLoggingMiddleware.
+
+Requests are driven straight through the ASGI interface (no network, no
+HTTP client) against a Starlette endpoint that reads the body and returns
+a small response, so the timings isolate the middleware itself. Each
+payload is run bare, behind the BaseHTTPMiddleware implementation the
+middleware replaced, and behind the current one. Log records are fully
+formatted and written to a null stream. Usage:
+
+    python scripts/benchmark_request_logging.py
+    python scripts/benchmark_request_logging.py --requests 5000
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/unused")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from app.utility.logging import RequestLoggingMiddleware, SENSITIVE_FIELDS
+
+CHUNK_SIZE = 64 * 1024
+
+
+class PreviousRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware version, kept here for comparison: buffers every
+    mutating request's body, then tries JSON and falls back to form text."""
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.logger = logging.getLogger("medbase.request")
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        start = time.time()
+        method = request.method
+        path = request.url.path
+        query = str(request.query_params) if request.query_params else ""
+        self.logger.info("→ %s %s", method, f"{path}?{query}" if query else path)
+
+        if method in ("POST", "PUT", "PATCH"):
+            body_bytes = await request.body()
+            if body_bytes:
+                try:
+                    body = json.loads(body_bytes)
+                    masked = {k: "***" if k.lower() in SENSITIVE_FIELDS else v for k, v in body.items()}
+                    self.logger.info("  Body: %s", json.dumps(masked))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    parts = body_bytes.decode("utf-8", errors="replace").split("&")
+                    masked_parts = [
+                        f"{p.split('=', 1)[0]}=***" if p.split("=", 1)[0].lower() in SENSITIVE_FIELDS else p
+                        for p in parts
+                    ]
+                    self.logger.info("  Body: %s", "&".join(masked_parts))
+
+        response = await call_next(request)
+        self.logger.info("← %s %s %d (%.0fms)", method, path, response.status_code, (time.time() - start) * 1000)
+        return response
+
+
+async def endpoint(request: Request) -> Response:
+    body = await request.body()
+    return Response(str(len(body)))
+
+
+def build_app(middleware):
+    app = Starlette(routes=[Route("/bench", endpoint, methods=["GET", "POST"])])
+    return middleware(app) if middleware else app
+
+
+def multipart(size: int) -> bytes:
+    boundary = b"benchboundary"
+    return (
+        b"--" + boundary + b'\r\nContent-Disposition: form-data; name="file"; filename="scan.pdf"\r\n'
+        b"Content-Type: application/pdf\r\n\r\n" + os.urandom(size) + b"\r\n--" + boundary + b"--\r\n"
+    )
+
+
+PAYLOADS = [
+    ("GET, no body", "GET", None, b""),
+    ("login form", "POST", "application/x-www-form-urlencoded", b"username=admin&password=secret123"),
+    ("JSON 1 KiB", "POST", "application/json", json.dumps({"notes": "x" * 1000, "password": "p"}).encode()),
+    ("JSON 64 KiB", "POST", "application/json", json.dumps({"notes": "x" * 65000, "password": "p"}).encode()),
+    ("multipart 5 MiB", "POST", "multipart/form-data; boundary=benchboundary", multipart(5 * 1024 * 1024)),
+]
+
+
+async def call(app, method: str, content_type, body: bytes) -> None:
+    headers = [(b"content-length", str(len(body)).encode())]
+    if content_type:
+        headers.append((b"content-type", content_type.encode()))
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+        "scheme": "http", "path": "/bench", "raw_path": b"/bench", "query_string": b"",
+        "root_path": "", "headers": headers, "client": ("127.0.0.1", 1), "server": ("test", 80),
+    }
+    chunks = [body[i:i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE)] or [b""]
+    position = 0
+
+    async def receive():
+        nonlocal position
+        if position < len(chunks):
+            position += 1
+            return {"type": "http.request", "body": chunks[position - 1], "more_body": position < len(chunks)}
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app, method, content_type, body, requests: int) -> float:
+    """Mean microseconds per request."""
+    for _ in range(min(50, requests)):
+        await call(app, method, content_type, body)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app, method, content_type, body)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per payload (multipart runs a tenth)")
+    args = parser.parse_args()
+
+    handler = logging.StreamHandler(open(os.devnull, "w"))
+    handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)-8s | %(name)s | %(message)s"))
+    request_logger = logging.getLogger("medbase.request")
+    request_logger.addHandler(handler)
+    request_logger.setLevel(logging.INFO)
+    request_logger.propagate = False
+
+    variants = [
+        ("bare", build_app(None)),
+        ("previous", build_app(PreviousRequestLoggingMiddleware)),
+        ("ASGI", build_app(RequestLoggingMiddleware)),
+    ]
+
+    print(f"{'payload':<18}" + "".join(f"{name:>12}" for name, _ in variants) + f"{'prev. cost':>12}{'ASGI cost':>12}")
+    for label, method, content_type, body in PAYLOADS:
+        requests = args.requests // 10 if len(body) > 1024 * 1024 else args.requests
+        timings = [await measure(app, method, content_type, body, requests) for _, app in variants]
+        bare, previous, current = timings
+        print(
+            f"{label:<18}" + "".join(f"{t:>10.1f}us" for t in timings)
+            + f"{previous - bare:>+10.1f}us{current - bare:>+10.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
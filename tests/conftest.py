@@ -9,8 +9,11 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sess
 # Set test environment before importing app modules
 os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL", "")
 
-from app.utility.database import Base, get_db
+from app.utility.database import Base, get_db, get_read_db, get_session_factory, get_read_session_factory
+from app.utility.cache import principal_cache, count_cache, presigned_url_cache, recent_writers
+from app.utility.query_stats import instrument_engine
 from app.utility.security import get_password_hash
+from app.service.statistics import pending_refreshes
 from app.model.third_party import ThirdParty  # noqa: F401
 from app.model.user import User
 from app.model.medicine_category import MedicineCategory  # noqa: F401
@@ -31,6 +34,8 @@ from app.model.medical_record import MedicalRecord  # noqa: F401
 from app.model.treatment import Treatment  # noqa: F401
 from app.model.inventory_transaction import InventoryTransaction  # noqa: F401
 from app.model.inventory_transaction_item import InventoryTransactionItem  # noqa: F401
+from app.model.statistics_snapshot import StatisticsSnapshot  # noqa: F401
+from app.model.stored_object import StoredObject  # noqa: F401
 from main import app
 
 
@@ -43,6 +48,7 @@ test_engine = create_async_engine(
     echo=False,
     pool_pre_ping=True,
 )
+instrument_engine(test_engine)
 
 # Create test session factory
 TestAsyncSessionLocal = async_sessionmaker(
@@ -86,7 +92,19 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     async def override_get_db():
         yield db_session
     
+    async def override_get_session_factory():
+        return TestAsyncSessionLocal
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = override_get_session_factory
+    app.dependency_overrides[get_read_session_factory] = override_get_session_factory
+    # Ids and rows are recreated by every test, so drop per-worker caches
+    principal_cache.clear()
+    count_cache.clear()
+    presigned_url_cache.clear()
+    recent_writers.clear()
+    pending_refreshes.clear()
     
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
@@ -17,7 +17,7 @@ from app.model.user import User
 @pytest.fixture
 async def patient(db_session: AsyncSession, admin_user: User) -> Patient:
     """Create a patient for testing."""
-    tp = ThirdParty(name="Test Patient", is_active=True)
+    tp = ThirdParty(name="Test Patient", phone="1234567890", email="test.patient@test.com", is_active=True)
     db_session.add(tp)
     await db_session.flush()
     await db_session.refresh(tp)
@@ -26,8 +26,6 @@ async def patient(db_session: AsyncSession, admin_user: User) -> Patient:
         third_party_id=tp.id,
         date_of_birth=date(1990, 5, 15),
         gender="male",
-        phone="1234567890",
-        email="test.patient@test.com",
         is_active=True,
         created_by=admin_user.username,
         updated_by=admin_user.username,
@@ -48,7 +46,6 @@ async def doctor(db_session: AsyncSession, admin_user: User) -> Doctor:
 
     doctor = Doctor(
         third_party_id=tp.id,
-        name="Dr. Test",
         specialization="General",
         type="internal",
         is_active=True,
@@ -71,7 +68,6 @@ async def partner(db_session: AsyncSession, admin_user: User) -> Partner:
 
     partner = Partner(
         third_party_id=tp.id,
-        name="Test Partner",
         partner_type="referral",
         organization_type="hospital",
         is_active=True,
@@ -177,6 +173,29 @@ class TestGetAppointments:
         for item in data["items"]:
             assert item["type"] == "scheduled"
 
+    @pytest.mark.asyncio
+    async def test_get_appointments_filter_by_date(
+        self, client: AsyncClient, admin_headers: dict,
+        appointment: Appointment, second_appointment: Appointment,
+    ):
+        """Test filtering appointments by calendar day."""
+        response = await client.get(
+            "/api/v1/appointments", params={"appointment_date": "2026-03-02"}, headers=admin_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["id"] for item in data["items"]] == [second_appointment.id]
+
+    @pytest.mark.asyncio
+    async def test_get_appointments_filter_by_invalid_date(
+        self, client: AsyncClient, admin_headers: dict,
+    ):
+        """Test an unparseable date filter is rejected."""
+        response = await client.get(
+            "/api/v1/appointments", params={"appointment_date": "March 2"}, headers=admin_headers,
+        )
+        assert response.status_code == 422
+
     @pytest.mark.asyncio
     async def test_get_appointments_filter_by_patient_id(
         self, client: AsyncClient, admin_headers: dict,
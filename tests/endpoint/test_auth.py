@@ -1,8 +1,13 @@
 """Tests for authentication endpoints."""
+import threading
+
 import pytest
 from httpx import AsyncClient
+from passlib.hash import bcrypt
 
 from app.model.user import User
+from app.utility import security
+from app.utility.config import settings
 
 
 class TestAuthLogin:
@@ -77,6 +82,78 @@ class TestAuthLogin:
         assert response.status_code == 401
 
 
+class TestPasswordHashing:
+    """Tests for off-loop password hashing and rehash-on-login."""
+
+    @pytest.mark.asyncio
+    async def test_login_rehashes_outdated_hash(self, client: AsyncClient, admin_user: User, db_session):
+        """Test a password hashed with another cost factor is rehashed at login."""
+        admin_user.password_hash = bcrypt.using(rounds=4).hash("testpass123")
+        await db_session.commit()
+
+        response = await client.post(
+            "/api/v1/auth/login",
+            data={"username": "testadmin", "password": "testpass123"}
+        )
+
+        assert response.status_code == 200
+        await db_session.refresh(admin_user)
+        assert admin_user.password_hash.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+        assert security.verify_password("testpass123", admin_user.password_hash)
+
+    @pytest.mark.asyncio
+    async def test_login_keeps_current_hash(self, client: AsyncClient, admin_user: User, db_session):
+        """Test a hash with the current cost factor is left alone."""
+        password_hash = admin_user.password_hash
+
+        response = await client.post(
+            "/api/v1/auth/login",
+            data={"username": "testadmin", "password": "testpass123"}
+        )
+
+        assert response.status_code == 200
+        await db_session.refresh(admin_user)
+        assert admin_user.password_hash == password_hash
+
+    @pytest.mark.asyncio
+    async def test_failed_login_does_not_rehash(self, client: AsyncClient, admin_user: User, db_session):
+        """Test a wrong password never updates an outdated hash."""
+        password_hash = bcrypt.using(rounds=4).hash("testpass123")
+        admin_user.password_hash = password_hash
+        await db_session.commit()
+
+        response = await client.post(
+            "/api/v1/auth/login",
+            data={"username": "testadmin", "password": "wrongpassword"}
+        )
+
+        assert response.status_code == 401
+        await db_session.refresh(admin_user)
+        assert admin_user.password_hash == password_hash
+
+    @pytest.mark.asyncio
+    async def test_hashing_runs_off_event_loop(self, monkeypatch):
+        """Test hashing and verification run in the password hashing threads."""
+        threads = []
+        verify_and_update = security.pwd_context.verify_and_update
+        hash_ = security.pwd_context.hash
+
+        def record(function):
+            def wrapper(*args):
+                threads.append(threading.current_thread().name)
+                return function(*args)
+            return wrapper
+
+        monkeypatch.setattr(security.pwd_context, "verify_and_update", record(verify_and_update))
+        monkeypatch.setattr(security.pwd_context, "hash", record(hash_))
+
+        password_hash = await security.hash_password("testpass123")
+        assert await security.verify_and_update_password("testpass123", password_hash) == (True, None)
+        assert await security.verify_and_update_password("wrong", password_hash) == (False, None)
+        assert len(threads) == 3
+        assert all(name.startswith("password-hash") for name in threads)
+
+
 class TestAuthLogout:
     """Tests for POST /api/v1/auth/logout"""
     
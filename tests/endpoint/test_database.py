@@ -0,0 +1,217 @@
+"""Tests for engine configuration, pool warm-up and read sessions."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel, field_validator
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.model.user import User
+from main import app
+from app.utility import database
+from app.utility.cache import principal_cache, recent_writers
+from app.utility.config import settings
+from app.utility.database import (
+    ReadSessionLocal, engine_options, get_read_db, get_session_factory, mark_recent_write,
+    release_read_session, warm_up_pool,
+)
+from tests.conftest import TEST_DATABASE_URL
+
+
+class TestEngineOptions:
+    """Tests for engine_options."""
+
+    def test_pool_settings(self, monkeypatch):
+        """Test pool sizing and checkout behaviour come from settings."""
+        monkeypatch.setattr(settings, "DB_POOL_SIZE", 12)
+        monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 3)
+        monkeypatch.setattr(settings, "DB_POOL_RECYCLE_SECONDS", 600)
+        monkeypatch.setattr(settings, "DB_POOL_PRE_PING", False)
+
+        options = engine_options("primary")
+
+        assert options["pool_size"] == 12
+        assert options["max_overflow"] == 3
+        assert options["pool_recycle"] == 600
+        assert options["pool_pre_ping"] is False
+        assert options["connect_args"] == {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+
+    @pytest.mark.asyncio
+    async def test_pgbouncer_mode(self, monkeypatch):
+        """Test transaction-pooler mode runs without cached or reused prepared statements."""
+        monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+        options = engine_options("primary")
+        connect_args = options["connect_args"]
+        assert connect_args["statement_cache_size"] == 0
+        assert connect_args["prepared_statement_cache_size"] == 0
+        assert connect_args["prepared_statement_name_func"]() != connect_args["prepared_statement_name_func"]()
+
+        bouncer_engine = create_async_engine(TEST_DATABASE_URL, **options)
+        try:
+            async with bouncer_engine.connect() as conn:
+                for _ in range(3):
+                    assert (await conn.execute(text("SELECT 1"))).scalar() == 1
+        finally:
+            await bouncer_engine.dispose()
+
+
+class TestPoolWarmUp:
+    """Tests for warm_up_pool."""
+
+    @pytest.mark.asyncio
+    async def test_opens_connections(self):
+        """Test warm-up leaves the requested number of idle connections in the pool."""
+        warm_engine = create_async_engine(TEST_DATABASE_URL, **engine_options("warm"))
+        try:
+            assert await warm_up_pool(warm_engine, connections=3) == 3
+            assert warm_engine.pool.checkedin() == 3
+            assert warm_engine.pool.checkedout() == 0
+        finally:
+            await warm_engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_unreachable_database(self):
+        """Test warm-up logs instead of failing when the database is down."""
+        url = TEST_DATABASE_URL.rsplit("@", 1)[0] + "@127.0.0.1:1/none"
+        down_engine = create_async_engine(url, **engine_options("down"))
+        try:
+            assert await warm_up_pool(down_engine, connections=2) == 0
+        finally:
+            await down_engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_unresponsive_database(self, monkeypatch):
+        """Test warm-up gives up on a server that accepts connections but never answers."""
+        async def hang(reader, writer):
+            await reader.read()
+
+        server = await asyncio.start_server(hang, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        url = TEST_DATABASE_URL.rsplit("@", 1)[0] + f"@127.0.0.1:{port}/none"
+        hung_engine = create_async_engine(url, **engine_options("hung"))
+        monkeypatch.setattr(settings, "DB_POOL_WARMUP_TIMEOUT_SECONDS", 0.2)
+        try:
+            assert await asyncio.wait_for(warm_up_pool(hung_engine, connections=2), 5) == 0
+        finally:
+            await hung_engine.dispose()
+            server.close()
+
+
+class TestReadReplica:
+    """Tests for ReadSession routing and read-your-writes stickiness."""
+
+    @pytest.fixture
+    async def replica(self, monkeypatch):
+        replica_engine = create_async_engine(TEST_DATABASE_URL, **engine_options("replica"))
+        monkeypatch.setattr(database, "replica_engine", replica_engine)
+        yield replica_engine
+        recent_writers.clear()
+        await replica_engine.dispose()
+
+    @staticmethod
+    def _pool(user_id=None):
+        request = SimpleNamespace(state=SimpleNamespace(user_id=user_id)) if user_id else None
+        session = ReadSessionLocal(info={"request": request})
+        return session.sync_session.get_bind().pool
+
+    def test_primary_without_replica(self):
+        """Test reads use the primary when no replica is configured."""
+        assert database.replica_engine is None
+        assert self._pool(user_id=1) is database.engine.pool
+
+    def test_replica_for_reads(self, replica):
+        """Test reads go to the replica for anonymous sessions and users with no recent write."""
+        assert self._pool() is replica.pool
+        assert self._pool(user_id=1) is replica.pool
+
+    def test_recent_writer_sticks_to_primary(self, replica):
+        """Test a user who just wrote reads from the primary, other users do not."""
+        mark_recent_write(1)
+        assert self._pool(user_id=1) is database.engine.pool
+        assert self._pool(user_id=2) is replica.pool
+
+    @pytest.mark.asyncio
+    async def test_replica_session_queries(self, replica):
+        """Test a read session runs its queries on the replica engine."""
+        async with ReadSessionLocal() as session:
+            assert (await session.execute(text("SELECT 1"))).scalar() == 1
+        assert replica.pool.checkedin() == 1
+
+    @pytest.mark.asyncio
+    async def test_writes_mark_user(self, client: AsyncClient, admin_user: User, admin_headers: dict):
+        """Test successful writes mark the user as a recent writer, reads and failed writes do not."""
+        response = await client.get("/api/v1/patients", headers=admin_headers)
+        assert response.status_code == 200
+        assert recent_writers.get(admin_user.id) is None
+
+        response = await client.post("/api/v1/patients", json={"gender": "female"}, headers=admin_headers)
+        assert response.status_code == 400
+        assert recent_writers.get(admin_user.id) is None
+
+        response = await client.post(
+            "/api/v1/patients", json={"name": "Replica Test", "gender": "female"}, headers=admin_headers,
+        )
+        assert response.status_code == 201
+        assert recent_writers.get(admin_user.id) is True
+
+    @pytest.mark.asyncio
+    async def test_read_request_authenticates_on_read_session(
+        self, client: AsyncClient, admin_headers: dict,
+    ):
+        """Test a GET looks its user up in a read session, never a primary one."""
+        def unusable_factory():
+            raise AssertionError("primary session opened")
+
+        async def override_get_session_factory():
+            return unusable_factory
+
+        principal_cache.clear()
+        app.dependency_overrides[get_session_factory] = override_get_session_factory
+        response = await client.get("/api/v1/auth/me", headers=admin_headers)
+        assert response.status_code == 200
+
+
+class TestReadOnlySession:
+    """Tests for read-only transactions and the lifetime of get_read_db sessions."""
+
+    @pytest.mark.asyncio
+    async def test_read_only_transaction(self):
+        """Test read sessions run in read-only transactions."""
+        async with ReadSessionLocal() as session:
+            assert (await session.execute(text("SHOW transaction_read_only"))).scalar() == "on"
+            with pytest.raises(DBAPIError, match="read-only transaction"):
+                await session.execute(text("CREATE TEMP TABLE read_only_check (id integer)"))
+
+    @pytest.mark.asyncio
+    async def test_session_released_before_response_built(self):
+        """Test release_read_session frees the connection before serialization, keeping results readable."""
+        seen = []
+
+        class Result(BaseModel):
+            value: int
+
+            @field_validator("value")
+            @classmethod
+            def record_pool(cls, value):
+                seen.append(database.engine.pool.checkedout())
+                return value
+
+        router = APIRouter()
+
+        @router.get("/read", response_model=Result)
+        async def read(db: AsyncSession = Depends(get_read_db)):
+            value = (await db.execute(text("SELECT 1"))).scalar()
+            await release_read_session(db)
+            return {"value": value}
+
+        test_app = FastAPI()
+        test_app.include_router(router)
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            response = await client.get("/read")
+        assert response.json() == {"value": 1}
+        assert seen[-1] == 0
+        assert database.engine.pool.checkedout() == 0
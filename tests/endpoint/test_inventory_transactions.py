@@ -570,7 +570,8 @@ class TestCreateTransaction:
             headers=admin_headers,
         )
         assert response.status_code == 400
-        assert "equipment" in response.json()["detail"].lower()
+        errors = response.json()["detail"]["errors"]
+        assert errors == [{"item_id": item.id, "detail": "Equipment cannot be prescribed"}]
 
     @pytest.mark.asyncio
     async def test_create_transaction_insufficient_inventory_fails(
@@ -592,6 +593,65 @@ class TestCreateTransaction:
         assert response.status_code == 400
         assert "insufficient" in response.json()["detail"].lower()
 
+    @pytest.mark.asyncio
+    async def test_create_transaction_multiple_items(
+        self, client: AsyncClient, admin_headers: dict,
+        medicine_with_inventory: tuple, equipment_with_inventory: tuple, db_session: AsyncSession,
+    ):
+        """Test creating a transaction with several lines, including a repeated item."""
+        _, med_inventory, med_item = medicine_with_inventory
+        _, eq_inventory, eq_item = equipment_with_inventory
+        med_item_id, eq_item_id = med_item.id, eq_item.id
+        med_qty, eq_qty = med_inventory.quantity, eq_inventory.quantity
+
+        response = await client.post(
+            "/api/v1/inventory-transactions",
+            json={
+                "transaction_type": "purchase",
+                "transaction_date": "2026-03-15",
+                "items": [
+                    {"item_id": med_item_id, "quantity": 10},
+                    {"item_id": eq_item_id, "quantity": 2},
+                    {"item_id": med_item_id, "quantity": 15},
+                ],
+            },
+            headers=admin_headers,
+        )
+        assert response.status_code == 201
+        assert len(response.json()["items"]) == 3
+
+        db_session.expire_all()
+        result = await db_session.execute(
+            select(Inventory.item_id, Inventory.quantity).where(
+                Inventory.item_id.in_([med_item_id, eq_item_id])
+            )
+        )
+        quantities = dict(result.all())
+        assert quantities[med_item_id] == med_qty + 25
+        assert quantities[eq_item_id] == eq_qty + 2
+
+    @pytest.mark.asyncio
+    async def test_create_transaction_insufficient_combined_lines_fails(
+        self, client: AsyncClient, admin_headers: dict, medicine_with_inventory: tuple,
+    ):
+        """Test that lines for the same item are stock-checked against their total."""
+        medicine, inventory, item = medicine_with_inventory
+        half = inventory.quantity // 2 + 1
+        response = await client.post(
+            "/api/v1/inventory-transactions",
+            json={
+                "transaction_type": "loss",
+                "transaction_date": "2026-03-15",
+                "items": [
+                    {"item_id": item.id, "quantity": half},
+                    {"item_id": item.id, "quantity": half},
+                ],
+            },
+            headers=admin_headers,
+        )
+        assert response.status_code == 400
+        assert "insufficient" in response.json()["detail"].lower()
+
     @pytest.mark.asyncio
     async def test_create_transaction_invalid_inventory_item_fails(
         self, client: AsyncClient, admin_headers: dict,
@@ -609,7 +669,39 @@ class TestCreateTransaction:
             headers=admin_headers,
         )
         assert response.status_code == 400
-        assert "inventory record not found" in response.json()["detail"].lower()
+        errors = response.json()["detail"]["errors"]
+        assert len(errors) == 1
+        assert errors[0]["item_id"] == 99999
+        assert "inventory record not found" in errors[0]["detail"].lower()
+
+    @pytest.mark.asyncio
+    async def test_create_transaction_reports_all_invalid_items(
+        self, client: AsyncClient, admin_headers: dict,
+        medicine_with_inventory: tuple, equipment_with_inventory: tuple, doctor: Doctor,
+    ):
+        """Test that every invalid item is reported in a single 400 response."""
+        _, _, med_item = medicine_with_inventory
+        _, _, eq_item = equipment_with_inventory
+
+        response = await client.post(
+            "/api/v1/inventory-transactions",
+            json={
+                "transaction_type": "prescription",
+                "third_party_id": doctor.third_party_id,
+                "transaction_date": "2026-03-15",
+                "items": [
+                    {"item_id": med_item.id, "quantity": 1},
+                    {"item_id": 99998, "quantity": 1},
+                    {"item_id": eq_item.id, "quantity": 1},
+                    {"item_id": 99999, "quantity": 1},
+                ],
+            },
+            headers=admin_headers,
+        )
+        assert response.status_code == 400
+        detail = response.json()["detail"]
+        assert detail["message"] == "Invalid transaction items"
+        assert [e["item_id"] for e in detail["errors"]] == [99998, eq_item.id, 99999]
 
 
 class TestUpdateTransaction:
@@ -0,0 +1,142 @@
+"""Tests for the Prometheus metrics endpoint."""
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app.model.user import User
+from app.utility import metrics, storage
+from app.utility.config import settings
+from app.utility.metrics import Gauge, Histogram, Registry
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /metrics"""
+
+    @pytest.fixture(autouse=True)
+    def enable_metrics(self, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_ENABLED", True)
+
+    @pytest.mark.asyncio
+    async def test_metrics_format(self, client: AsyncClient):
+        """Test the endpoint serves Prometheus text with every metric family."""
+        response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == metrics.CONTENT_TYPE
+        for name in (
+            "medbase_http_request_duration_seconds",
+            "medbase_http_requests_in_flight",
+            "medbase_db_pool_checked_out",
+            "medbase_db_pool_overflow",
+            "medbase_db_pool_wait_seconds",
+            "medbase_storage_request_duration_seconds",
+            "medbase_event_loop_lag_seconds",
+        ):
+            assert f"# TYPE {name} " in response.text
+        assert 'medbase_db_pool_size{pool="primary"} ' in response.text
+
+    @pytest.mark.asyncio
+    async def test_route_latency_by_template(self, client: AsyncClient, admin_headers: dict, admin_user: User):
+        """Test requests are labelled by route template rather than concrete path."""
+        labels = {"method": "GET", "route": "/api/v1/users/{user_id}", "status": "200"}
+        before = metrics.HTTP_REQUEST_DURATION.count(**labels)
+
+        response = await client.get(f"/api/v1/users/{admin_user.id}", headers=admin_headers)
+        assert response.status_code == 200
+        await client.get("/no-such-path")
+
+        assert metrics.HTTP_REQUEST_DURATION.count(**labels) == before + 1
+        text = (await client.get("/metrics")).text
+        assert 'route="/api/v1/users/{user_id}",status="200",le="+Inf"}' in text
+        assert 'route="<unmatched>",status="404"' in text
+        assert f"/api/v1/users/{admin_user.id}\"" not in text
+        # The scrape itself is in flight while it renders
+        assert "medbase_http_requests_in_flight 1" in text
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, client: AsyncClient, monkeypatch):
+        """Test METRICS_ENABLED=false hides the endpoint."""
+        monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+        response = await client.get("/metrics")
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_token_required(self, client: AsyncClient, monkeypatch):
+        """Test METRICS_TOKEN must be sent as a bearer token once set."""
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+
+        assert (await client.get("/metrics")).status_code == 401
+        response = await client.get("/metrics", headers={"Authorization": "Bearer wrong"})
+        assert response.status_code == 401
+        response = await client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+        assert response.status_code == 200
+
+
+class TestMetricTypes:
+    """Tests for the in-process registry."""
+
+    def test_histogram_rendering(self):
+        """Test buckets are cumulative and end with +Inf, _sum and _count."""
+        histogram = Histogram("test_seconds", "Test.", ["op"], buckets=(0.1, 1))
+        for value in (0.05, 0.5, 0.5, 3):
+            histogram.observe(value, op="get")
+
+        assert histogram.render() == [
+            "# HELP test_seconds Test.",
+            "# TYPE test_seconds histogram",
+            'test_seconds_bucket{op="get",le="0.1"} 1',
+            'test_seconds_bucket{op="get",le="1"} 3',
+            'test_seconds_bucket{op="get",le="+Inf"} 4',
+            'test_seconds_sum{op="get"} 4.05',
+            'test_seconds_count{op="get"} 4',
+        ]
+
+    def test_metric_requires_samples(self):
+        """Test a metric type must implement samples()."""
+        class Incomplete(metrics._Metric):
+            kind = "gauge"
+
+        with pytest.raises(TypeError):
+            Incomplete("test_incomplete", "Incomplete.")
+
+    def test_gauge_function_and_labels(self):
+        """Test callback gauges are read at render time and labels are validated."""
+        registry = Registry()
+        gauge = registry.register(Gauge("test_open", "Open things.", ["pool"]))
+        value = {"n": 2}
+        gauge.set_function(lambda: value["n"], pool="primary")
+        value["n"] = 3
+
+        assert 'test_open{pool="primary"} 3' in registry.render()
+        with pytest.raises(ValueError):
+            gauge.set(1, shard="a")
+        with pytest.raises(ValueError):
+            registry.register(Gauge("test_open", "Duplicate."))
+
+    @pytest.mark.asyncio
+    async def test_storage_call_latency(self):
+        """Test S3 API calls are timed per operation."""
+        class FakeClient:
+            async def delete_object(self, **params):
+                return {}
+
+        backend = storage.S3Backend(bucket="b", access_key="", secret_key="", endpoint="", region="")
+        backend._client = FakeClient()
+        before = metrics.STORAGE_REQUEST_DURATION.count(operation="delete_object")
+
+        await backend.delete("1/scan.pdf")
+
+        assert metrics.STORAGE_REQUEST_DURATION.count(operation="delete_object") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_event_loop_lag(self, monkeypatch):
+        """Test the loop monitor records a sample per interval."""
+        monkeypatch.setattr(settings, "EVENT_LOOP_LAG_INTERVAL_SECONDS", 0.01)
+        before = metrics.EVENT_LOOP_LAG.count()
+
+        metrics.start_loop_monitor()
+        await asyncio.sleep(0.1)
+        await metrics.stop_loop_monitor()
+
+        assert metrics.EVENT_LOOP_LAG.count() > before
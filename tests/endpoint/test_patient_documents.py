@@ -1,15 +1,28 @@
 """Tests for patient document endpoints."""
+import asyncio
+import base64
+import hashlib
+import io
+
 import pytest
 from unittest.mock import patch, AsyncMock
+from fastapi import UploadFile
 from httpx import AsyncClient
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.model.patient import Patient
 from app.model.patient_document import PatientDocument
+from app.model.stored_object import StoredObject
 from app.model.third_party import ThirdParty
 from app.model.user import User
-from app.schema.patient_document import PatientDocumentType
+from app.schema.patient_document import PatientDocumentType, PatientDocumentUploadComplete
+from app.service.patient_document import PatientDocumentService, _presigned_urls
+from app.utility import storage, thumbnail
+from app.utility.cache import presigned_url_cache
+from app.utility.config import settings
+from app.utility.database import get_db, wait_for_hooks
+from main import app
 
 
 @pytest.fixture(autouse=True)
@@ -18,14 +31,43 @@ def mock_presigned_url():
     async def fake_presigned(key, expires_in=300, download_filename=""):
         return f"https://fake-presigned-url/{key}?signed=true"
 
+    async def fake_presigned_many(files, expires_in=300):
+        return [f"https://fake-presigned-url/{key}?signed=true" for key, _ in files]
+
     with patch(
-        "app.service.patient_document.storage.generate_presigned_url",
+        "app.utility.storage.generate_presigned_url",
         side_effect=fake_presigned,
     ), patch(
-        "app.service.patient.storage.generate_presigned_url",
-        side_effect=fake_presigned,
-    ):
-        yield
+        "app.utility.storage.generate_presigned_urls",
+        side_effect=fake_presigned_many,
+    ) as presign_many:
+        yield presign_many
+
+
+@pytest.fixture(autouse=True)
+def local_storage(tmp_path, monkeypatch) -> storage.LocalBackend:
+    """Keep document files on local disk so tests never reach object storage."""
+    backend = storage.LocalBackend(root=str(tmp_path), base_url="http://test", secret="test-secret")
+    monkeypatch.setattr(storage, "_backend", backend)
+    return backend
+
+
+@pytest.fixture
+async def client(client: AsyncClient, db_session: AsyncSession) -> AsyncClient:
+    """Commit (or roll back) each request like get_db does, so storage work
+    deferred to the commit runs and background tasks' own sessions see it."""
+    async def override_get_db():
+        try:
+            yield db_session
+            await db_session.commit()
+        except Exception:
+            await db_session.rollback()
+            raise
+        finally:
+            await wait_for_hooks(db_session)
+
+    app.dependency_overrides[get_db] = override_get_db
+    return client
 
 
 @pytest.fixture
@@ -193,6 +235,23 @@ class TestGetPatientDocuments:
         assert len(data["items"]) == 1
         assert data["total"] >= 2
 
+    @pytest.mark.asyncio
+    async def test_get_documents_presigns_in_one_batch(
+        self, client: AsyncClient, admin_headers: dict, mock_presigned_url,
+        patient: Patient, document: PatientDocument, second_document: PatientDocument,
+    ):
+        """Test a page of documents is presigned with a single bulk call."""
+        response = await client.get(
+            f"/api/v1/patients/{patient.id}/documents", headers=admin_headers,
+        )
+        assert response.status_code == 200
+        assert mock_presigned_url.await_count == 1
+        urls = [item["file_url"] for item in response.json()["items"]]
+        assert urls == [
+            "https://fake-presigned-url/1/abc123.pdf?signed=true",
+            "https://fake-presigned-url/1/def456.jpg?signed=true",
+        ]
+
 
 class TestGetPatientDocument:
     """Tests for GET /api/v1/patient-documents/{id}"""
@@ -221,6 +280,79 @@ class TestGetPatientDocument:
         assert response.status_code == 404
 
 
+class TestPresignedUrlCache:
+    """Tests for reuse of presigned document URLs."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_reads_reuse_signed_url(
+        self, client: AsyncClient, admin_headers: dict, mock_presigned_url,
+        patient: Patient, document: PatientDocument,
+    ):
+        """Test a document URL is signed once and served from cache afterwards."""
+        urls = []
+        for _ in range(2):
+            response = await client.get(
+                f"/api/v1/patient-documents/{document.id}", headers=admin_headers,
+            )
+            assert response.status_code == 200
+            urls.append(response.json()["file_url"])
+        response = await client.get(
+            f"/api/v1/patients/{patient.id}/documents", headers=admin_headers,
+        )
+        urls.append(response.json()["items"][0]["file_url"])
+
+        assert mock_presigned_url.await_count == 1
+        assert len(set(urls)) == 1
+
+    @pytest.mark.asyncio
+    async def test_expiry_per_document_type(
+        self, client: AsyncClient, admin_headers: dict, mock_presigned_url, monkeypatch,
+        patient: Patient, document: PatientDocument, second_document: PatientDocument,
+    ):
+        """Test document types can override the URL expiry."""
+        monkeypatch.setattr(settings, "PRESIGNED_URL_EXPIRY_BY_TYPE", {"imaging": 3600})
+
+        response = await client.get(
+            f"/api/v1/patients/{patient.id}/documents", headers=admin_headers,
+        )
+        assert response.status_code == 200
+
+        signed = {
+            call.kwargs["expires_in"]: [key for key, _ in call.args[0]]
+            for call in mock_presigned_url.await_args_list
+        }
+        assert signed == {300: [document.file_path], 3600: [second_document.file_path]}
+
+    @pytest.mark.asyncio
+    async def test_cached_url_not_reused_for_other_expiry(
+        self, client: AsyncClient, mock_presigned_url, monkeypatch,
+    ):
+        """Test a URL cached for one expiry is not served where another applies."""
+        monkeypatch.setattr(settings, "PRESIGNED_URL_EXPIRY_BY_TYPE", {"imaging": 3600})
+
+        await _presigned_urls([("1/scan.pdf", "scan.pdf", "report")])
+        await _presigned_urls([("1/scan.pdf", "scan.pdf", "imaging")])
+        await _presigned_urls([("1/scan.pdf", "scan.pdf", "imaging")])
+
+        assert [call.kwargs["expires_in"] for call in mock_presigned_url.await_args_list] == [300, 3600]
+
+    @pytest.mark.asyncio
+    @patch("app.service.patient_document.storage.delete_file", new_callable=AsyncMock)
+    async def test_delete_evicts_cached_url(
+        self, mock_delete, client: AsyncClient, admin_headers: dict,
+        document: PatientDocument,
+    ):
+        """Test deleting a document drops its cached URL."""
+        await client.get(f"/api/v1/patient-documents/{document.id}", headers=admin_headers)
+        assert any(key[0] == document.file_path for key in presigned_url_cache._data)
+
+        response = await client.delete(
+            f"/api/v1/patient-documents/{document.id}", headers=admin_headers,
+        )
+        assert response.status_code == 200
+        assert not any(key[0] == document.file_path for key in presigned_url_cache._data)
+
+
 class TestUploadPatientDocument:
     """Tests for POST /api/v1/patients/{patient_id}/documents"""
 
@@ -372,3 +504,740 @@ class TestDeletePatientDocument:
         data = response.json()
         doc_ids = [d["id"] for d in data["items"]]
         assert document.id not in doc_ids
+
+
+class TestPresigning:
+    """Tests for local URL presigning by the S3 backend."""
+
+    def test_presign_is_local_and_cached(self):
+        """Test URLs are signed without network access by one cached signer."""
+        backend = storage.S3Backend(
+            bucket="medbase-test", access_key="AKIDEXAMPLE", secret_key="secret",
+            endpoint="s3.eu-west-1.amazonaws.com", region="eu-west-1",
+        )
+        url = backend.presign("7/scan.pdf", 120, "Scan.pdf")
+        assert backend._signer is backend._signer
+
+        assert "medbase-test" in url
+        assert "7/scan.pdf" in url
+        assert "X-Amz-Expires=120" in url
+        assert "response-content-disposition=attachment" in url
+
+
+class FakeS3:
+    """Records multipart calls and tracks how many parts are in flight."""
+
+    def __init__(self, fail_part: int = 0, object_size: int = 5):
+        self.fail_part = fail_part
+        self.object_size = object_size
+        self.calls = []
+        self.parts = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def put_object(self, **kwargs):
+        self.calls.append(("put_object", kwargs["Body"]))
+
+    async def create_multipart_upload(self, **kwargs):
+        self.calls.append(("create_multipart_upload", kwargs["Key"]))
+        return {"UploadId": "upload-1"}
+
+    async def upload_part(self, PartNumber, Body, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if PartNumber == self.fail_part:
+            raise RuntimeError("part failed")
+        self.parts[PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    async def complete_multipart_upload(self, MultipartUpload, **kwargs):
+        self.calls.append(("complete_multipart_upload", MultipartUpload["Parts"]))
+
+    async def abort_multipart_upload(self, **kwargs):
+        self.calls.append(("abort_multipart_upload", kwargs["UploadId"]))
+
+    async def head_object(self, **kwargs):
+        return {"ContentLength": self.object_size, "ContentType": "application/pdf"}
+
+    async def upload_part_copy(self, PartNumber, CopySourceRange, **kwargs):
+        self.calls.append(("upload_part_copy", PartNumber, CopySourceRange))
+        return {"CopyPartResult": {"ETag": f"etag-{PartNumber}"}}
+
+    async def copy_object(self, **kwargs):
+        self.calls.append(("copy_object", kwargs))
+
+    async def delete_object(self, **kwargs):
+        self.calls.append(("delete_object", kwargs["Key"]))
+
+
+class TestStreamingUpload:
+    """Tests for app.utility.storage.upload_stream."""
+
+    @pytest.fixture
+    def fake_s3(self, monkeypatch):
+        def install(**kwargs):
+            s3 = FakeS3(**kwargs)
+            backend = storage.S3Backend(bucket="medbase-test", access_key="", secret_key="", endpoint="", region="")
+            backend._client = s3
+            monkeypatch.setattr(storage, "_backend", backend)
+            monkeypatch.setattr(storage, "MULTIPART_CHUNK_SIZE", 8)
+            monkeypatch.setattr(storage, "MULTIPART_CONCURRENCY", 2)
+            return s3
+        return install
+
+    @pytest.mark.asyncio
+    async def test_small_file_single_put(self, fake_s3):
+        """Test a file smaller than one part is sent with put_object."""
+        s3 = fake_s3()
+        result = await storage.upload_stream("1/a.txt", UploadFile(io.BytesIO(b"hello")).read)
+
+        assert s3.calls == [("put_object", b"hello")]
+        assert result.size == 5
+        assert result.sha256 == hashlib.sha256(b"hello").hexdigest()
+
+    @pytest.mark.asyncio
+    async def test_large_file_multipart_bounded(self, fake_s3):
+        """Test larger files are sent in ordered parts with bounded concurrency."""
+        s3 = fake_s3()
+        content = bytes(range(50))
+        result = await storage.upload_stream("1/scan.dcm", UploadFile(io.BytesIO(content)).read)
+
+        assert [s3.parts[n] for n in sorted(s3.parts)] == [content[i:i + 8] for i in range(0, 50, 8)]
+        assert s3.calls[-1] == (
+            "complete_multipart_upload",
+            [{"PartNumber": n, "ETag": f"etag-{n}"} for n in range(1, 8)],
+        )
+        assert s3.max_in_flight == 2
+        assert result.size == 50
+        assert result.sha256 == hashlib.sha256(content).hexdigest()
+
+    @pytest.mark.asyncio
+    async def test_failed_part_aborts_upload(self, fake_s3):
+        """Test a failed part aborts the multipart upload."""
+        s3 = fake_s3(fail_part=2)
+        with pytest.raises(RuntimeError):
+            await storage.upload_stream("1/scan.dcm", UploadFile(io.BytesIO(bytes(40))).read)
+
+        assert ("abort_multipart_upload", "upload-1") in s3.calls
+        assert not any(name == "complete_multipart_upload" for name, _ in s3.calls)
+
+    @pytest.mark.asyncio
+    async def test_move_copies_with_checksum(self, fake_s3):
+        """Test a move is a server-side copy that records the SHA-256 checksum, then a delete."""
+        s3 = fake_s3()
+        await storage.move_file("uploads/a.pdf", "objects/abc.pdf")
+
+        assert s3.calls == [
+            ("copy_object", {
+                "Bucket": "medbase-test", "Key": "objects/abc.pdf",
+                "CopySource": {"Bucket": "medbase-test", "Key": "uploads/a.pdf"}, "ChecksumAlgorithm": "SHA256",
+            }),
+            ("delete_object", "uploads/a.pdf"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_move_large_object_copies_in_parts(self, fake_s3, monkeypatch):
+        """Test objects above the copy_object limit are copied with ranged part copies."""
+        s3 = fake_s3(object_size=20)
+        monkeypatch.setattr(storage, "MAX_COPY_OBJECT_BYTES", 10)
+        monkeypatch.setattr(storage, "COPY_PART_SIZE", 8)
+        await storage.move_file("uploads/a.dcm", "objects/abc.dcm")
+
+        assert s3.calls == [
+            ("create_multipart_upload", "objects/abc.dcm"),
+            ("upload_part_copy", 1, "bytes=0-7"),
+            ("upload_part_copy", 2, "bytes=8-15"),
+            ("upload_part_copy", 3, "bytes=16-19"),
+            ("complete_multipart_upload", [{"PartNumber": n, "ETag": f"etag-{n}"} for n in (1, 2, 3)]),
+            ("delete_object", "uploads/a.dcm"),
+        ]
+
+
+class TestLocalStorage:
+    """Tests for the local disk backend and its signed download route."""
+
+    @pytest.mark.asyncio
+    async def test_upload_then_download(
+        self, client: AsyncClient, admin_headers: dict,
+        patient: Patient, local_storage: storage.LocalBackend,
+    ):
+        """Test an uploaded file is written to disk and served from its signed URL."""
+        response = await client.post(
+            f"/api/v1/patients/{patient.id}/documents",
+            files={"file": ("report.pdf", b"%PDF-1.4 local", "application/pdf")},
+            headers=admin_headers,
+        )
+        assert response.status_code == 201
+        key = response.json()["file_path"]
+        assert local_storage.path(key).read_bytes() == b"%PDF-1.4 local"
+
+        url = local_storage.presign(key, 60, "report.pdf")
+        assert url.startswith(f"http://test/api/v1/files/{key}?")
+        download = await client.get(url)
+        assert download.status_code == 200
+        assert download.content == b"%PDF-1.4 local"
+        assert download.headers["content-type"] == "application/pdf"
+        assert 'filename="report.pdf"' in download.headers["content-disposition"]
+
+    @pytest.mark.asyncio
+    async def test_download_rejects_bad_or_expired_signature(
+        self, client: AsyncClient, local_storage: storage.LocalBackend,
+    ):
+        """Test tampered and expired URLs are refused."""
+        await local_storage.put("1/scan.jpg", b"jpeg", "image/jpeg")
+
+        tampered = local_storage.presign("1/scan.jpg", 60).replace("signature=", "signature=0")
+        assert (await client.get(tampered)).status_code == 403
+
+        expired = local_storage.presign("1/scan.jpg", -1)
+        assert (await client.get(expired)).status_code == 403
+
+        other = local_storage.presign("1/missing.jpg", 60)
+        assert (await client.get(other)).status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_delete_removes_file(
+        self, client: AsyncClient, admin_headers: dict,
+        document: PatientDocument, local_storage: storage.LocalBackend,
+    ):
+        """Test deleting a document removes its file from disk."""
+        await local_storage.put(document.file_path, b"pdf", "application/pdf")
+
+        response = await client.delete(
+            f"/api/v1/patient-documents/{document.id}", headers=admin_headers,
+        )
+        assert response.status_code == 200
+        assert not local_storage.path(document.file_path).exists()
+
+    def test_keys_cannot_escape_root(self, local_storage: storage.LocalBackend):
+        """Test keys resolving outside the storage root are rejected."""
+        with pytest.raises(ValueError):
+            local_storage.path("../outside.txt")
+
+
+class TestDirectUpload:
+    """Tests for the presigned direct-to-storage upload flow."""
+
+    CONTENT = b"%PDF-1.4 direct upload"
+
+    def upload_request(self, content: bytes = CONTENT) -> dict:
+        return {
+            "filename": "mri.pdf",
+            "content_type": "application/pdf",
+            "size": len(content),
+            "sha256": hashlib.sha256(content).hexdigest(),
+        }
+
+    @pytest.mark.asyncio
+    async def test_direct_upload_flow(
+        self, client: AsyncClient, admin_headers: dict, db_session: AsyncSession,
+        patient: Patient, local_storage: storage.LocalBackend,
+    ):
+        """Test a file PUT to the presigned URL is recorded on completion."""
+        response = await client.post(
+            f"/api/v1/patients/{patient.id}/documents/uploads",
+            json=self.upload_request(), headers=admin_headers,
+        )
+        assert response.status_code == 201
+        ticket = response.json()
+        assert ticket["method"] == "PUT"
+        assert ticket["file_path"].startswith("uploads/")
+        assert ticket["file_path"].endswith(".pdf")
+
+        put = await client.put(ticket["upload_url"], content=self.CONTENT, headers=ticket["headers"])
+        assert put.status_code == 200
+        assert local_storage.path(ticket["file_path"]).read_bytes() == self.CONTENT
+
+        response = await client.post(
+            f"/api/v1/patients/{patient.id}/documents/uploads/complete",
+            json={"upload_token": ticket["upload_token"], "document_type": "imaging"},
+            headers=admin_headers,
+        )
+        assert response.status_code == 201
+        data = response.json()
+        assert data["document_name"] == "mri.pdf"
+        assert data["document_type"] == "imaging"
+        assert data["file_path"] == f"objects/{hashlib.sha256(self.CONTENT).hexdigest()}.pdf"
+        assert local_storage.path(data["file_path"]).read_bytes() == self.CONTENT
+        assert not local_storage.path(ticket["file_path"]).exists()
+
+        result = await db_session.execute(
+            select(PatientDocument).where(PatientDocument.id == data["id"])
+        )
+        assert result.scalar_one().patient_id == patient.id
+
+        # The token cannot register the same file twice
+        response = await client.post(
+            f"/api/v1/patients/{patient.id}/documents/uploads/complete",
+            json={"upload_token": ticket["upload_token"]}, headers=admin_headers,
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_put_rejects_mismatched_content(
+        self, client: AsyncClient, admin_headers: dict,
+        patient: Patient, local_storage: storage.LocalBackend,
+    ):
+        """Test content that differs from the declared checksum or size is refused."""
+        response = await client.post(
+            f"/api/v1/patients/{patient.id}/documents/uploads",
+            json=self.upload_request(), headers=admin_headers,
+        )
+        ticket = response.json()
+
+        tampered = self.CONTENT.replace(b"direct", b"forged")
+        put = await client.put(ticket["upload_url"], content=tampered, headers=ticket["headers"])
+        assert put.status_code == 400
+        assert not local_storage.path(ticket["file_path"]).exists()
+
+        put = await client.put(ticket["upload_url"], content=self.CONTENT * 2, headers=ticket["headers"])
+        assert put.status_code == 400
+        assert not local_storage.path(ticket["file_path"]).exists()
+
+    @pytest.mark.asyncio
+    async def test_complete_requires_matching_upload(
+        self, client: AsyncClient, admin_headers: dict, db_session: AsyncSession,
+        patient: Patient, local_storage: storage.LocalBackend,
+    ):
+        """Test completion fails before the upload, with a wrong file, or for another patient."""
+        response = await client.post(
+            f"/api/v1/patients/{patient.id}/documents/uploads",
+            json=self.upload_request(), headers=admin_headers,
+        )
+        ticket = response.json()
+        complete_url = f"/api/v1/patients/{patient.id}/documents/uploads/complete"
+
+        response = await client.post(complete_url, json={"upload_token": ticket["upload_token"]}, headers=admin_headers)
+        assert response.status_code == 400
+        assert "not found" in response.json()["detail"]
+
+        # Written behind the presigned URL's back with different content
+        await local_storage.put(ticket["file_path"], b"something else", "application/pdf")
+        response = await client.post(complete_url, json={"upload_token": ticket["upload_token"]}, headers=admin_headers)
+        assert response.status_code == 400
+        assert not local_storage.path(ticket["file_path"]).exists()
+
+        other_tp = ThirdParty(name="Other Patient", is_active=True)
+        db_session.add(other_tp)
+        await db_session.flush()
+        other = Patient(third_party_id=other_tp.id, is_active=True)
+        db_session.add(other)
+        await db_session.commit()
+        response = await client.post(
+            f"/api/v1/patients/{other.id}/documents/uploads/complete",
+            json={"upload_token": ticket["upload_token"]}, headers=admin_headers,
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_upload_token_is_not_an_access_token(
+        self, client: AsyncClient, admin_headers: dict, patient: Patient,
+    ):
+        """Test an upload token cannot authenticate API requests."""
+        response = await client.post(
+            f"/api/v1/patients/{patient.id}/documents/uploads",
+            json=self.upload_request(), headers=admin_headers,
+        )
+        token = response.json()["upload_token"]
+
+        response = await client.get(
+            f"/api/v1/patients/{patient.id}/documents",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_create_upload_size_limit(
+        self, client: AsyncClient, admin_headers: dict, patient: Patient, monkeypatch,
+    ):
+        """Test files above DIRECT_UPLOAD_MAX_BYTES are refused up front."""
+        monkeypatch.setattr(settings, "DIRECT_UPLOAD_MAX_BYTES", 10)
+        response = await client.post(
+            f"/api/v1/patients/{patient.id}/documents/uploads",
+            json=self.upload_request(), headers=admin_headers,
+        )
+        assert response.status_code == 400
+
+    def test_s3_upload_url_signs_checksum(self):
+        """Test S3 upload URLs bind the content length and SHA-256 checksum."""
+        backend = storage.S3Backend(
+            bucket="medbase-test", access_key="AKIDEXAMPLE", secret_key="secret",
+            endpoint="s3.eu-west-1.amazonaws.com", region="eu-west-1",
+        )
+        sha256 = hashlib.sha256(self.CONTENT).hexdigest()
+        url, headers = backend.presign_upload("7/mri.pdf", 900, "application/pdf", len(self.CONTENT), sha256)
+
+        assert "content-length%3Bcontent-type%3Bhost%3Bx-amz-checksum-sha256" in url
+        assert headers["x-amz-checksum-sha256"] == base64.b64encode(bytes.fromhex(sha256)).decode()
+
+
+class TestStorageFollowsTransaction:
+    """Tests that storage changes wait for the document rows to commit."""
+
+    CONTENT = b"%PDF-1.4 discharge summary"
+
+    @pytest.mark.asyncio
+    async def test_rolled_back_upload_leaves_no_file(
+        self, db_session: AsyncSession, patient: Patient, local_storage: storage.LocalBackend,
+    ):
+        """Test a rolled-back upload removes its staging object and stores nothing."""
+        service = PatientDocumentService(db_session)
+        await service.upload(patient.id, UploadFile(io.BytesIO(self.CONTENT), filename="summary.pdf"))
+        await db_session.rollback()
+        await wait_for_hooks(db_session)
+
+        assert [p for p in local_storage.root.rglob("*") if p.is_file()] == []
+
+    @pytest.mark.asyncio
+    async def test_rolled_back_completion_can_be_retried(
+        self, client: AsyncClient, admin_headers: dict, db_session: AsyncSession,
+        patient: Patient, local_storage: storage.LocalBackend,
+    ):
+        """Test a direct upload whose completion rolls back can be completed again."""
+        patient_id = patient.id
+        response = await client.post(
+            f"/api/v1/patients/{patient_id}/documents/uploads",
+            json={
+                "filename": "summary.pdf", "content_type": "application/pdf",
+                "size": len(self.CONTENT), "sha256": hashlib.sha256(self.CONTENT).hexdigest(),
+            },
+            headers=admin_headers,
+        )
+        ticket = response.json()
+        await client.put(ticket["upload_url"], content=self.CONTENT, headers=ticket["headers"])
+
+        service = PatientDocumentService(db_session)
+        doc = await service.complete_upload(patient_id, PatientDocumentUploadComplete(upload_token=ticket["upload_token"]))
+        await db_session.rollback()
+        await wait_for_hooks(db_session)
+        assert local_storage.path(ticket["file_path"]).read_bytes() == self.CONTENT
+        assert not local_storage.path(doc.file_path).exists()
+
+        response = await client.post(
+            f"/api/v1/patients/{patient_id}/documents/uploads/complete",
+            json={"upload_token": ticket["upload_token"]}, headers=admin_headers,
+        )
+        assert response.status_code == 201
+        assert local_storage.path(response.json()["file_path"]).read_bytes() == self.CONTENT
+        assert not local_storage.path(ticket["file_path"]).exists()
+
+    @pytest.mark.asyncio
+    async def test_rolled_back_delete_keeps_file(
+        self, client: AsyncClient, admin_headers: dict, db_session: AsyncSession,
+        patient: Patient, local_storage: storage.LocalBackend,
+    ):
+        """Test a delete that rolls back leaves the stored object in place."""
+        response = await client.post(
+            f"/api/v1/patients/{patient.id}/documents",
+            files={"file": ("summary.pdf", self.CONTENT, "application/pdf")},
+            headers=admin_headers,
+        )
+        uploaded = response.json()
+
+        assert await PatientDocumentService(db_session).delete(uploaded["id"])
+        await db_session.rollback()
+        await wait_for_hooks(db_session)
+
+        assert local_storage.path(uploaded["file_path"]).read_bytes() == self.CONTENT
+        stored = await db_session.scalar(select(StoredObject.ref_count))
+        assert stored == 1
+
+
+class TestDeduplication:
+    """Tests for content-addressed sharing of stored document files."""
+
+    CONTENT = b"%PDF-1.4 referral letter"
+
+    async def upload(self, client: AsyncClient, headers: dict, patient_id: int, name: str) -> dict:
+        response = await client.post(
+            f"/api/v1/patients/{patient_id}/documents",
+            files={"file": (name, self.CONTENT, "application/pdf")},
+            headers=headers,
+        )
+        assert response.status_code == 201
+        return response.json()
+
+    async def stored_object(self, db_session: AsyncSession) -> StoredObject:
+        db_session.expire_all()
+        result = await db_session.execute(
+            select(StoredObject).where(StoredObject.content_sha256 == hashlib.sha256(self.CONTENT).hexdigest())
+        )
+        return result.scalar_one_or_none()
+
+    @pytest.mark.asyncio
+    async def test_identical_uploads_share_one_object(
+        self, client: AsyncClient, admin_headers: dict, db_session: AsyncSession,
+        patient: Patient, local_storage: storage.LocalBackend,
+    ):
+        """Test re-uploading the same content reuses the stored file."""
+        first = await self.upload(client, admin_headers, patient.id, "referral.pdf")
+        second = await self.upload(client, admin_headers, patient.id, "referral (1).pdf")
+
+        assert first["id"] != second["id"]
+        assert first["file_path"] == second["file_path"]
+        assert first["content_sha256"] == hashlib.sha256(self.CONTENT).hexdigest()
+        assert [p.name for p in local_storage.root.rglob("*") if p.is_file()] == [first["file_path"].split("/")[-1]]
+        assert (await self.stored_object(db_session)).ref_count == 2
+
+    @pytest.mark.asyncio
+    async def test_object_removed_with_last_reference(
+        self, client: AsyncClient, admin_headers: dict, db_session: AsyncSession,
+        patient: Patient, local_storage: storage.LocalBackend,
+    ):
+        """Test deleting a shared document keeps the file until the last one goes."""
+        patient_id = patient.id
+        first = await self.upload(client, admin_headers, patient_id, "referral.pdf")
+        second = await self.upload(client, admin_headers, patient.id, "referral.pdf")
+        path = local_storage.path(first["file_path"])
+
+        response = await client.delete(f"/api/v1/patient-documents/{first['id']}", headers=admin_headers)
+        assert response.status_code == 200
+        assert path.exists()
+        assert (await self.stored_object(db_session)).ref_count == 1
+
+        response = await client.get(f"/api/v1/patient-documents/{second['id']}", headers=admin_headers)
+        assert response.status_code == 200
+
+        response = await client.delete(f"/api/v1/patient-documents/{second['id']}", headers=admin_headers)
+        assert response.status_code == 200
+        assert not path.exists()
+        assert await self.stored_object(db_session) is None
+
+        # The content can be stored afresh afterwards
+        third = await self.upload(client, admin_headers, patient_id, "referral.pdf")
+        assert local_storage.path(third["file_path"]).read_bytes() == self.CONTENT
+        assert (await self.stored_object(db_session)).ref_count == 1
+
+    async def direct_upload(self, client: AsyncClient, headers: dict, patient_id: int, content: bytes) -> dict:
+        response = await client.post(
+            f"/api/v1/patients/{patient_id}/documents/uploads",
+            json={
+                "filename": "letter.pdf",
+                "content_type": "application/pdf",
+                "size": len(content),
+                "sha256": hashlib.sha256(content).hexdigest(),
+            },
+            headers=headers,
+        )
+        assert response.status_code == 201
+        return response.json()
+
+    @pytest.mark.asyncio
+    async def test_direct_upload_of_known_content_needs_the_file(
+        self, client: AsyncClient, admin_headers: dict, db_session: AsyncSession,
+        patient: Patient, local_storage: storage.LocalBackend,
+    ):
+        """Test a direct upload only shares stored content after the file itself was sent."""
+        first = await self.upload(client, admin_headers, patient.id, "referral.pdf")
+        assert first["file_path"] == f"objects/{hashlib.sha256(self.CONTENT).hexdigest()}.pdf"
+        tp = ThirdParty(name="Second Patient", is_active=True)
+        db_session.add(tp)
+        await db_session.flush()
+        other = Patient(third_party_id=tp.id, is_active=True)
+        db_session.add(other)
+        await db_session.commit()
+        other_id = other.id
+
+        # Knowing the checksum is not enough to attach the file
+        ticket = await self.direct_upload(client, admin_headers, other_id, self.CONTENT)
+        assert ticket["file_path"] != first["file_path"]
+        complete_url = f"/api/v1/patients/{other_id}/documents/uploads/complete"
+        response = await client.post(complete_url, json={"upload_token": ticket["upload_token"]}, headers=admin_headers)
+        assert response.status_code == 400
+        assert local_storage.path(first["file_path"]).read_bytes() == self.CONTENT
+        assert (await self.stored_object(db_session)).ref_count == 1
+
+        put = await client.put(ticket["upload_url"], content=self.CONTENT, headers=ticket["headers"])
+        assert put.status_code == 200
+        response = await client.post(
+            complete_url,
+            json={"upload_token": ticket["upload_token"], "document_name": "Referral letter"},
+            headers=admin_headers,
+        )
+        assert response.status_code == 201
+        assert response.json()["file_path"] == first["file_path"]
+        assert not local_storage.path(ticket["file_path"]).exists()
+        assert (await self.stored_object(db_session)).ref_count == 2
+
+        # The same token cannot attach the file twice
+        response = await client.post(complete_url, json={"upload_token": ticket["upload_token"]}, headers=admin_headers)
+        assert response.status_code == 400
+        assert local_storage.path(first["file_path"]).read_bytes() == self.CONTENT
+
+    @pytest.mark.asyncio
+    async def test_same_file_uploaded_directly_twice(
+        self, client: AsyncClient, admin_headers: dict, db_session: AsyncSession,
+        patient: Patient, local_storage: storage.LocalBackend,
+    ):
+        """Test one patient can record the same file twice through the direct flow."""
+        documents = []
+        for _ in range(2):
+            ticket = await self.direct_upload(client, admin_headers, patient.id, self.CONTENT)
+            put = await client.put(ticket["upload_url"], content=self.CONTENT, headers=ticket["headers"])
+            assert put.status_code == 200
+            response = await client.post(
+                f"/api/v1/patients/{patient.id}/documents/uploads/complete",
+                json={"upload_token": ticket["upload_token"]}, headers=admin_headers,
+            )
+            assert response.status_code == 201
+            documents.append(response.json())
+
+        assert documents[0]["id"] != documents[1]["id"]
+        assert documents[0]["file_path"] == documents[1]["file_path"]
+        assert (await self.stored_object(db_session)).ref_count == 2
+
+    @pytest.mark.asyncio
+    async def test_mismatched_upload_never_deletes_shared_object(
+        self, client: AsyncClient, admin_headers: dict, db_session: AsyncSession,
+        patient: Patient, local_storage: storage.LocalBackend, monkeypatch,
+    ):
+        """Test a failed completion leaves objects registered in stored_objects alone."""
+        first = await self.upload(client, admin_headers, patient.id, "referral.pdf")
+        ticket = await self.direct_upload(client, admin_headers, patient.id, self.CONTENT)
+
+        # A token whose key is a shared object, whose metadata has no checksum
+        async def stat_file(key):
+            return storage.UploadResult(key=key, size=len(self.CONTENT), sha256="")
+
+        monkeypatch.setattr(storage, "stat_file", stat_file)
+        monkeypatch.setattr(
+            "app.service.patient_document.decode_access_token",
+            lambda token: {
+                "sub": f"document-upload:{patient.id}", "key": first["file_path"],
+                "size": len(self.CONTENT), "sha256": hashlib.sha256(self.CONTENT).hexdigest(), "filename": "x.pdf",
+            },
+        )
+        response = await client.post(
+            f"/api/v1/patients/{patient.id}/documents/uploads/complete",
+            json={"upload_token": ticket["upload_token"]}, headers=admin_headers,
+        )
+        assert response.status_code == 400
+        assert local_storage.path(first["file_path"]).read_bytes() == self.CONTENT
+
+
+class TestThumbnails:
+    """Tests for background preview rendering of uploaded documents."""
+
+    @pytest.fixture
+    def fake_render(self, monkeypatch):
+        """Stand in for the imaging libraries; records what was rendered."""
+        rendered = []
+
+        def render_thumbnail(content, file_path, max_size):
+            rendered.append(file_path)
+            return b"thumbnail of " + content
+
+        monkeypatch.setattr(thumbnail, "render_thumbnail", render_thumbnail)
+        return rendered
+
+    async def upload(self, client: AsyncClient, headers: dict, patient_id: int, name: str, content: bytes) -> dict:
+        response = await client.post(
+            f"/api/v1/patients/{patient_id}/documents",
+            files={"file": (name, content, "application/octet-stream")},
+            headers=headers,
+        )
+        assert response.status_code == 201
+        return response.json()
+
+    @pytest.mark.asyncio
+    async def test_upload_renders_thumbnail(
+        self, client: AsyncClient, admin_headers: dict, db_session: AsyncSession,
+        patient: Patient, local_storage: storage.LocalBackend, fake_render: list,
+    ):
+        """Test an image upload gets a stored preview and a thumbnail_url."""
+        created = await self.upload(client, admin_headers, patient.id, "xray.jpg", b"jpeg bytes")
+        assert created["thumbnail_url"] is None
+        assert fake_render == [created["file_path"]]
+
+        key = thumbnail.thumbnail_key(created["file_path"])
+        assert local_storage.path(key).read_bytes() == b"thumbnail of jpeg bytes"
+
+        # The preview is recorded from its own session after the response
+        db_session.expire_all()
+        response = await client.get(f"/api/v1/patient-documents/{created['id']}", headers=admin_headers)
+        assert response.status_code == 200
+        assert response.json()["thumbnail_url"] == f"https://fake-presigned-url/{key}?signed=true"
+
+    @pytest.mark.asyncio
+    async def test_unsupported_type_has_no_thumbnail(
+        self, client: AsyncClient, admin_headers: dict, patient: Patient, fake_render: list,
+    ):
+        """Test files that are neither images nor PDFs are not rendered."""
+        created = await self.upload(client, admin_headers, patient.id, "notes.txt", b"plain text")
+
+        response = await client.get(f"/api/v1/patient-documents/{created['id']}", headers=admin_headers)
+        assert response.json()["thumbnail_url"] is None
+        assert fake_render == []
+
+    @pytest.mark.asyncio
+    async def test_render_failure_keeps_document(
+        self, client: AsyncClient, admin_headers: dict, patient: Patient,
+        local_storage: storage.LocalBackend, monkeypatch,
+    ):
+        """Test a file that cannot be rendered is stored without a preview."""
+        def broken_render(content, file_path, max_size):
+            raise OSError("cannot identify image file")
+
+        monkeypatch.setattr(thumbnail, "render_thumbnail", broken_render)
+        created = await self.upload(client, admin_headers, patient.id, "scan.png", b"not really a png")
+
+        response = await client.get(f"/api/v1/patient-documents/{created['id']}", headers=admin_headers)
+        assert response.status_code == 200
+        assert response.json()["thumbnail_url"] is None
+        assert not local_storage.path(thumbnail.thumbnail_key(created["file_path"])).exists()
+
+    @pytest.mark.asyncio
+    async def test_delete_removes_thumbnail(
+        self, client: AsyncClient, admin_headers: dict, db_session: AsyncSession,
+        patient: Patient, local_storage: storage.LocalBackend, fake_render: list,
+    ):
+        """Test the preview is removed along with the last document using the file."""
+        created = await self.upload(client, admin_headers, patient.id, "xray.jpg", b"jpeg bytes")
+        thumb = local_storage.path(thumbnail.thumbnail_key(created["file_path"]))
+        assert thumb.exists()
+
+        db_session.expire_all()
+        response = await client.delete(f"/api/v1/patient-documents/{created['id']}", headers=admin_headers)
+        assert response.status_code == 200
+        assert not thumb.exists()
+
+    @pytest.mark.asyncio
+    async def test_disabled_without_workers(
+        self, client: AsyncClient, admin_headers: dict, patient: Patient,
+        fake_render: list, monkeypatch,
+    ):
+        """Test THUMBNAIL_WORKERS=0 turns preview rendering off."""
+        monkeypatch.setattr(settings, "THUMBNAIL_WORKERS", 0)
+        await self.upload(client, admin_headers, patient.id, "xray.jpg", b"jpeg bytes")
+        assert fake_render == []
+
+    @pytest.mark.asyncio
+    async def test_worker_reads_source_from_storage(self, tmp_path, monkeypatch, fake_render: list):
+        """Test the pool's render task fetches the file through a backend of its own."""
+        monkeypatch.setattr(settings, "STORAGE_BACKEND", "local")
+        monkeypatch.setattr(settings, "LOCAL_STORAGE_ROOT", str(tmp_path))
+        (tmp_path / "1").mkdir()
+        (tmp_path / "1" / "xray.jpg").write_bytes(b"jpeg bytes")
+
+        # Off the test's event loop, as in a pool worker
+        def render(file_path, max_bytes):
+            return asyncio.to_thread(thumbnail.render_stored_thumbnail, file_path, max_bytes, 256)
+
+        assert await render("1/xray.jpg", 100) == b"thumbnail of jpeg bytes"
+        assert await render("1/xray.jpg", 5) is None
+        assert await render("1/missing.jpg", 100) is None
+        assert fake_render == ["1/xray.jpg"]
+
+    def test_render_image(self):
+        """Test a real image is scaled down to a JPEG within the size limit."""
+        Image = pytest.importorskip("PIL.Image")
+        source = io.BytesIO()
+        Image.new("RGB", (1200, 600), "white").save(source, format="PNG")
+
+        preview = thumbnail.render_thumbnail(source.getvalue(), "1/scan.png", 256)
+
+        image = Image.open(io.BytesIO(preview))
+        assert image.format == "JPEG"
+        assert image.size == (256, 128)
@@ -3,12 +3,16 @@ from datetime import date
 
 import pytest
 from httpx import AsyncClient
-from sqlalchemy import select
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.model.patient import Patient
 from app.model.third_party import ThirdParty
 from app.model.user import User
+from app.schema.base import CountMode
+from app.utility import pagination
+from app.utility.config import settings
+from app.utility.pagination import count_rows
 
 
 @pytest.fixture
@@ -146,6 +150,164 @@ class TestGetPatients:
         assert len(data["items"]) == 1
         assert data["total"] >= 2
 
+    @pytest.mark.asyncio
+    async def test_get_patients_cursor_walks_all_pages(
+        self, client: AsyncClient, admin_headers: dict,
+        patient: Patient, second_patient: Patient,
+    ):
+        """Test following next_cursor returns every patient once, in sort order."""
+        names = []
+        params = {"size": 1, "sort": "name", "order": "desc"}
+        while True:
+            response = await client.get("/api/v1/patients", params=params, headers=admin_headers)
+            assert response.status_code == 200
+            data = response.json()
+            names.extend(p["third_party"]["name"] for p in data["items"])
+            if not data["next_cursor"]:
+                break
+            params["cursor"] = data["next_cursor"]
+        assert names == ["John Doe", "Jane Smith"]
+
+    @pytest.mark.asyncio
+    async def test_get_patients_cursor_with_null_sort_values(
+        self, client: AsyncClient, admin_headers: dict, db_session: AsyncSession,
+        patient: Patient, second_patient: Patient,
+    ):
+        """Test cursor pagination on a nullable column keeps rows with NULLs."""
+        tp = ThirdParty(name="No Birthday", is_active=True)
+        db_session.add(tp)
+        await db_session.flush()
+        db_session.add(Patient(third_party_id=tp.id, gender="male", is_active=True))
+        await db_session.commit()
+
+        for order, expected in (
+            ("asc", [second_patient.id, patient.id, None]),
+            ("desc", [None, patient.id, second_patient.id]),
+        ):
+            ids = []
+            params = {"size": 1, "sort": "date_of_birth", "order": order}
+            while True:
+                response = await client.get("/api/v1/patients", params=params, headers=admin_headers)
+                data = response.json()
+                ids.extend(p["id"] for p in data["items"])
+                if not data["next_cursor"]:
+                    break
+                params["cursor"] = data["next_cursor"]
+            assert len(ids) == 3
+            assert [i if i in (patient.id, second_patient.id) else None for i in ids] == expected
+
+    @pytest.mark.asyncio
+    async def test_get_patients_skip_count(
+        self, client: AsyncClient, admin_headers: dict,
+        patient: Patient, second_patient: Patient,
+    ):
+        """Test count=none skips the total but still reports a next page."""
+        response = await client.get(
+            "/api/v1/patients", params={"size": 1, "count": "none"}, headers=admin_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] is None
+        assert len(data["items"]) == 1
+        assert data["next_cursor"]
+
+    @pytest.mark.asyncio
+    async def test_get_patients_count_strategy_reported(
+        self, client: AsyncClient, admin_headers: dict, patient: Patient,
+    ):
+        """Test the response says how total was computed."""
+        response = await client.get("/api/v1/patients", headers=admin_headers)
+        assert response.json()["count_strategy"] == "exact"
+
+        response = await client.get(
+            "/api/v1/patients", params={"count": "none"}, headers=admin_headers,
+        )
+        assert response.json()["count_strategy"] == "none"
+
+    @pytest.mark.asyncio
+    async def test_get_patients_estimated_count(
+        self, client: AsyncClient, admin_headers: dict, patient: Patient, monkeypatch,
+    ):
+        """Test count=estimated uses the planner estimate for large results only."""
+        response = await client.get(
+            "/api/v1/patients", params={"count": "estimated"}, headers=admin_headers,
+        )
+        data = response.json()
+        assert data["count_strategy"] == "exact"
+        assert data["total"] == 1
+
+        monkeypatch.setattr(settings, "COUNT_ESTIMATE_THRESHOLD", 0)
+        response = await client.get(
+            "/api/v1/patients", params={"count": "estimated", "gender": "male"}, headers=admin_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count_strategy"] == "estimated"
+        assert isinstance(data["total"], int)
+
+    @pytest.mark.asyncio
+    async def test_unfiltered_estimate_reads_table_statistics(
+        self, db_session: AsyncSession, patient: Patient, monkeypatch,
+    ):
+        """Test count=estimated reads pg_class.reltuples for an unfiltered query instead of EXPLAIN."""
+        async def no_explain(db, counted):
+            raise AssertionError("EXPLAIN used")
+
+        monkeypatch.setattr(pagination, "_estimated_count", no_explain)
+        monkeypatch.setattr(settings, "COUNT_ESTIMATE_THRESHOLD", 0)
+        await db_session.execute(text("ANALYZE patients"))
+
+        total, strategy = await count_rows(db_session, select(Patient.id), CountMode.ESTIMATED)
+        assert (total, strategy) == (1, CountMode.ESTIMATED)
+
+        with pytest.raises(AssertionError, match="EXPLAIN used"):
+            await count_rows(db_session, select(Patient.id).where(Patient.is_active), CountMode.ESTIMATED)
+
+    @pytest.mark.asyncio
+    async def test_get_patients_cached_count(
+        self, client: AsyncClient, admin_headers: dict, db_session: AsyncSession, patient: Patient,
+    ):
+        """Test count=cached reuses the total for the same filters only."""
+        params = {"count": "cached", "gender": "male"}
+        response = await client.get("/api/v1/patients", params=params, headers=admin_headers)
+        assert response.json()["count_strategy"] == "exact"
+
+        tp = ThirdParty(name="Another Male", is_active=True)
+        db_session.add(tp)
+        await db_session.flush()
+        db_session.add(Patient(third_party_id=tp.id, gender="male", is_active=True))
+        await db_session.commit()
+
+        response = await client.get("/api/v1/patients", params=params, headers=admin_headers)
+        data = response.json()
+        assert data["count_strategy"] == "cached"
+        assert data["total"] == 1
+
+        response = await client.get(
+            "/api/v1/patients", params={"count": "cached", "gender": "female"}, headers=admin_headers,
+        )
+        assert response.json()["count_strategy"] == "exact"
+
+    @pytest.mark.asyncio
+    async def test_get_patients_invalid_cursor(
+        self, client: AsyncClient, admin_headers: dict,
+        patient: Patient, second_patient: Patient,
+    ):
+        """Test a garbage cursor, or one issued for another sort, is rejected."""
+        response = await client.get(
+            "/api/v1/patients", params={"cursor": "not-a-cursor"}, headers=admin_headers,
+        )
+        assert response.status_code == 400
+
+        response = await client.get(
+            "/api/v1/patients", params={"size": 1, "sort": "name"}, headers=admin_headers,
+        )
+        cursor = response.json()["next_cursor"]
+        response = await client.get(
+            "/api/v1/patients", params={"cursor": cursor, "sort": "id"}, headers=admin_headers,
+        )
+        assert response.status_code == 400
+
 
 class TestGetPatient:
     """Tests for GET /api/v1/patients/{id}"""
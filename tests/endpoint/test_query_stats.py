@@ -0,0 +1,71 @@
+"""Tests for per-request SQL statistics."""
+import logging
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from starlette.responses import PlainTextResponse
+
+from app.utility.config import settings
+from app.utility.query_stats import QueryStatsMiddleware, current_stats
+from tests.conftest import test_engine
+
+
+async def repeat_query(scope, receive, send):
+    """ASGI app running the same statement once per ``n`` in the query string."""
+    n = int(scope["query_string"].decode().split("=")[1])
+    async with test_engine.connect() as conn:
+        for i in range(n):
+            await conn.execute(text("SELECT CAST(:i AS integer)"), {"i": i})
+    await PlainTextResponse(str(current_stats().count))(scope, receive, send)
+
+
+@pytest.fixture
+async def stats_client():
+    app = QueryStatsMiddleware(repeat_query)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+class TestQueryStats:
+    """Tests for QueryStatsMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_server_timing_header(self, client: AsyncClient, admin_headers: dict):
+        """Test API responses report DB time and query count."""
+        response = await client.get("/api/v1/patients", headers=admin_headers)
+
+        assert response.status_code == 200
+        db, slowest = response.headers["server-timing"].split(", ")
+        assert db.startswith("db;dur=")
+        assert int(db.split('desc="')[1].split(" ")[0]) >= 2
+        assert slowest.startswith("db-slowest;dur=")
+
+    @pytest.mark.asyncio
+    async def test_counts_per_request(self, stats_client: AsyncClient):
+        """Test each request starts from zero."""
+        first = await stats_client.get("/", params={"n": 3})
+        second = await stats_client.get("/", params={"n": 1})
+
+        assert first.text == "3"
+        assert second.text == "1"
+        assert 'desc="1 queries"' in second.headers["server-timing"]
+
+    @pytest.mark.asyncio
+    async def test_no_header_without_queries(self, stats_client: AsyncClient):
+        """Test requests that run no SQL get no Server-Timing header."""
+        response = await stats_client.get("/", params={"n": 0})
+        assert "server-timing" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_repeated_statement_warns(self, stats_client: AsyncClient, caplog, monkeypatch):
+        """Test a statement repeated past the threshold is logged as a likely N+1."""
+        monkeypatch.setattr(settings, "N_PLUS_ONE_THRESHOLD", 3)
+        caplog.set_level(logging.WARNING, logger="medbase.utility.query_stats")
+
+        await stats_client.get("/", params={"n": 3})
+        assert not caplog.records
+
+        await stats_client.get("/", params={"n": 4})
+        record, = caplog.records
+        assert record.getMessage() == "Possible N+1 in GET /: statement ran 4 times: SELECT CAST($1 AS integer)"
@@ -0,0 +1,181 @@
+"""Tests for logging setup and the request logging middleware."""
+import io
+import json
+import logging
+import threading
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.model.user import User
+from app.utility import logging as app_logging
+from app.utility.config import settings
+from app.utility.logging import RequestLoggingMiddleware, setup_logging, shutdown_logging
+
+
+@pytest.fixture
+def request_log(caplog):
+    """Capture what the request middleware logs."""
+    caplog.set_level(logging.INFO, logger="medbase.request")
+    return caplog
+
+
+def messages(caplog) -> list:
+    return [r.getMessage() for r in caplog.records if r.name == "medbase.request"]
+
+
+def bodies(caplog) -> list:
+    return [m for m in messages(caplog) if m.startswith("  Body:")]
+
+
+class TestRequestLogging:
+    """Tests for RequestLoggingMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_logs_request_and_response(self, client: AsyncClient, request_log):
+        """Test a request and its response status are logged."""
+        await client.get("/api/v1/patients", params={"page": 2})
+
+        logged = messages(request_log)
+        assert logged[0] == "→ GET /api/v1/patients?page=2"
+        assert logged[-1].startswith("← GET /api/v1/patients 401 (")
+
+    @pytest.mark.asyncio
+    async def test_form_body_masked(self, client: AsyncClient, admin_user: User, request_log):
+        """Test form credentials are logged with the password masked."""
+        response = await client.post(
+            "/api/v1/auth/login", data={"username": "testadmin", "password": "testpass123"},
+        )
+        assert response.status_code == 200
+
+        assert bodies(request_log) == ["  Body: username=testadmin&password=***"]
+
+    @pytest.mark.asyncio
+    async def test_json_body_masked(self, client: AsyncClient, admin_headers: dict, request_log):
+        """Test sensitive JSON members are masked at any depth."""
+        await client.post(
+            "/api/v1/users",
+            json={"username": "newuser", "password": "hunter22", "profile": {"access_token": "abc"}},
+            headers=admin_headers,
+        )
+
+        body, = bodies(request_log)
+        assert "hunter22" not in body and "abc" not in body
+        assert '"username": "newuser"' in body
+        assert '"password": "***"' in body
+
+    @pytest.mark.asyncio
+    async def test_multipart_body_not_captured(
+        self, client: AsyncClient, admin_headers: dict, request_log,
+    ):
+        """Test file uploads are described by type and size, never logged."""
+        await client.post(
+            "/api/v1/patients/99999/documents",
+            files={"file": ("scan.pdf", b"%PDF secret scan", "application/pdf")},
+            headers=admin_headers,
+        )
+
+        body, = bodies(request_log)
+        assert body.startswith("  Body: <multipart/form-data, ")
+        assert "secret scan" not in "\n".join(messages(request_log))
+
+    @pytest.mark.asyncio
+    async def test_body_capped(self, request_log):
+        """Test only the first max_body_bytes are kept, still masked when cut short."""
+        async def echo(scope, receive, send):
+            body = b""
+            while True:
+                message = await receive()
+                body += message.get("body", b"")
+                if not message.get("more_body"):
+                    break
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": body})
+
+        app = RequestLoggingMiddleware(echo, max_body_bytes=40)
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            payload = '{"username": "newuser", "password": "a-very-long-password"}'
+            response = await client.post("/echo", content=payload, headers={"content-type": "application/json"})
+
+        # The application still receives the whole body
+        assert response.text == payload
+        body, = bodies(request_log)
+        assert body == f'  Body: {{"username": "newuser", "password": "***"... ({len(payload)} bytes)'
+
+
+class TestLoggingSetup:
+    """Tests for the queue-backed handler installed by setup_logging."""
+
+    @pytest.fixture
+    def output(self):
+        """Install setup_logging on a buffer, restoring the root logger afterwards."""
+        root = logging.getLogger()
+        handlers, level = root.handlers[:], root.level
+        stream = io.StringIO()
+        yield stream
+        shutdown_logging()
+        root.handlers[:] = handlers
+        root.setLevel(level)
+
+    def test_writes_from_listener_thread(self, output: io.StringIO, monkeypatch):
+        """Test records are formatted and written off the logging thread."""
+        threads = []
+        format_record = logging.Formatter.format
+
+        def recording_format(formatter, record):
+            threads.append(threading.current_thread())
+            return format_record(formatter, record)
+
+        monkeypatch.setattr(logging.Formatter, "format", recording_format)
+        setup_logging(stream=output)
+        logging.getLogger("medbase.service.test").info("Created id=%d", 7)
+        shutdown_logging()
+
+        assert output.getvalue().rstrip().endswith("| INFO     | medbase.service.test | Created id=7")
+        assert threads and threading.current_thread() not in threads
+
+    def test_json_format(self, output: io.StringIO, monkeypatch):
+        """Test LOG_FORMAT=json writes one JSON object per line, with tracebacks."""
+        monkeypatch.setattr(settings, "LOG_FORMAT", "json")
+        setup_logging(stream=output)
+        logger = logging.getLogger("medbase.service.test")
+        logger.info("Created id=%d", 7)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Failed")
+        shutdown_logging()
+
+        first, second = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert first["level"] == "INFO"
+        assert first["logger"] == "medbase.service.test"
+        assert first["message"] == "Created id=7"
+        assert second["message"] == "Failed"
+        assert "ValueError: boom" in second["exception"]
+
+    def test_sampling(self, output: io.StringIO, monkeypatch):
+        """Test sampled loggers lose INFO lines but keep warnings; others are untouched."""
+        monkeypatch.setattr(settings, "LOG_SAMPLE_RATES", {"medbase.service": 0.0, "medbase.service.audit": 1.0})
+        setup_logging(stream=output)
+        logging.getLogger("medbase.service.patient").info("sampled out")
+        logging.getLogger("medbase.service.patient").warning("kept warning")
+        logging.getLogger("medbase.service.audit").info("kept by longer prefix")
+        logging.getLogger("medbase.router.patient").info("kept router line")
+        shutdown_logging()
+
+        written = output.getvalue()
+        assert "sampled out" not in written
+        assert "kept warning" in written
+        assert "kept by longer prefix" in written
+        assert "kept router line" in written
+
+    def test_arguments_merged_when_logged(self, output: io.StringIO):
+        """Test a mutable argument is captured as it was at the logging call."""
+        setup_logging(stream=output)
+        ids = [1, 2]
+        logging.getLogger("medbase.service.test").info("ids=%s", ids)
+        ids.append(3)
+        shutdown_logging()
+
+        assert "ids=[1, 2]" in output.getvalue()
+        assert app_logging._listener is None
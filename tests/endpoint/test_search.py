@@ -0,0 +1,120 @@
+"""Tests for the unified search endpoint."""
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.model.appointment import Appointment
+from app.model.doctor import Doctor
+from app.model.item import Item
+from app.model.medicine import Medicine
+from app.model.patient import Patient
+from app.model.third_party import ThirdParty
+from app.model.user import User
+
+
+@pytest.fixture
+async def search_data(db_session: AsyncSession, admin_user: User) -> dict:
+    """Create one record of several searchable types sharing the term 'mira'."""
+    patient_tp = ThirdParty(name="Mira Haddad", is_active=True)
+    doctor_tp = ThirdParty(name="Dr. Samira Khoury", is_active=True)
+    db_session.add_all([patient_tp, doctor_tp])
+    await db_session.flush()
+
+    patient = Patient(third_party_id=patient_tp.id, gender="female", is_active=True)
+    doctor = Doctor(third_party_id=doctor_tp.id, type="internal", is_active=True)
+    item = Item(item_type="medicine", name="Mirapex")
+    db_session.add_all([patient, doctor, item])
+    await db_session.flush()
+
+    medicine = Medicine(item_id=item.id, code="MIR015", name="Mirapex")
+    appointment = Appointment(
+        code="MIRA42", patient_id=patient.id, doctor_id=doctor.id,
+        appointment_date=datetime(2026, 3, 1, 10, 0, 0), type="scheduled",
+    )
+    deleted_tp = ThirdParty(name="Mira Deleted", is_active=True)
+    db_session.add_all([medicine, appointment, deleted_tp])
+    await db_session.flush()
+    db_session.add(Patient(third_party_id=deleted_tp.id, is_active=True, is_deleted=True))
+    await db_session.commit()
+
+    return {"patient": patient, "doctor": doctor, "medicine": medicine, "appointment": appointment}
+
+
+class TestSearch:
+    """Tests for GET /api/v1/search"""
+
+    @pytest.mark.asyncio
+    async def test_search_unauthenticated(self, client: AsyncClient):
+        """Test searching without authentication."""
+        response = await client.get("/api/v1/search", params={"q": "mira"})
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_search_across_entities_ranked(
+        self, client: AsyncClient, admin_headers: dict, search_data: dict,
+    ):
+        """Test one query returns hits of every matching type, best first."""
+        response = await client.get("/api/v1/search", params={"q": "mira"}, headers=admin_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["query"] == "mira"
+        hits = [(hit["type"], hit["id"]) for hit in data["items"]]
+        assert set(hits) == {
+            ("patient", search_data["patient"].id),
+            ("doctor", search_data["doctor"].id),
+            ("medicine", search_data["medicine"].id),
+            ("appointment", search_data["appointment"].id),
+        }
+        ranks = [hit["rank"] for hit in data["items"]]
+        assert ranks == sorted(ranks, reverse=True)
+        # "Samira" only matches mid-word, so the doctor ranks last
+        assert data["items"][-1]["type"] == "doctor"
+
+    @pytest.mark.asyncio
+    async def test_search_appointment_code_carries_patient_name(
+        self, client: AsyncClient, admin_headers: dict, search_data: dict,
+    ):
+        """Test an exact appointment code match ranks first and names the patient."""
+        response = await client.get("/api/v1/search", params={"q": "mira42"}, headers=admin_headers)
+
+        assert response.status_code == 200
+        hit = response.json()["items"][0]
+        assert hit["type"] == "appointment"
+        assert hit["code"] == "MIRA42"
+        assert hit["name"] == "Mira Haddad"
+        assert hit["rank"] == 4
+
+    @pytest.mark.asyncio
+    async def test_search_filter_by_type(
+        self, client: AsyncClient, admin_headers: dict, search_data: dict,
+    ):
+        """Test types restricts which entities are searched."""
+        response = await client.get(
+            "/api/v1/search",
+            params=[("q", "mira"), ("types", "medicine"), ("types", "doctor")],
+            headers=admin_headers,
+        )
+
+        assert response.status_code == 200
+        assert {hit["type"] for hit in response.json()["items"]} == {"medicine", "doctor"}
+
+    @pytest.mark.asyncio
+    async def test_search_limit(
+        self, client: AsyncClient, admin_headers: dict, search_data: dict,
+    ):
+        """Test limit caps the number of hits."""
+        response = await client.get(
+            "/api/v1/search", params={"q": "mira", "limit": 2}, headers=admin_headers,
+        )
+
+        assert response.status_code == 200
+        assert len(response.json()["items"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_search_requires_query(self, client: AsyncClient, admin_headers: dict):
+        """Test an empty query is rejected."""
+        response = await client.get("/api/v1/search", params={"q": ""}, headers=admin_headers)
+        assert response.status_code == 422
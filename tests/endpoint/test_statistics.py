@@ -1,14 +1,17 @@
 """Tests for dashboard statistics endpoints."""
+import asyncio
 from datetime import datetime, date, timedelta
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.model.appointment import Appointment
 from app.model.inventory import Inventory
 from app.model.inventory_transaction import InventoryTransaction
 from app.model.inventory_transaction_item import InventoryTransactionItem
+from app.model.item import Item
 from app.model.medicine import Medicine
 from app.model.medicine_category import MedicineCategory
 from app.model.equipment import Equipment
@@ -18,6 +21,10 @@ from app.model.doctor import Doctor
 from app.model.patient import Patient
 from app.model.third_party import ThirdParty
 from app.model.user import User
+from app.model.statistics_snapshot import StatisticsSnapshot
+from app.service.statistics import StatisticsService, pending_refreshes, refresh_snapshots, SUMMARY
+from app.utility.config import settings
+from tests.conftest import TestAsyncSessionLocal
 
 
 @pytest.fixture
@@ -47,7 +54,7 @@ async def dashboard_data(db_session: AsyncSession, admin_user: User):
     db_session.add(tp_doc)
     await db_session.flush()
     doctor = Doctor(
-        third_party_id=tp_doc.id, name="Dr. Stats",
+        third_party_id=tp_doc.id,
         specialization="General", type="internal", is_active=True,
         created_by=admin_user.username, updated_by=admin_user.username,
     )
@@ -59,7 +66,7 @@ async def dashboard_data(db_session: AsyncSession, admin_user: User):
     db_session.add(tp_partner)
     await db_session.flush()
     partner = Partner(
-        third_party_id=tp_partner.id, name="Stats Hospital",
+        third_party_id=tp_partner.id,
         partner_type="both", organization_type="hospital", is_active=True,
         created_by=admin_user.username, updated_by=admin_user.username,
     )
@@ -96,15 +103,22 @@ async def dashboard_data(db_session: AsyncSession, admin_user: User):
     db_session.add(med_cat)
     await db_session.flush()
 
+    med_item = Item(
+        item_type="medicine", name="Stats Medicine",
+        created_by=admin_user.username, updated_by=admin_user.username,
+    )
+    db_session.add(med_item)
+    await db_session.flush()
+
     medicine = Medicine(
-        code="ST-MED", name="Stats Medicine", category_id=med_cat.id, unit="tablets",
+        item_id=med_item.id, code="ST-MED", name="Stats Medicine", category_id=med_cat.id, unit="tablets",
         is_active=True, created_by=admin_user.username, updated_by=admin_user.username,
     )
     db_session.add(medicine)
     await db_session.flush()
 
     inv1 = Inventory(
-        item_type="medicine", item_id=medicine.id, quantity=5,
+        item_id=med_item.id, quantity=5,
         created_by=admin_user.username, updated_by=admin_user.username,
     )
     db_session.add(inv1)
@@ -116,15 +130,22 @@ async def dashboard_data(db_session: AsyncSession, admin_user: User):
     db_session.add(equip_cat)
     await db_session.flush()
 
+    equip_item = Item(
+        item_type="equipment", name="Stats Equipment",
+        created_by=admin_user.username, updated_by=admin_user.username,
+    )
+    db_session.add(equip_item)
+    await db_session.flush()
+
     equip = Equipment(
-        code="ST-EQP", name="Stats Equipment", category_id=equip_cat.id, condition="new",
+        item_id=equip_item.id, code="ST-EQP", name="Stats Equipment", category_id=equip_cat.id, condition="new",
         is_active=True, created_by=admin_user.username, updated_by=admin_user.username,
     )
     db_session.add(equip)
     await db_session.flush()
 
     inv2 = Inventory(
-        item_type="equipment", item_id=equip.id, quantity=50,
+        item_id=equip_item.id, quantity=50,
         created_by=admin_user.username, updated_by=admin_user.username,
     )
     db_session.add(inv2)
@@ -142,7 +163,7 @@ async def dashboard_data(db_session: AsyncSession, admin_user: User):
     await db_session.flush()
 
     txn_item = InventoryTransactionItem(
-        transaction_id=txn.id, item_type="medicine", item_id=medicine.id,
+        transaction_id=txn.id, item_id=med_item.id,
         quantity=20, created_by=admin_user.username, updated_by=admin_user.username,
     )
     db_session.add(txn_item)
@@ -179,6 +200,87 @@ class TestSummaryStats:
         assert data["active_partners"] >= 1
         assert data["active_doctors"] >= 1
 
+    @pytest.mark.asyncio
+    async def test_get_summary_exact_counts(
+        self, client: AsyncClient, admin_headers: dict, dashboard_data,
+    ):
+        """Test that the single-query summary returns exact per-table counts."""
+        response = await client.get("/api/v1/statistics/summary", headers=admin_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_patients"] == 2
+        assert data["total_appointments"] == 3
+        assert data["total_inventory_items"] == 2
+        assert data["total_transactions"] == 1
+        assert data["total_partners"] == 1
+        assert data["total_doctors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_get_summary_served_from_snapshot(
+        self, client: AsyncClient, admin_headers: dict, db_session: AsyncSession, dashboard_data,
+    ):
+        """Test that a refreshed summary is served from the stored snapshot."""
+        await db_session.commit()
+        assert SUMMARY in await refresh_snapshots(TestAsyncSessionLocal)
+
+        first = await client.get("/api/v1/statistics/summary", headers=admin_headers)
+        second = await client.get("/api/v1/statistics/summary", headers=admin_headers)
+        assert first.status_code == 200
+        assert first.json()["refreshed_at"] is not None
+        assert first.json()["total_patients"] == 2
+        assert second.json()["refreshed_at"] == first.json()["refreshed_at"]
+
+    @pytest.mark.asyncio
+    async def test_get_summary_without_snapshot_is_not_stored(
+        self, client: AsyncClient, admin_headers: dict, db_session: AsyncSession, dashboard_data,
+    ):
+        """Test that a read without a snapshot computes inline and queues a refresh."""
+        response = await client.get("/api/v1/statistics/summary", headers=admin_headers)
+        assert response.status_code == 200
+        assert response.json()["total_patients"] == 2
+        count = await db_session.scalar(select(func.count()).select_from(StatisticsSnapshot))
+        assert count == 0
+        assert SUMMARY in pending_refreshes
+
+    @pytest.mark.asyncio
+    async def test_get_summary_refreshes_after_write(
+        self, client: AsyncClient, admin_headers: dict, db_session: AsyncSession, dashboard_data,
+    ):
+        """Test that a committed service-layer write queues a refresh of the summary."""
+        await db_session.commit()
+        await refresh_snapshots(TestAsyncSessionLocal)
+        response = await client.get("/api/v1/statistics/summary", headers=admin_headers)
+        total_patients = response.json()["total_patients"]
+
+        response = await client.post(
+            "/api/v1/patients",
+            json={"name": "Stats Newcomer", "gender": "female"},
+            headers=admin_headers,
+        )
+        assert response.status_code == 201
+        # Queued only once the write commits (get_db commits; the test override does not)
+        assert SUMMARY not in pending_refreshes
+        await db_session.commit()
+        assert SUMMARY in pending_refreshes
+
+        assert SUMMARY in await refresh_snapshots(TestAsyncSessionLocal)
+        response = await client.get("/api/v1/statistics/summary", headers=admin_headers)
+        assert response.json()["total_patients"] == total_patients + 1
+
+    @pytest.mark.asyncio
+    async def test_rolled_back_write_queues_no_refresh(
+        self, client: AsyncClient, admin_headers: dict, db_session: AsyncSession,
+    ):
+        """Test that a write that rolls back leaves the snapshots alone."""
+        response = await client.post(
+            "/api/v1/patients",
+            json={"name": "Stats Rollback", "gender": "male"},
+            headers=admin_headers,
+        )
+        assert response.status_code == 201
+        await db_session.rollback()
+        assert not pending_refreshes
+
     @pytest.mark.asyncio
     async def test_get_summary_unauthenticated(self, client: AsyncClient):
         """Test getting summary without authentication."""
@@ -197,6 +299,34 @@ class TestSummaryStats:
         assert data["total_appointments"] == 0
 
 
+class TestQueryFanOut:
+    """Tests for the capped concurrent statistics queries."""
+
+    @pytest.mark.asyncio
+    async def test_sessions_in_use_capped(self, db_session: AsyncSession, dashboard_data):
+        """Test that concurrent dashboard loads never hold more sessions than the cap."""
+        await db_session.commit()
+        in_use = peak = 0
+
+        class CountingSession:
+            async def __aenter__(self):
+                nonlocal in_use, peak
+                self.session = TestAsyncSessionLocal()
+                in_use += 1
+                peak = max(peak, in_use)
+                return await self.session.__aenter__()
+
+            async def __aexit__(self, *exc):
+                nonlocal in_use
+                in_use -= 1
+                return await self.session.__aexit__(*exc)
+
+        service = StatisticsService(db_session, CountingSession)
+        results = await asyncio.gather(*(service._compute_inventory_stats() for _ in range(4)))
+        assert all(r.total_items == 2 for r in results)
+        assert peak == settings.STATS_QUERY_CONCURRENCY
+
+
 class TestInventoryStats:
     """Tests for GET /api/v1/statistics/inventory"""
 
@@ -313,6 +443,20 @@ class TestTransactionStats:
         assert "item_count" in recent[0]
         assert recent[0]["item_count"] >= 1
 
+    @pytest.mark.asyncio
+    async def test_transaction_stats_item_counts(
+        self, client: AsyncClient, admin_headers: dict, dashboard_data,
+    ):
+        """Test that item counts per type and per recent transaction are exact."""
+        response = await client.get("/api/v1/statistics/transactions", headers=admin_headers)
+        assert response.status_code == 200
+        data = response.json()
+        types = {t["transaction_type"]: t for t in data["by_type"]}
+        assert types["purchase"]["count"] == 1
+        assert types["purchase"]["total_items"] == 1
+        assert data["total_transactions"] == 1
+        assert data["recent_transactions"][0]["item_count"] == 1
+
     @pytest.mark.asyncio
     async def test_transaction_stats_unauthenticated(self, client: AsyncClient):
         """Test getting transaction stats without authentication."""
@@ -87,6 +87,55 @@ class TestGetThirdParties:
         assert tp is not None
         assert tp.name == "TP Test User"
 
+    @pytest.mark.asyncio
+    async def test_get_third_parties_sorted_by_relevance(
+        self, client: AsyncClient, admin_user: User, admin_headers: dict,
+        db_session: AsyncSession,
+    ):
+        """Test sort=relevance ranks exact, then prefix, then word-prefix, then substring matches."""
+        db_session.add_all([
+            ThirdParty(name="Marianne Hill", is_active=True),
+            ThirdParty(name="Anna Maria", is_active=True),
+            ThirdParty(name="Maria", is_active=True),
+            ThirdParty(name="Samaria Clinic", is_active=True),
+        ])
+        await db_session.commit()
+
+        response = await client.get(
+            "/api/v1/third-parties",
+            params={"search": "maria", "sort": "relevance"},
+            headers=admin_headers,
+        )
+
+        assert response.status_code == 200
+        names = [item["name"] for item in response.json()["items"]]
+        assert names == ["Maria", "Marianne Hill", "Anna Maria", "Samaria Clinic"]
+
+    @pytest.mark.asyncio
+    async def test_get_third_parties_relevance_cursor(
+        self, client: AsyncClient, admin_user: User, admin_headers: dict,
+        db_session: AsyncSession,
+    ):
+        """Test cursor pagination follows relevance order across pages."""
+        db_session.add_all([
+            ThirdParty(name="Omar", is_active=True),
+            ThirdParty(name="Omar Khaled", is_active=True),
+            ThirdParty(name="Ali Omar", is_active=True),
+        ])
+        await db_session.commit()
+
+        names = []
+        params = {"search": "omar", "sort": "relevance", "size": 1}
+        while True:
+            response = await client.get("/api/v1/third-parties", params=params, headers=admin_headers)
+            assert response.status_code == 200
+            data = response.json()
+            names.extend(item["name"] for item in data["items"])
+            if not data["next_cursor"]:
+                break
+            params["cursor"] = data["next_cursor"]
+        assert names == ["Omar", "Omar Khaled", "Ali Omar"]
+
 
 class TestGetThirdPartiesExclusionFlags:
     """Tests for GET /api/v1/third-parties exclusion flags."""
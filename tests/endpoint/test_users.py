@@ -1,11 +1,14 @@
 """Tests for user endpoints."""
 import pytest
 from httpx import AsyncClient
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.model.third_party import ThirdParty
 from app.model.user import User
+from app.schema.user import UserUpdate
+from app.service.user import UserService
+from app.utility.cache import principal_cache
 from app.utility.security import verify_password
 
 
@@ -359,6 +362,48 @@ class TestUpdateUser:
         assert verify_password("newpass456", db_user.password_hash) is True
         assert verify_password("oldpass123", db_user.password_hash) is False
 
+    @pytest.mark.asyncio
+    async def test_deactivate_user_revokes_cached_session(
+        self, client: AsyncClient, admin_user: User, admin_headers: dict, user_headers: dict, regular_user: User,
+        db_session: AsyncSession,
+    ):
+        """Test deactivating a user takes effect immediately for an already-authenticated token."""
+        response = await client.get("/api/v1/auth/me", headers=user_headers)
+        assert response.status_code == 200
+
+        response = await client.put(
+            f"/api/v1/users/{regular_user.id}",
+            json={"is_active": False},
+            headers=admin_headers
+        )
+        assert response.status_code == 200
+        # Commit as get_db would, so the next request's user lookup sees it
+        await db_session.commit()
+
+        response = await client.get("/api/v1/auth/me", headers=user_headers)
+        assert response.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_role_change_applies_to_cached_session(
+        self, client: AsyncClient, admin_user: User, admin_headers: dict, user_headers: dict, regular_user: User,
+        db_session: AsyncSession,
+    ):
+        """Test promoting a user to admin is honoured without re-login."""
+        response = await client.get("/api/v1/users", headers=user_headers)
+        assert response.status_code == 403
+
+        response = await client.put(
+            f"/api/v1/users/{regular_user.id}",
+            json={"role": "admin"},
+            headers=admin_headers
+        )
+        assert response.status_code == 200
+        # Commit as get_db would, so the next request's user lookup sees it
+        await db_session.commit()
+
+        response = await client.get("/api/v1/users", headers=user_headers)
+        assert response.status_code == 200
+
     @pytest.mark.asyncio
     async def test_update_user_not_found(self, client: AsyncClient, admin_headers: dict):
         """Test updating non-existent user."""
@@ -371,6 +416,55 @@ class TestUpdateUser:
         assert response.status_code == 404
 
 
+class TestPrincipalEviction:
+    """Tests for evicting cached principals when users change."""
+
+    @pytest.mark.asyncio
+    async def test_evicted_again_after_commit(self, client: AsyncClient, db_session: AsyncSession):
+        """Test a principal re-cached between the write and its commit is evicted on commit."""
+        user = await _create_test_user(db_session, "cached", "cached@test.com", "testpass123", "admin")
+        user_id = user.id
+        principal_cache.set(user_id, user)
+
+        await UserService(db_session).update(user_id, UserUpdate(is_active=False))
+        assert principal_cache.get(user_id) is None
+
+        # A concurrent request still sees the committed (active) row and caches it
+        principal_cache.set(user_id, user)
+        await db_session.commit()
+        assert principal_cache.get(user_id) is None
+
+    @pytest.mark.asyncio
+    async def test_rollback_runs_no_eviction(self, client: AsyncClient, db_session: AsyncSession):
+        """Test eviction callbacks are dropped when the write rolls back."""
+        user = await _create_test_user(db_session, "rolledback", "rolledback@test.com", "testpass123", "admin")
+        user_id = user.id
+
+        await UserService(db_session).update(user_id, UserUpdate(is_active=False))
+        await db_session.rollback()
+        principal_cache.set(user_id, user)
+        await db_session.commit()
+        assert principal_cache.get(user_id) is user
+
+    @pytest.mark.asyncio
+    async def test_change_from_another_worker_applies(
+        self, client: AsyncClient, user_headers: dict, regular_user: User, db_session: AsyncSession
+    ):
+        """Test a cached principal is reloaded when the row changed without a local eviction."""
+        user_id = regular_user.id
+        response = await client.get("/api/v1/auth/me", headers=user_headers)
+        assert response.status_code == 200
+        assert principal_cache.get(user_id) is not None
+
+        # As another worker would: the row changes, this worker's cache does not
+        await db_session.execute(update(User).where(User.id == user_id).values(is_active=False))
+        await db_session.commit()
+        assert principal_cache.get(user_id) is not None
+
+        response = await client.get("/api/v1/auth/me", headers=user_headers)
+        assert response.status_code == 403
+
+
 class TestDeleteUser:
     """Tests for DELETE /api/v1/users/{user_id}"""
 
@@ -405,6 +499,23 @@ class TestDeleteUser:
         assert db_user.is_deleted is True
         assert db_user.updated_by == admin_username
 
+    @pytest.mark.asyncio
+    async def test_deleted_user_token_rejected(
+        self, client: AsyncClient, admin_user: User, admin_headers: dict, user_headers: dict, regular_user: User,
+        db_session: AsyncSession,
+    ):
+        """Test a deleted user's token stops working immediately."""
+        response = await client.get("/api/v1/auth/me", headers=user_headers)
+        assert response.status_code == 200
+
+        response = await client.delete(f"/api/v1/users/{regular_user.id}", headers=admin_headers)
+        assert response.status_code == 200
+        # Commit as get_db would, so the next request's user lookup sees it
+        await db_session.commit()
+
+        response = await client.get("/api/v1/auth/me", headers=user_headers)
+        assert response.status_code == 401
+
     @pytest.mark.asyncio
     async def test_delete_self_forbidden(self, client: AsyncClient, admin_user: User, admin_headers: dict):
         """Test admin cannot delete themselves."""